@@ -1,2 +1,4 @@
 # dnd-combat-sim
 """D&D 2024 Combat Simulator."""
+
+__version__ = "0.1.0"
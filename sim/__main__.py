@@ -1,21 +1,26 @@
 """D&D 2024 Combat Simulator CLI.
 
 Usage: ./sim <mode> [options]
-Modes: rank, compare, dps, fight, show, list
+Modes: rank, compare, dps, fight, replay, golden, show, list, batch, serve, worker, results,
+       fights, tune
 """
 from __future__ import annotations
 
 import argparse
+import contextlib
+import os
+import random
 import sys
 import time
 from pathlib import Path
 
 from sim.loader import load_build
-from sim.runner import run_simulations, print_results
+from sim.runner import run_matchup, run_simulations, print_results
 from sim.combat import run_combat
 from sim.tactics import load_tactics
 
-_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_DATA_DIR = _PROJECT_ROOT / "data"
 _BUILDS_DIR = _DATA_DIR / "builds"
 
 
@@ -107,7 +112,8 @@ def cmd_fight(args):
     n = args.n or 1
     path_a = _BUILDS_DIR / f"{args.build1}.yaml"
     path_b = _BUILDS_DIR / f"{args.build2}.yaml"
-    results = run_simulations(str(path_a), str(path_b), n=n, verbose=True)
+    results = run_simulations(str(path_a), str(path_b), n=n, verbose=True,
+                              tactic1=args.tactic1, tactic2=args.tactic2, audit=args.audit)
     print_results(results)
 
 
@@ -135,7 +141,25 @@ def cmd_compare(args):
 
 def cmd_rank(args):
     """Round-robin ranking within a filtered set."""
-    builds = _resolve_builds(args)
+    from sim.ladder import CHECKPOINT_FILE, DEFAULT_CHUNK_SIZE, Ladder, load_checkpoint
+
+    if args.resume and not args.run_dir:
+        print("  --resume needs --run-dir.")
+        sys.exit(1)
+
+    ladder = None
+    if args.resume and (Path(args.run_dir) / CHECKPOINT_FILE).exists():
+        ladder = load_checkpoint(args.run_dir)
+        conflicts = _resume_conflicts(args, ladder)
+        if conflicts:
+            print(f"  --resume continues the run in {args.run_dir} as checkpointed; "
+                  f"these options disagree with it:")
+            for conflict in conflicts:
+                print(f"    {conflict}")
+            sys.exit(1)
+        builds = ladder.builds
+    else:
+        builds = _resolve_builds(args)
     n = args.n or 3000
 
     chars = {}
@@ -148,54 +172,365 @@ def cmd_rank(args):
         print("  Need at least 2 builds to rank.")
         sys.exit(1)
 
-    print(f"  Ranking {len(chars)} builds, {n} combats per matchup")
-    print(f"  Total matchups: {len(chars) * (len(chars) - 1) // 2}\n")
+    if args.method == "bt":
+        if args.watch:
+            print("  --watch supports round-robin ranking only.")
+            sys.exit(1)
+        return _rank_bradley_terry(chars, args)
 
-    # Summary
-    for name, c in chars.items():
-        fs = c.fighting_style or "—"
-        print(f"  {c.name:<40} HP:{c.max_hp:>3} AC:{c.ac:>2} SPD:{c.speed:>2}")
+    if args.coordinator is not None and (args.watch or args.fights or args.time_budget or args.audit):
+        print("  --coordinator cannot be combined with --watch, --fights, --time-budget or --audit.")
+        sys.exit(1)
+
+    if args.time_budget:
+        if args.watch or args.run_dir or args.fights or args.audit:
+            print("  --time-budget cannot be combined with --watch, --run-dir, --fights or --audit.")
+            sys.exit(1)
+        return _rank_time_budget(chars, args)
+
+    if ladder is None:
+        seed = args.seed
+        if seed is None and args.run_dir:
+            # A resumable run must be seeded, or the resumed half would not
+            # reproduce the chunks an uninterrupted run would have played.
+            seed = random.getrandbits(31)
+        ladder = Ladder(list(chars), n, seed=seed,
+                        chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE)
+    elif len(chars) != len(ladder.builds):
+        missing = sorted(set(ladder.builds) - set(chars))
+        print(f"  Checkpoint builds missing from data/builds: {', '.join(missing)}")
+        sys.exit(1)
+    else:
+        print(f"  Resuming {args.run_dir}: {ladder.done_chunks}/{ladder.total_chunks} chunks done "
+              f"(seed {ladder.seed})")
+
+    if not args.quiet:
+        print(f"  Ranking {len(chars)} builds, {ladder.n} combats per matchup")
+        print(f"  Total matchups: {len(ladder.matchups)}\n")
+
+        # Summary
+        for name, c in chars.items():
+            fs = c.fighting_style or "—"
+            print(f"  {c.name:<40} HP:{c.max_hp:>3} AC:{c.ac:>2} SPD:{c.speed:>2}")
+
+    fight_log = None
+    if args.fights:
+        from sim.fightlog import FightLogWriter
+        try:
+            fight_log = FightLogWriter(args.fights, {"seed": ladder.seed, "n": ladder.n,
+                                                     "chunk_size": ladder.chunk_size})
+        except ValueError as e:
+            print(f"  {e}")
+            sys.exit(1)
 
-    results = {}
-    keys = list(chars.keys())
     start = time.time()
-    for i, a in enumerate(keys):
-        for b in keys[i + 1:]:
-            stats = run_simulations(
-                str(_BUILDS_DIR / f"{a}.yaml"),
-                str(_BUILDS_DIR / f"{b}.yaml"),
-                n=n,
-            )
-            results[(a, b)] = (
-                stats["combatant_a"]["win_rate"],
-                stats["combatant_b"]["win_rate"],
-                stats["avg_rounds"],
-            )
+    try:
+        if args.coordinator is not None:
+            _run_ladder_distributed(ladder, chars, args)
+        else:
+            _run_ladder_with_progress(ladder, chars, args, fight_log=fight_log)
+    except KeyboardInterrupt:
+        if args.run_dir:
+            print(f"\n  Interrupted at {ladder.done_chunks}/{ladder.total_chunks} chunks — "
+                  f"rerun with --run-dir {args.run_dir} --resume to continue.")
+        else:
+            print("\n  Interrupted (no --run-dir, progress not saved).")
+        return 130
     elapsed = time.time() - start
 
-    # Compute rankings
-    win_rates = {name: [] for name in chars}
-    for (a, b), (ap, bp, _) in results.items():
-        win_rates[a].append(ap)
-        win_rates[b].append(bp)
+    _print_ladder_ranking(ladder, chars)
+    print(f"\n  Completed in {elapsed:.1f}s")
+
+    if args.store:
+        _store_ladder(args.store, ladder, args)
+
+    if args.watch:
+        return _watch_rank(ladder, chars, args)
+
+
+def _resume_conflicts(args, ladder) -> list[str]:
+    """Explicit rank options that differ from the checkpoint being resumed."""
+    conflicts = []
+    for flag, given, saved in (("-n", args.n, ladder.n),
+                               ("--chunk-size", args.chunk_size, ladder.chunk_size),
+                               ("--seed", args.seed, ladder.seed)):
+        if given is not None and given != saved:
+            conflicts.append(f"{flag} {given} (checkpoint: {saved})")
+    if (args.builds or args.tag) and sorted(_resolve_builds(args)) != sorted(ladder.builds):
+        conflicts.append(f"--builds/--tag select other builds (checkpoint: {len(ladder.builds)} builds)")
+    if args.method == "bt":
+        conflicts.append("--method bt (checkpoints are round-robin)")
+    return conflicts
+
+
+def _run_ladder_distributed(ladder, chars: dict, args):
+    """Serve the ladder's chunks to 'dnd-sim worker' nodes (plus --local-workers)."""
+    from sim.distributed import Coordinator, parse_address, spawn_local_workers
+    from sim.progress import Progress, ProgressReporter
+
+    progress = None if args.quiet else Progress(
+        ladder, names={name: c.name for name, c in chars.items()})
+    host, port = parse_address(args.coordinator)
+    with Coordinator(ladder, host, port, progress=progress) as coordinator:
+        address = coordinator.address
+        if not args.quiet:
+            print(f"\n  Coordinator on {address[0]}:{address[1]} — start workers with "
+                  f"'dnd-sim worker {address[0]}:{address[1]}'")
+        procs = spawn_local_workers(address, args.local_workers)
+        reporter = (ProgressReporter(progress, interval=args.progress_every)
+                    if progress is not None else contextlib.nullcontext())
+        with reporter:
+            coordinator.wait(run_dir=args.run_dir, checkpoint_every=args.checkpoint_every)
+        for p in procs:
+            p.join(timeout=5)
+    return ladder
+
+
+def cmd_worker(args):
+    """Pull ladder chunks from a coordinator until it is done."""
+    from sim.distributed import ProtocolError, parse_address, run_worker
+
+    address = parse_address(args.address)
+    print(f"  Worker {os.getpid()} pulling from {address[0]}:{address[1]}")
+    try:
+        done = run_worker(address)
+    except ProtocolError as e:
+        print(f"  Refused: {e}")
+        return 1
+    except OSError as e:
+        print(f"  Cannot reach coordinator: {e}")
+        return 1
+    print(f"  Done: {done} chunks simulated")
+
+
+def _parse_duration(text: str) -> float:
+    """'90', '90s', '5m', '1.5h' -> seconds."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    text = text.strip().lower()
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def _rank_time_budget(chars: dict, args):
+    """Round-robin with an adaptive n per matchup, stopping at a wall-clock deadline."""
+    from sim.budget import run_budgeted
+    from sim.ladder import Ladder
+
+    budget = _parse_duration(args.time_budget)
+    cap = args.n or 1_000_000
+    ladder = Ladder(list(chars), cap, seed=args.seed, chunk_size=args.chunk_size or 20)
+    if not args.quiet:
+        print(f"  Ranking {len(chars)} builds ({len(ladder.matchups)} matchups) "
+              f"within {budget:g}s, chunks of {ladder.chunk_size}\n")
+
+    try:
+        result = run_budgeted(ladder, chars, budget, workers=args.workers, backend=args.backend)
+    except KeyboardInterrupt:
+        print("\n  Interrupted.")
+        return 130
+
+    print(f"\n  {'RANKING (time budget)':^70}")
+    print(f"  {'Rank':<5} {'Build':<40} {'Avg Win%':>10} {'95% CI':>9}")
+    print("  " + "-" * 67)
+    for rank, (name, score, half) in enumerate(result.ranking, 1):
+        print(f"  {rank:>3}.  {chars[name].name:<40} {score:>9.1f}% {'±' + format(half, '.1f'):>9}")
+
+    if not args.quiet:
+        print(f"\n  {'Matchup':<62} {'N':>8} {'A Win%':>7} {'95% CI':>13} {'Fights/s':>9}")
+        print("  " + "-" * 103)
+        for m in sorted(result.matchups, key=lambda m: m.n, reverse=True):
+            lo, hi = m.ci
+            label = f"{chars[m.a].name} vs {chars[m.b].name}"
+            print(f"  {label:<62} {m.n:>8,} {m.win_rate_a:>6.1f}% "
+                  f"{f'{lo:.1f}–{hi:.1f}':>13} {m.fights_per_second:>9,.0f}")
 
-    ranking = [(n, sum(wr) / len(wr), chars[n]) for n, wr in win_rates.items() if wr]
-    ranking.sort(key=lambda x: x[1], reverse=True)
+    ns = [m.n for m in result.matchups]
+    status = "every matchup at the cap" if result.capped else "deadline reached"
+    print(f"\n  {result.fights:,} combats in {result.elapsed:.1f}s ({status}); "
+          f"n per matchup {min(ns):,}–{max(ns):,}")
 
+    if args.store:
+        # n per matchup varies: record the budget and what was actually played.
+        _store_ladder(args.store, ladder, args, {"n": None, "n_cap": cap, "time_budget": budget,
+                                                 "fights": result.fights})
+
+
+def _run_ladder_with_progress(ladder, chars: dict, args, fight_log=None):
+    """run_ladder() with the CLI's checkpoint, worker and progress options."""
+    from sim.ladder import run_ladder
+    from sim.progress import Progress, ProgressReporter
+
+    kwargs = dict(run_dir=args.run_dir, checkpoint_every=args.checkpoint_every,
+                  workers=args.workers, backend=args.backend, fight_log=fight_log,
+                  audit=args.audit)
+    if args.quiet:
+        return run_ladder(ladder, chars, **kwargs)
+    progress = Progress(ladder, names={name: c.name for name, c in chars.items()})
+    with ProgressReporter(progress, interval=args.progress_every):
+        return run_ladder(ladder, chars, progress=progress, **kwargs)
+
+
+def _store_ladder(db_path: str, ladder, args, extra: dict | None = None):
+    from sim.store import connect, record_run
+
+    params = {"builds": ladder.builds, "n": ladder.n, "seed": ladder.seed,
+              "chunk_size": ladder.chunk_size, "tags": args.tag, **(extra or {})}
+    with contextlib.closing(connect(db_path)) as conn:
+        run_id = record_run(conn, "rank", params,
+                            [(a, b, ladder.tally(a, b)) for a, b in ladder.matchups],
+                            seed=ladder.seed, chunk_size=ladder.chunk_size)
+    print(f"  Stored as run {run_id} in {db_path}")
+
+
+def _print_ladder_ranking(ladder, chars: dict):
     print(f"\n  {'RANKING':^70}")
     print(f"  {'Rank':<5} {'Build':<40} {'Avg Win%':>10}")
     print("  " + "-" * 57)
-    for rank, (name, avg, c) in enumerate(ranking, 1):
-        print(f"  {rank:>3}.  {c.name:<40} {avg:>9.1f}%")
+    for rank, (name, avg) in enumerate(ladder.ranking(), 1):
+        print(f"  {rank:>3}.  {chars[name].name:<40} {avg:>9.1f}%")
+    _print_feature_usage(ladder, chars)
+    _print_audit(ladder, chars)
 
-    print(f"\n  Completed in {elapsed:.1f}s")
+
+def _print_feature_usage(ladder, chars: dict):
+    from sim import metrics
+
+    usage = ladder.feature_usage()
+    rows = []
+    for name, _ in ladder.ranking():
+        n, counters = usage[name]
+        parts = [f"{metrics.LABELS[metrics.NAMES[i]]} {value / n:.2f}"
+                 for i, value in enumerate(counters) if value]
+        if parts:
+            rows.append(f"  {chars[name].name:<40} {' · '.join(parts)}")
+    if rows:
+        print(f"\n  {'FEATURE USAGE (per fight)':^70}")
+        print("\n".join(rows))
+
+
+def _print_audit(ladder, chars: dict):
+    from sim.audit import format_table
+    from sim.tactics import PriorityTactics
+
+    usage = ladder.audit_usage()
+    if not usage:
+        return
+    print(f"\n  {'DECISION AUDIT (emitted actions and what became of them)':^70}")
+    for name, _ in ladder.ranking():
+        if name in usage:
+            n, counters = usage[name]
+            plan = PriorityTactics().plan_name(chars[name])
+            print(f"\n  {chars[name].name} — {plan}, {n:,} fights")
+            print("\n".join(format_table(counters, n)))
+
+
+def _watched_builds(args) -> list[str]:
+    """Current build set for --watch (tag filters pick up new or retagged builds)."""
+    if args.builds:
+        names = [b.strip() for b in args.builds.split(",")]
+    else:
+        names = _filter_by_tags(args.tag or [])
+    return [name for name in names if (_BUILDS_DIR / f"{name}.yaml").exists()]
+
+
+def _watch_rank(ladder, chars: dict, args):
+    """Keep the ladder in memory and re-simulate only matchups touched by data edits."""
+    import yaml
+    from sim.watch import DataWatcher
+
+    def _raw(name: str) -> dict:
+        with open(_BUILDS_DIR / f"{name}.yaml") as f:
+            return yaml.safe_load(f) or {}
+
+    watcher = DataWatcher(_DATA_DIR)
+    raw = {name: _raw(name) for name in chars}
+    print(f"\n  Watching {_DATA_DIR} for changes (Ctrl-C to stop)...")
+    try:
+        while True:
+            time.sleep(args.poll)
+            try:
+                change = watcher.poll()
+                if change is None:
+                    continue
+                change.apply()
+                names = _watched_builds(args)
+                for name in names:
+                    if name not in raw or name in change.builds:
+                        raw[name] = _raw(name)
+                raw = {name: raw[name] for name in names}
+                affected = change.affected(raw) | (set(names) - set(chars))
+                for name in affected:
+                    chars[name] = load_build(str(_BUILDS_DIR / f"{name}.yaml"))
+                chars = {name: chars[name] for name in names}
+            except (yaml.YAMLError, KeyError, ValueError, FileNotFoundError) as e:
+                print(f"\n  Error loading data ({type(e).__name__}: {e}) — fix and save again.")
+                continue
+
+            edited = ", ".join(str(p.relative_to(_DATA_DIR)) for p in change.paths)
+            print(f"\n  Changed: {edited}")
+            if len(names) < 2:
+                print("  Need at least 2 builds to rank.")
+                continue
+            if names != ladder.builds:
+                ladder = ladder.with_builds(names)
+            ladder.invalidate(affected)
+            pending = {(t.a, t.b) for t in ladder.pending()}
+            start = time.time()
+            _run_ladder_with_progress(ladder, chars, args)
+            print(f"  {len(affected)} build(s) affected, re-simulated {len(pending)} of "
+                  f"{len(ladder.matchups)} matchups in {time.time() - start:.1f}s")
+            _print_ladder_ranking(ladder, chars)
+    except KeyboardInterrupt:
+        print("\n  Stopped watching.")
+        return 0
+
+
+def _rank_bradley_terry(chars: dict, args):
+    """Sparse ranking: fit Bradley–Terry strengths and simulate only informative matchups."""
+    from sim.ranking import rank_bradley_terry
+
+    n = args.n or 3000
+    k = len(chars)
+    full_cost = n * k * (k - 1) // 2
+    print(f"  Ranking {k} builds with Bradley–Terry, {args.batch} combats per step")
+    print(f"  Budget: {full_cost:,} combats (full round-robin at n={n}), "
+          f"stop at {args.confidence:.0%} ordering confidence\n")
+
+    def play(a: str, b: str, batch: int, seed: int) -> tuple[int, int, int]:
+        stats = run_matchup(chars[a], chars[b], n=batch, seed=seed)
+        return stats["combatant_a"]["wins"], stats["combatant_b"]["wins"], stats["draws"]
+
+    start = time.time()
+    result = rank_bradley_terry(
+        list(chars), play,
+        batch=args.batch, confidence=args.confidence,
+        max_fights=full_cost, seed=args.seed,
+    )
+    elapsed = time.time() - start
+
+    print(f"  {'RANKING (Bradley–Terry)':^70}")
+    print(f"  {'Rank':<5} {'Build':<40} {'Exp Win%':>10} {'Strength':>14}")
+    print("  " + "-" * 72)
+    for rank, name in enumerate(result.ordering, 1):
+        c = chars[name]
+        strength = f"{result.strengths[name]:+.2f}±{result.std_errors[name]:.2f}"
+        print(f"  {rank:>3}.  {c.name:<40} {result.expected_win_rate(name):>9.1f}% {strength:>14}")
+
+    status = "ordering stable" if result.converged else "budget exhausted"
+    print(f"\n  {result.fights:,} combats over {len(result.tallies)} of {k * (k - 1) // 2} matchups "
+          f"({result.fights / full_cost:.0%} of round-robin) — {status}")
+    print(f"  Completed in {elapsed:.1f}s")
 
 
 def cmd_dps(args):
     """DPS analysis against static AC targets."""
-    from sim.dps import simulate_dpr
+    from sim.batch import parse_acs
+    from sim.dps import simulate_dpr_sweep
     builds = _resolve_builds(args)
-    acs = [int(x) for x in (args.ac or "14,16,18").split(",")]
+    acs = parse_acs(args.ac or "14,16,18")
+    if args.curve:
+        return _dps_curve(builds, acs, args)
     n = args.n or 5000
 
     print(f"  DPS Analysis — {n} rounds per measurement\n")
@@ -212,12 +547,282 @@ def cmd_dps(args):
             continue
         char = load_build(str(path))
         row = f"  {char.name:<40}"
-        for ac in acs:
-            dpr = simulate_dpr(char, ac, n=n, use_surge=args.burst)
+        # One pass rolls each round once and scores it against every AC.
+        for dpr in simulate_dpr_sweep(char, acs, n=n, use_surge=args.burst):
             row += f" {dpr:>8.2f}"
         print(row)
 
 
+def _dps_curve(builds: list[str], acs: list[int], args):
+    """dps --curve: damage by round through whole fights, resources running down."""
+    from sim.dps import N_FIGHTS, dpr_curves
+
+    n = args.n or N_FIGHTS
+    templates = {name: load_build(str(_BUILDS_DIR / f"{name}.yaml")) for name in builds
+                 if (_BUILDS_DIR / f"{name}.yaml").exists()}
+    print(f"  DPR Curve — {n} fights of {args.curve} rounds per build, 95% CI\n")
+    curves = dpr_curves(templates, acs, args.curve, n, seed=args.seed,
+                        workers=args.workers, backend=args.backend)
+    for name, curve in curves.items():
+        for k, ac in enumerate(acs):
+            print(f"  {templates[name].name} — AC {ac}")
+            print(f"  {'Round':>7} {'DPR':>17} {'Cumulative':>19}")
+            for r in range(curve.rounds):
+                mean, ci = curve.round_dpr(k, r)
+                total, total_ci = curve.cumulative(k, r)
+                print(f"  {r + 1:>7} {mean:>9.2f} ± {ci:>5.2f} {total:>10.2f} ± {total_ci:>5.2f}")
+            print()
+
+
+def cmd_batch(args):
+    """Run a YAML manifest of rank/compare/fight/dps jobs in one warm process."""
+    from sim.batch import load_manifest, run_batch
+    from sim.session import SimSession
+
+    try:
+        jobs, out_dir = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"  {e}")
+        sys.exit(1)
+    if args.out:
+        out_dir = Path(args.out)
+
+    print(f"  Running {len(jobs)} job(s) from {args.manifest} -> {out_dir}/")
+    start = time.time()
+    if args.store:
+        from sim.store import connect
+        store_ctx = contextlib.closing(connect(args.store))
+    else:
+        store_ctx = contextlib.nullcontext()
+    with SimSession(workers=args.workers) as session, store_ctx as store:
+        run_batch(session, jobs, out_dir, store=store,
+                  on_job=lambda job, path: print(f"  {job.kind:<8} {job.name:<30} -> {path.name}"))
+        stats = session.stats()
+    shared = stats["coalesced"] + stats["cache_hits"]
+    print(f"\n  {stats['simulated']} simulation units run, {shared} shared between jobs")
+    print(f"  Completed in {time.time() - start:.1f}s")
+
+
+def cmd_results(args):
+    """Query stored results without re-simulating."""
+    from sim.store import Selector, connect, latest_engine, query
+
+    build = Selector(names=args.build or [], tags=args.tag or [], cls=args.cls,
+                     species=args.species, role=args.role)
+    opponent = Selector(names=args.vs or [], tags=args.vs_tag or [], cls=args.vs_class,
+                        species=args.vs_species, role=args.vs_role)
+    with contextlib.closing(connect(args.db)) as conn:
+        engine = latest_engine(conn) if args.engine == "latest" else args.engine
+        rows = query(conn, build=build, opponent=opponent, level=args.level,
+                     tactic=args.tactic, engine=args.engine)
+    if not rows:
+        print("  No stored results match.")
+        return 1
+
+    print(f"  {len(rows)} stored matchups (engine {engine})\n")
+    print(f"  {'Build':<36} {'Opponent':<36} {'N':>7} {'Win%':>7} {'Rounds':>7}")
+    print("  " + "-" * 97)
+    for r in rows:
+        print(f"  {r.build:<36} {r.opponent:<36} {r.n:>7} {r.win_rate:>6.1f}% {r.avg_rounds:>7.2f}")
+
+    totals: dict[str, list[int]] = {}
+    for r in rows:
+        t = totals.setdefault(r.build, [0, 0])
+        t[0] += r.wins
+        t[1] += r.n
+    print(f"\n  {'Build':<36} {'Win% vs selection':>18}")
+    for name, (wins, n) in sorted(totals.items(), key=lambda kv: -kv[1][0] / kv[1][1]):
+        print(f"  {name:<36} {wins / n * 100:>17.1f}%")
+
+
+def cmd_fights(args):
+    """Grouped win rates from a columnar per-fight log."""
+    from sim.fightlog import FightLog
+
+    by = [c.strip() for c in args.by.split(",")]
+    with FightLog(args.path) as log:
+        for name in by:
+            if name != "build" and name not in log.meta["columns"]:
+                print(f"  Unknown column {name!r}; have: build, {', '.join(log.meta['columns'])}")
+                return 1
+        groups = log.win_rates(by[0] if len(by) == 1 else by)
+        matchups = log.matchups
+
+    def label(key) -> str:
+        values = key if isinstance(key, tuple) else (key,)
+        return "  ".join(
+            " vs ".join(matchups[v]) if col == "matchup" else f"{col}={v}" if len(by) > 1 else str(v)
+            for col, v in zip(by, values)
+        )
+
+    print(f"  {sum(g['n'] for g in groups.values()):,} fights grouped by {', '.join(by)}\n")
+    side = "Win%" if by == ["build"] else "A Win%"
+    print(f"  {', '.join(by):<60} {'N':>10} {side:>8} {'Draws':>7}")
+    print("  " + "-" * 88)
+    for key, g in groups.items():
+        print(f"  {label(key):<60} {g['n']:>10,} {g['win_rate_a']:>7.1f}% {g['draws']:>7,}")
+
+
+def cmd_tune(args):
+    """Tune one build's tactic thresholds by successive halving; write a tactics file."""
+    from sim.tactics import TACTICS_DIR
+    from sim.tune import (
+        parameter_space, parse_param, sample_candidates, successive_halving, write_tactics,
+    )
+
+    path = _BUILDS_DIR / f"{args.build}.yaml"
+    if not path.exists():
+        print(f"  Build not found: {args.build}")
+        return 1
+    templates = {args.build: load_build(str(path))}
+    if args.builds or args.tag:
+        opponents = [b for b in _resolve_builds(args) if b != args.build]
+    else:
+        level = templates[args.build].level
+        opponents = [b for b in _all_build_names()
+                     if b != args.build and load_build(str(_BUILDS_DIR / f"{b}.yaml")).level == level]
+    for name in opponents:
+        if name not in templates:
+            templates[name] = load_build(str(_BUILDS_DIR / f"{name}.yaml"))
+    if not opponents:
+        print("  No opponents to tune against.")
+        return 1
+
+    space = parameter_space(templates[args.build], args.base)
+    try:
+        space.update(parse_param(p, args.base) for p in args.param or [])
+    except ValueError as e:
+        print(f"  {e}")
+        return 1
+    if not space:
+        print(f"  {args.build} has no tunable tactic parameters.")
+        return 1
+    seed = args.seed if args.seed is not None else random.getrandbits(31)
+    candidates = sample_candidates(space, args.candidates, seed)
+
+    print(f"  Tuning {args.build} ({args.base}) against {len(opponents)} opponents, seed {seed}")
+    for name, values in space.items():
+        shown = f"{len(values)} subsets" if name == "maneuvers" else ", ".join(map(str, values))
+        print(f"    {name}: {shown}")
+    print(f"  {len(candidates)} candidates, n={args.n} per opponent, eta={args.eta}\n")
+
+    def report(rung):
+        print(f"  Rung n={rung.n}: {len(rung.scores)} candidates")
+        for params, score in rung.scores[:3]:
+            print(f"    {score * 100:6.1f}%  {params.to_dict() or 'defaults'}")
+
+    start = time.time()
+    rungs = successive_halving(
+        args.build, templates, opponents, candidates, base=args.base,
+        n0=args.n, eta=args.eta, max_n=args.max_n, seed=seed,
+        workers=args.workers, backend=args.backend, on_rung=report)
+    out = args.out or TACTICS_DIR / f"tuned_{args.build}.yaml"
+    out = write_tactics(out, args.build, args.base, rungs, opponents)
+    print(f"\n  Wrote {out} in {time.time() - start:.1f}s  (use --tactic1 {out.stem})")
+
+
+def cmd_replay(args):
+    """Re-run one fight of a seeded run from its dice tape, fully logged."""
+    from sim.dice import TapeError
+    from sim.ladder import chunk_seed
+    from sim.replay import FightTape, record_fight, replay
+
+    if args.tape:
+        tape = FightTape.load(args.tape)
+    else:
+        if not (args.build1 and args.build2) or args.seed is None:
+            print("  Need --tape, or --build1, --build2 and --seed.")
+            return 1
+        a, b = args.build1, args.build2
+        seed = args.seed
+        if args.chunk is not None:
+            a, b = sorted((a, b))           # ladders store matchups name-sorted
+            seed = chunk_seed(args.seed, a, b, args.chunk)
+        tape = record_fight(load_build(_BUILDS_DIR / f"{a}.yaml"),
+                            load_build(_BUILDS_DIR / f"{b}.yaml"), a, b,
+                            seed=seed, fight=args.fight,
+                            tactic_a=args.tactic1, tactic_b=args.tactic2)
+    if args.save:
+        tape.save(args.save)
+
+    try:
+        state = replay(tape, load_build(_BUILDS_DIR / f"{tape.build_a}.yaml"),
+                       load_build(_BUILDS_DIR / f"{tape.build_b}.yaml"))
+    except TapeError as e:
+        print(f"  Replay diverged: {e}")
+        return 1
+    print("\n".join(state.combat_log))
+    print(f"\n  Fight {tape.fight} of seed {tape.seed}: {tape.rounds} rounds, "
+          f"{len(tape.draws)} draws" + (f" (tape saved to {args.save})" if args.save else ""))
+
+
+def cmd_golden(args):
+    """Check the engine against the golden determinism corpus (or accept a change)."""
+    from sim import golden
+
+    path = Path(args.path)
+    if not path.exists():
+        if not args.accept:
+            print(f"  No golden corpus at {path}; create one with --accept.")
+            return 1
+        corpus = golden.generate()
+        golden.save(corpus, path)
+        print(f"  Wrote {len(corpus['pairings'])} pairings x {corpus['fights']} fights to {path}")
+        return
+
+    old = golden.load(path)
+    start = time.time()
+    new = golden.generate() if args.accept else golden.rerun(old)
+    d = golden.diff(old, new)
+    print(f"  {d.fights:,} golden fights re-run in {time.time() - start:.1f}s")
+
+    if d.identical:
+        print("  Identical: every fight draws the same dice and ends the same way.")
+    else:
+        draws = sum(p.draws_changed for p in d.pairings)
+        outcomes = sum(p.outcomes_changed for p in d.pairings)
+        print(f"  {draws:,} fights drew differently, {outcomes:,} ended differently "
+              f"across {len(d.pairings)} pairings")
+        if d.pairings:
+            print(f"\n  {'Pairing':<62} {'Changed':>8} {'A Win% old':>11} {'new':>7}")
+            print("  " + "-" * 91)
+            for p in sorted(d.pairings, key=lambda p: -abs(p.new_win_rate_a - p.old_win_rate_a)):
+                print(f"  {p.a + ' vs ' + p.b:<62} {p.draws_changed:>8} "
+                      f"{p.old_win_rate_a:>10.1f}% {p.new_win_rate_a:>6.1f}%")
+            p = d.pairings[0]
+            print(f"\n  Inspect one: ./dnd-sim replay --build1 {p.a} --build2 {p.b} "
+                  f"--seed {golden.pairing_seed(p.a, p.b)} --fight {p.first_changed}")
+        for a, b in d.added:
+            print(f"  + {a} vs {b}")
+        for a, b in d.removed:
+            print(f"  - {a} vs {b}")
+
+    if args.accept:
+        golden.save(new, path)
+        print(f"  Accepted: wrote {path}")
+    elif not d.identical:
+        print("  If this is an intended rules change: ./dnd-sim golden --accept")
+        return 1
+
+
+def cmd_serve(args):
+    """Long-running query daemon with warm templates and a results cache."""
+    from sim.server import make_server
+    from sim.session import SimSession
+
+    with SimSession(workers=args.workers) as session:
+        server = make_server(session, host=args.host, port=args.port,
+                             socket_path=args.socket, quiet=args.quiet)
+        where = args.socket or f"http://{args.host}:{args.port}"
+        print(f"  Serving on {where} with {args.workers} worker(s) (Ctrl-C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n  Shutting down.")
+        finally:
+            server.server_close()
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -242,6 +847,32 @@ def main():
     p.add_argument("--build1", required=True)
     p.add_argument("--build2", required=True)
     p.add_argument("-n", type=int, default=1)
+    p.add_argument("--tactic1", default="aggressive",
+                   help="Tactics for build 1: a built-in, a tactics/priority/ name or a rule file")
+    p.add_argument("--tactic2", default="aggressive", help="Tactics for build 2 (as --tactic1)")
+    p.add_argument("--audit", action="store_true",
+                   help="Count each side's emitted actions as executed or skipped (and why)")
+
+    # replay
+    p = sub.add_parser("replay", help="Replay one fight of a seeded run with a full log")
+    p.add_argument("--build1")
+    p.add_argument("--build2")
+    p.add_argument("--tactic1", default="aggressive")
+    p.add_argument("--tactic2", default="aggressive")
+    p.add_argument("--seed", type=int, help="Seed of the run the fight came from")
+    p.add_argument("--fight", type=int, default=0,
+                   help="Fight index within the run (within the chunk with --chunk)")
+    p.add_argument("--chunk", type=int,
+                   help="Ladder chunk index: replay a fight from 'rank --seed'")
+    p.add_argument("--save", metavar="PATH", help="Write the dice tape to this file")
+    p.add_argument("--tape", metavar="PATH", help="Replay a saved dice tape")
+
+    # golden
+    p = sub.add_parser("golden", help="Check the engine against the golden determinism corpus")
+    p.add_argument("--accept", action="store_true",
+                   help="Regenerate the corpus from the current engine (shows the win-rate diff)")
+    p.add_argument("--path", default=str(_PROJECT_ROOT / "tests" / "golden" / "corpus.json"),
+                   help="Corpus file (default: tests/golden/corpus.json)")
 
     # compare
     p = sub.add_parser("compare", help="Head-to-head between builds")
@@ -253,15 +884,134 @@ def main():
     p = sub.add_parser("rank", help="Round-robin ranking")
     p.add_argument("--builds", help="Comma-separated build names")
     p.add_argument("--tag", action="append", help="Filter by tag")
-    p.add_argument("-n", type=int, default=3000)
+    p.add_argument("-n", type=int, default=None,
+                   help="Combats per matchup (default: 3000; the per-matchup cap with --time-budget)")
+    p.add_argument("--method", choices=["round-robin", "bt"], default="round-robin",
+                   help="round-robin (every matchup) or bt (sparse Bradley–Terry)")
+    p.add_argument("--confidence", type=float, default=0.95,
+                   help="bt: stop when adjacent ranks are ordered at this confidence")
+    p.add_argument("--batch", type=int, default=100, help="bt: combats per selected matchup")
+    p.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    p.add_argument("--run-dir", help="Checkpoint round-robin progress to this directory")
+    p.add_argument("--resume", action="store_true",
+                   help="Continue the run checkpointed in --run-dir")
+    p.add_argument("--checkpoint-every", type=float, default=30.0,
+                   help="Seconds between checkpoints (default: 30)")
+    p.add_argument("--chunk-size", type=int, default=None,
+                   help="Combats per seeded chunk of a matchup "
+                        "(default: 500, or 20 with --time-budget)")
+    p.add_argument("--coordinator", metavar="HOST:PORT", nargs="?", const="127.0.0.1:8766",
+                   help="Distribute chunks to 'dnd-sim worker' nodes from this address "
+                        "(default 127.0.0.1:8766; use 0.0.0.0:PORT for remote workers)")
+    p.add_argument("--local-workers", type=int, default=0,
+                   help="With --coordinator: also start this many worker processes here")
+    p.add_argument("--time-budget", metavar="DURATION",
+                   help="Best ladder within this wall time (e.g. 60s, 5m): adaptive n per matchup")
+    p.add_argument("--watch", action="store_true",
+                   help="After ranking, re-rank incrementally whenever data/ changes")
+    p.add_argument("--poll", type=float, default=1.0,
+                   help="--watch: seconds between scans of data/ (default: 1)")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Workers simulating chunks in parallel (default: 1)")
+    p.add_argument("--backend", choices=("processes", "threads"), default="processes",
+                   help="Run --workers as processes or threads (threads pay off on "
+                        "free-threaded Python; default: processes)")
+    p.add_argument("--progress-every", type=float, default=2.0,
+                   help="Seconds between progress lines on stderr (default: 2)")
+    p.add_argument("-q", "--quiet", action="store_true",
+                   help="No build summary or progress output; print only the ranking")
+    p.add_argument("--store", help="Record the finished ladder in this SQLite results database")
+    p.add_argument("--fights", metavar="DIR",
+                   help="Record every fight to a columnar log directory (see 'fights' mode)")
+    p.add_argument("--audit", action="store_true",
+                   help="Count each build's emitted actions as executed or skipped (and why)")
 
     # dps
     p = sub.add_parser("dps", help="DPS against static AC")
     p.add_argument("--builds", help="Comma-separated build names")
     p.add_argument("--tag", action="append", help="Filter by tag")
-    p.add_argument("--ac", default="14,16,18", help="Comma-separated AC values")
-    p.add_argument("-n", type=int, default=5000)
+    p.add_argument("--ac", default="14,16,18",
+                   help="Comma-separated AC values or an inclusive range like 10-25")
+    p.add_argument("-n", type=int, help="Rounds per AC (default: 5000), or fights with --curve")
     p.add_argument("--burst", action="store_true", help="First-round burst with Action Surge")
+    p.add_argument("--curve", type=int, metavar="ROUNDS",
+                   help="DPR by round through fights of ROUNDS rounds, resources running down "
+                        "(-n fights, default 2000)")
+    p.add_argument("--seed", type=int, help="--curve: seed for reproducible curves")
+    p.add_argument("--workers", type=int, default=1,
+                   help="--curve: builds simulated in parallel (default: 1)")
+    p.add_argument("--backend", choices=("processes", "threads"), default="processes",
+                   help="Run --workers as processes or threads (default: processes)")
+
+    # tune
+    p = sub.add_parser("tune", help="Tune a build's tactic thresholds by successive halving")
+    p.add_argument("--build", required=True, help="Build to tune")
+    p.add_argument("--builds", help="Comma-separated opponents (default: every build at its level)")
+    p.add_argument("--tag", action="append", help="Filter opponents by tag")
+    p.add_argument("--base", choices=("aggressive", "defensive"), default="aggressive",
+                   help="Built-in plan whose parameters are tuned (default: aggressive)")
+    p.add_argument("--param", action="append", metavar="NAME=V1,V2",
+                   help="Values to try for one parameter, replacing the defaults (repeatable)")
+    p.add_argument("--candidates", type=int, default=27,
+                   help="Parameter settings sampled for the first rung (default: 27)")
+    p.add_argument("-n", type=int, default=20,
+                   help="Combats per opponent in the first rung (default: 20)")
+    p.add_argument("--eta", type=int, default=3,
+                   help="Keep the best 1/eta each rung and give them eta times the combats "
+                        "(default: 3)")
+    p.add_argument("--max-n", type=int, default=2000,
+                   help="Stop before a rung would exceed this many combats per opponent "
+                        "(default: 2000)")
+    p.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Workers simulating matchups in parallel (default: 1)")
+    p.add_argument("--backend", choices=("processes", "threads"), default="processes",
+                   help="Run --workers as processes or threads (default: processes)")
+    p.add_argument("--out", help="Tactics file to write (default: tactics/priority/tuned_<build>.yaml)")
+
+    # fights
+    p = sub.add_parser("fights", help="Win rates from a per-fight columnar log")
+    p.add_argument("path", help="Fight-log directory written by rank --fights")
+    p.add_argument("--by", default="build",
+                   help="Comma-separated columns to group by: build, matchup, first, rounds, ... "
+                        "(default: build)")
+
+    # results
+    p = sub.add_parser("results", help="Query the results warehouse (no simulation)")
+    p.add_argument("db", help="SQLite results database")
+    p.add_argument("--build", action="append", help="Build name (repeatable)")
+    p.add_argument("--tag", action="append", help="Build tag, all must match (repeatable)")
+    p.add_argument("--class", dest="cls", help="Build class")
+    p.add_argument("--species", help="Build species")
+    p.add_argument("--role", choices=["caster", "martial"])
+    p.add_argument("--vs", action="append", help="Opponent build name (repeatable)")
+    p.add_argument("--vs-tag", action="append", help="Opponent tag (repeatable)")
+    p.add_argument("--vs-class", help="Opponent class")
+    p.add_argument("--vs-species", help="Opponent species")
+    p.add_argument("--vs-role", choices=["caster", "martial"])
+    p.add_argument("--level", type=int)
+    p.add_argument("--tactic")
+    p.add_argument("--engine", default="latest",
+                   help="latest (default), current, all, or an engine version string")
+
+    # batch
+    p = sub.add_parser("batch", help="Run a manifest of experiments in one process")
+    p.add_argument("manifest", help="YAML manifest of jobs")
+    p.add_argument("--out", help="Output directory (default: from the manifest)")
+    p.add_argument("--store", help="Also record rank/compare results in this SQLite database")
+    p.add_argument("--workers", type=int, default=1, help="Simulation processes (default: 1)")
+
+    # worker
+    p = sub.add_parser("worker", help="Simulate ladder chunks for a 'rank --coordinator' node")
+    p.add_argument("address", help="Coordinator HOST:PORT")
+
+    # serve
+    p = sub.add_parser("serve", help="Query daemon (JSON over localhost HTTP or a Unix socket)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    p.add_argument("--workers", type=int, default=1, help="Simulation processes (default: 1)")
+    p.add_argument("-q", "--quiet", action="store_true", help="Do not log requests")
 
     args = parser.parse_args()
 
@@ -273,9 +1023,17 @@ def main():
         "list": cmd_list,
         "show": cmd_show,
         "fight": cmd_fight,
+        "replay": cmd_replay,
+        "golden": cmd_golden,
         "compare": cmd_compare,
         "rank": cmd_rank,
         "dps": cmd_dps,
+        "batch": cmd_batch,
+        "results": cmd_results,
+        "fights": cmd_fights,
+        "tune": cmd_tune,
+        "serve": cmd_serve,
+        "worker": cmd_worker,
     }
     return cmd[args.mode](args) or 0
 
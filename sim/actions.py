@@ -13,6 +13,7 @@ from sim.models import (
     Condition,
     MasteryProperty,
 )
+from sim import metrics
 from sim.dice import d20, d20_detail, eval_dice, eval_dice_twice_take_best, flush_rolls, D20Result, DiceResult, SavageResult
 
 
@@ -256,6 +257,7 @@ def _has_disadvantage(attacker: Character, defender: Character) -> bool:
         luck_res = defender.resources.get("luck_points")
         if luck_res and luck_res.available:
             luck_res.spend()
+            defender.metrics[metrics.LUCKY_USES] += 1
             defender.reaction_used = True
             return True
     return False
@@ -406,6 +408,7 @@ def _try_divine_smite(
         return 0, ()
 
     attacker.spend_spell_slot(slot_level)
+    attacker.metrics[metrics.SMITES] += 1
     result = eval_dice(smite_dice)
     rolls = list(result.rolls)
     total = result.total
@@ -451,7 +454,7 @@ def _try_stunning_strike(attacker: Character, defender: Character, weapon: Weapo
 
 def _try_trip_attack(attacker: Character, defender: Character, state: CombatState) -> tuple[int, str]:
     """Trip Attack: returns (damage, formatted_segment) or (0, "")."""
-    if "trip" not in attacker.maneuvers:
+    if not attacker.uses_maneuver("trip"):
         return 0, ""
     if Condition.PRONE in defender.conditions:
         return 0, ""
@@ -459,6 +462,7 @@ def _try_trip_attack(attacker: Character, defender: Character, state: CombatStat
     if not sup_res or not sup_res.available:
         return 0, ""
     sup_res.spend()
+    attacker.metrics[metrics.SUPERIORITY_DICE] += 1
     result = eval_dice(attacker.superiority_die_size)
     dmg = result.total
     die_val = result.rolls[0] if result.rolls else dmg
@@ -474,16 +478,17 @@ def _try_trip_attack(attacker: Character, defender: Character, state: CombatStat
 
 def _try_menacing_attack(attacker: Character, defender: Character, state: CombatState) -> tuple[int, str]:
     """Menacing Attack: returns (damage, formatted_segment) or (0, "")."""
-    if "menacing" not in attacker.maneuvers:
+    if not attacker.uses_maneuver("menacing"):
         return 0, ""
     if Condition.FRIGHTENED in defender.conditions:
         return 0, ""
     sup_res = attacker.resources.get("superiority_dice")
     if not sup_res or not sup_res.available:
         return 0, ""
-    if "trip" in attacker.maneuvers:
+    if attacker.uses_maneuver("trip"):
         return 0, ""
     sup_res.spend()
+    attacker.metrics[metrics.SUPERIORITY_DICE] += 1
     result = eval_dice(attacker.superiority_die_size)
     dmg = result.total
     die_val = result.rolls[0] if result.rolls else dmg
@@ -555,6 +560,7 @@ def resolve_attack(
         if shield_res and shield_res.available:
             if not any(e.name == "Shield Spell" for e in defender.active_effects):
                 shield_res.spend()
+                defender.metrics[metrics.SHIELD_CASTS] += 1
                 defender.reaction_used = True
                 defender.active_effects.append(ActiveEffect(
                     name="Shield Spell",
@@ -637,7 +643,7 @@ def resolve_attack(
     else:
         # Precision Attack
         if (total < target_ac
-                and "precision" in attacker.maneuvers
+                and attacker.uses_maneuver("precision")
                 and not is_unarmed):
             sup_res = attacker.resources.get("superiority_dice")
             if sup_res and sup_res.available:
@@ -647,6 +653,7 @@ def resolve_attack(
                     precision_roll = precision_result.total
                     precision_die = precision_result.rolls[0] if precision_result.rolls else precision_roll
                     sup_res.spend()
+                    attacker.metrics[metrics.SUPERIORITY_DICE] += 1
                     new_total = total + precision_roll
                     if new_total >= target_ac:
                         # Precision turned miss into hit
@@ -665,6 +672,7 @@ def resolve_attack(
         luck_res = attacker.resources.get("luck_points")
         if luck_res and luck_res.available:
             luck_res.spend()
+            attacker.metrics[metrics.LUCKY_USES] += 1
             d20r_luck = d20_detail(advantage=adv, disadvantage=disadv)
             luck_roll = d20r_luck.chosen
             if luck_roll == 1 and "luck" in attacker.species_traits:
@@ -831,6 +839,9 @@ def _resolve_hit(
     # Divine Smite
     smite_actual, smite_rolls = _try_divine_smite(attacker, defender, is_crit, state)
 
+    if is_crit:
+        attacker.metrics[metrics.CRITS] += 1
+
     # --- Build the single log line ---
     hit_type = "CRIT" if is_crit else "HIT"
 
@@ -994,7 +1005,7 @@ def _try_aoa_retaliation(
 
 def try_riposte(defender: Character, attacker: Character, weapon: Weapon, state: CombatState) -> None:
     """Riposte: reaction attack when enemy misses."""
-    if "riposte" not in defender.maneuvers:
+    if not defender.uses_maneuver("riposte"):
         return
     if defender.reaction_used:
         return
@@ -1005,6 +1016,7 @@ def try_riposte(defender: Character, attacker: Character, weapon: Weapon, state:
     if not mw or state.distance > 5:
         return
     sup_res.spend()
+    defender.metrics[metrics.SUPERIORITY_DICE] += 1
     defender.reaction_used = True
 
     attack_bonus = defender.attack_modifier(mw)
@@ -1021,6 +1033,8 @@ def try_riposte(defender: Character, attacker: Character, weapon: Weapon, state:
         return
 
     if is_crit or total_roll >= target_ac:
+        if is_crit:
+            defender.metrics[metrics.CRITS] += 1
         dmg_info = _calc_damage_info(defender, mw, is_crit, False, False, False)
         damage = dmg_info.total
         riposte_result = eval_dice(defender.superiority_die_size)
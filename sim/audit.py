@@ -0,0 +1,109 @@
+"""Decision audit: what the tactics emit vs what combat actually does.
+
+A tactic's plan lists every applicable action in priority order and
+combat skips whatever the turn no longer allows, so a plan can be long
+and mostly discarded.  With auditing on, _execute_plan() files every
+emitted action under its kind and one outcome:
+
+    executed      the handler changed the fight (HP, range, resources, ...)
+    no_effect     the handler ran but returned without doing anything
+    ranged_phase  a melee action while the fight is still at range
+    action_used   the action was already spent this turn
+    bonus_used    a bonus-action spell with the bonus action already spent
+    no_slot       a spell with no slot of its level left
+    target_down   planned after the opponent dropped
+
+Like sim.metrics the counters are one flat ``array('I')`` per build, one
+slot per (kind, outcome), summed by run_matchup() and merged across chunks
+and workers.  Auditing is off unless asked for (``--audit``): combat then
+never touches the counters.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+# Every kind _execute_plan() handles; anything else is filed as "other".
+KINDS: tuple[str, ...] = (
+    "move", "attack", "ranged_attack", "cast_spell", "rage", "reckless",
+    "call_lightning_bolt", "spiritual_weapon_attack", "flurry", "martial_arts_strike",
+    "cunning_hide", "action_surge", "second_wind", "patient_defense", "adrenaline_rush",
+    "vow_of_enmity", "hunters_mark", "heroic_inspiration", "large_form", "eldritch_blast",
+    "armor_of_agathys", "hex", "breath_weapon", "frenzy_attack", "open_hand_flurry",
+    "shadow_arts", "fast_hands", "steady_aim", "booming_blade", "bladesong",
+    "hexblade_curse", "sacred_weapon", "blade_flourish", "war_magic_attack",
+    "shadow_step", "wholeness_of_body", "other",
+)
+OUTCOMES: tuple[str, ...] = (
+    "executed", "no_effect", "ranged_phase", "action_used", "bonus_used", "no_slot", "target_down",
+)
+LABELS = {
+    "executed": "Executed", "no_effect": "No Effect", "ranged_phase": "Ranged Phase",
+    "action_used": "Action Used", "bonus_used": "Bonus Used", "no_slot": "No Slot",
+    "target_down": "Target Down",
+}
+
+EXECUTED, NO_EFFECT, RANGED_PHASE, ACTION_USED, BONUS_USED, NO_SLOT, TARGET_DOWN = range(len(OUTCOMES))
+
+_KIND_INDEX = {kind: i for i, kind in enumerate(KINDS)}
+_OTHER = _KIND_INDEX["other"]
+SIZE = len(KINDS) * len(OUTCOMES)
+_ZEROS = bytes(array("I").itemsize * SIZE)
+
+
+def new_counters() -> array:
+    """A zeroed per-build audit array."""
+    return array("I", _ZEROS)
+
+
+def count(counters: array, kind: str, outcome: int) -> None:
+    counters[_KIND_INDEX.get(kind, _OTHER) * len(OUTCOMES) + outcome] += 1
+
+
+def accumulate(into: array, counters: array) -> None:
+    for i, value in enumerate(counters):
+        if value:
+            into[i] += value
+
+
+def rows(counters: array) -> dict[str, list[int]]:
+    """Emitted kinds -> counts per outcome (in OUTCOMES order)."""
+    width = len(OUTCOMES)
+    table = {}
+    for k, kind in enumerate(KINDS):
+        row = list(counters[k * width:(k + 1) * width])
+        if any(row):
+            table[kind] = row
+    return table
+
+
+def to_dict(counters: array) -> dict[str, dict[str, int]]:
+    """Non-zero counters as {kind: {outcome: count}} (the JSON/export form)."""
+    return {kind: {OUTCOMES[i]: value for i, value in enumerate(row) if value}
+            for kind, row in rows(counters).items()}
+
+
+def from_dict(data: dict[str, dict[str, int]]) -> array:
+    counters = new_counters()
+    for kind, outcomes in data.items():
+        base = _KIND_INDEX.get(kind, _OTHER) * len(OUTCOMES)
+        for outcome, value in outcomes.items():
+            if outcome in LABELS:
+                counters[base + OUTCOMES.index(outcome)] += value
+    return counters
+
+
+def format_table(counters: array, fights: int, indent: str = "  ") -> list[str]:
+    """Per-kind lines: emitted per fight, then each outcome's share."""
+    table = rows(counters)
+    if not table:
+        return []
+    shown = [i for i in range(len(OUTCOMES)) if any(row[i] for row in table.values())]
+    header = f"{indent}{'Action':24s} {'Emitted/Fight':>13s}" + "".join(
+        f" {LABELS[OUTCOMES[i]]:>12s}" for i in shown)
+    lines = [header]
+    for kind, row in sorted(table.items(), key=lambda item: -sum(item[1])):
+        emitted = sum(row)
+        lines.append(f"{indent}{kind:24s} {emitted / max(1, fights):>13.2f}" + "".join(
+            f" {row[i] / emitted:>12.0%}" if row[i] else f" {'—':>12s}" for i in shown))
+    return lines
@@ -0,0 +1,189 @@
+"""``dnd-sim batch``: run a manifest of experiments in one warm process.
+
+A manifest is a YAML file::
+
+    defaults: {n: 3000, seed: 1}        # optional, applied to every job
+    output_dir: results                 # optional, relative to the manifest
+    jobs:
+      - {name: rank_l3, kind: rank, tags: [level3]}
+      - {name: rank_l5, kind: rank, tags: [level5]}
+      - {name: dps_l5, kind: dps, tags: [level5], ac: "14-20"}
+      - {name: six, kind: compare, builds: [a, b, c, d, e, f]}
+      - {name: duel, kind: fight, builds: [a, b], n: 1}
+
+Every job's chunks are submitted to one SimSession before any result is
+awaited, so all fights share one worker pool and a matchup appearing in
+several jobs (say, inside both rank_l5 and six) is simulated once.  Each job
+writes ``<output_dir>/<name>.json`` (``.txt`` for fight logs).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import yaml
+
+from sim.ladder import MatchupTally
+from sim.session import DEFAULT_SEED, SimSession, tally_dict
+
+if TYPE_CHECKING:
+    import sqlite3
+
+JOB_KINDS = ("rank", "compare", "dps", "fight")
+_DEFAULT_N = {"rank": 3000, "compare": 3000, "dps": 5000, "fight": 1}
+
+
+@dataclass
+class Job:
+    name: str
+    kind: str
+    builds: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    n: int = 3000
+    seed: int = DEFAULT_SEED
+    acs: list[int] = field(default_factory=lambda: [14, 16, 18])
+    burst: bool = False
+
+
+def parse_acs(spec) -> list[int]:
+    """AC list from [14, 16], "14,16,18" or an inclusive range "14-20"."""
+    if isinstance(spec, int):
+        return [spec]
+    if isinstance(spec, list):
+        return [int(ac) for ac in spec]
+    spec = str(spec).strip()
+    if "-" in spec:
+        lo, hi = (int(x) for x in spec.split("-", 1))
+        return list(range(lo, hi + 1))
+    return [int(x) for x in spec.split(",")]
+
+
+def load_manifest(path: str | Path) -> tuple[list[Job], Path]:
+    """Parse and validate a manifest; returns (jobs, output directory)."""
+    path = Path(path)
+    with open(path) as f:
+        raw = yaml.safe_load(f) or {}
+    defaults = raw.get("defaults", {})
+    out_dir = path.parent / raw.get("output_dir", f"{path.stem}_results")
+
+    jobs: list[Job] = []
+    seen: set[str] = set()
+    for i, entry in enumerate(raw.get("jobs", [])):
+        spec = {**defaults, **entry}
+        if entry.get("kind") == "fight":
+            # A default n sized for ladders would mean thousands of verbose logs.
+            spec["n"] = entry.get("n", _DEFAULT_N["fight"])
+        kind = spec.get("kind")
+        name = str(spec.get("name") or f"{i + 1:02d}_{kind}")
+        if kind not in JOB_KINDS:
+            raise ValueError(f"job {name!r}: kind must be one of {', '.join(JOB_KINDS)}")
+        if name in seen:
+            raise ValueError(f"job {name!r}: duplicate job name")
+        seen.add(name)
+        builds = spec.get("builds") or []
+        if isinstance(builds, str):
+            builds = [b.strip() for b in builds.split(",")]
+        if kind == "fight" and len(builds) != 2:
+            raise ValueError(f"job {name!r}: fight needs exactly two builds")
+        if not builds and not spec.get("tags"):
+            raise ValueError(f"job {name!r}: give 'builds' or 'tags'")
+        jobs.append(Job(
+            name=name,
+            kind=kind,
+            builds=list(builds),
+            tags=list(spec.get("tags") or []),
+            n=int(spec.get("n", _DEFAULT_N[kind])),
+            seed=int(spec.get("seed", DEFAULT_SEED)),
+            acs=parse_acs(spec.get("ac", [14, 16, 18])),
+            burst=bool(spec.get("burst", False)),
+        ))
+    if not jobs:
+        raise ValueError(f"{path}: no jobs")
+    return jobs, out_dir
+
+
+def _fight_log(session: SimSession, job: Job) -> str:
+    from sim.runner import print_results, run_matchup
+
+    a, b = job.builds
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        results = run_matchup(session.template(a), session.template(b),
+                              n=job.n, verbose=True, seed=job.seed)
+        print_results(results)
+    return buf.getvalue()
+
+
+def _start(session: SimSession, job: Job) -> Callable[[], dict]:
+    builds = session.resolve(job.builds, job.tags)
+    if job.kind == "dps":
+        return session.start_dps(builds, job.acs, job.n, job.burst, job.seed)
+    if len(builds) < 2:
+        raise ValueError(f"job {job.name!r}: needs at least 2 builds")
+    if job.kind == "rank":
+        return session.start_rank(builds, job.n, job.seed)
+    collect = session.start_ladder(builds, job.n, job.seed)
+
+    def compare() -> dict:
+        ladder = collect()
+        return {
+            "n": job.n,
+            "seed": job.seed,
+            "matchups": [tally_dict(a, b, ladder.tally(a, b))
+                         for i, a in enumerate(builds) for b in builds[i + 1:]],
+        }
+    return compare
+
+
+def _store_job(store: "sqlite3.Connection", job: Job, payload: dict, chunk_size: int) -> None:
+    from sim.store import record_run
+
+    matchups = [(m["a"], m["b"], MatchupTally.from_dict(m)) for m in payload["matchups"]]
+    params = {"job": job.name, "builds": job.builds, "tags": job.tags,
+              "n": job.n, "seed": job.seed}
+    record_run(store, job.kind, params, matchups, seed=job.seed, chunk_size=chunk_size)
+
+
+def run_batch(
+    session: SimSession,
+    jobs: list[Job],
+    out_dir: str | Path,
+    on_job: Callable[[Job, Path], None] | None = None,
+    store: "sqlite3.Connection | None" = None,
+) -> list[Path]:
+    """Run *jobs* on *session*, writing one output file per job.
+
+    With *store*, rank and compare results are also recorded in the results
+    warehouse (see sim.store), one run per job.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Submit everything first so the pool sees (and deduplicates) all work.
+    pending = [(job, _start(session, job)) for job in jobs if job.kind != "fight"]
+
+    written = []
+    for job in jobs:
+        if job.kind != "fight":
+            continue
+        path = out_dir / f"{job.name}.txt"
+        path.write_text(_fight_log(session, job))
+        written.append(path)
+        if on_job is not None:
+            on_job(job, path)
+
+    for job, result in pending:
+        path = out_dir / f"{job.name}.json"
+        payload = {"job": job.name, "kind": job.kind, **result()}
+        path.write_text(json.dumps(payload, indent=2) + "\n")
+        if store is not None and job.kind in ("rank", "compare"):
+            _store_job(store, job, payload, session.chunk_size)
+        written.append(path)
+        if on_job is not None:
+            on_job(job, path)
+    return written
@@ -0,0 +1,299 @@
+"""Time-budgeted round-robin: the most precise ladder a deadline allows.
+
+A fixed-n ladder spends the same number of fights on every matchup, but
+matchups differ about 5× in cost (casters deliberate, martials just swing)
+and most of them cannot change the ordering: a build 20 points clear of its
+neighbours is settled after a few hundred fights.  Here the ladder is played
+chunk by chunk instead:
+
+1. a pilot chunk per matchup measures its cost (seconds per fight);
+2. every further chunk goes to the matchup with the largest expected
+   reduction in ordering uncertainty per second of simulation.
+
+The uncertainty model is the ranking itself.  A build's score is its mean
+win rate over the field, and each adjacent pair in the current ordering is
+ambiguous in proportion to ``2·Φ(−|gap| / sd)``.  One more chunk of a
+matchup shrinks the variance of every score difference it enters; that
+shrinkage is weighted by the pair's ambiguity and divided by the chunk's
+expected cost.  Chunks keep the ladder's per-chunk seeding, so the
+fights played are exactly a prefix of the fixed-n ladder's fights for each
+matchup.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from sim.ladder import ChunkResult, ChunkTask, Ladder, _timed_chunk, chunk_pool
+
+if TYPE_CHECKING:
+    from sim.models import Character
+
+Z95 = 1.959964
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def _smoothed(wins: float, n: int) -> float:
+    """Win share with one virtual win and loss, so 100% still has variance."""
+    return (wins + 1.0) / (n + 2.0)
+
+
+def share_variance(wins: float, n: int) -> float:
+    """Variance of a matchup's observed win share after *n* fights (0.25 if unplayed)."""
+    if n <= 0:
+        return 0.25
+    p = _smoothed(wins, n)
+    return p * (1.0 - p) / n
+
+
+def wilson_interval(wins: int, n: int, z: float = Z95) -> tuple[float, float]:
+    """Wilson score interval for a win rate, in percent."""
+    if n <= 0:
+        return 0.0, 100.0
+    p = wins / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half) * 100, min(1.0, centre + half) * 100
+
+
+@dataclass
+class MatchupEstimate:
+    a: str
+    b: str
+    n: int
+    wins_a: int
+    wins_b: int
+    seconds: float               # simulation time spent on this matchup
+
+    @property
+    def win_rate_a(self) -> float:
+        return self.wins_a / self.n * 100 if self.n else 0.0
+
+    @property
+    def win_rate_b(self) -> float:
+        return self.wins_b / self.n * 100 if self.n else 0.0
+
+    @property
+    def ci(self) -> tuple[float, float]:
+        return wilson_interval(self.wins_a, self.n)
+
+    @property
+    def fights_per_second(self) -> float:
+        return self.n / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class BudgetResult:
+    ladder: Ladder
+    ranking: list[tuple[str, float, float]]      # (build, avg win %, ± 95% half-width)
+    matchups: list[MatchupEstimate]
+    fights: int
+    elapsed: float
+    capped: bool                                  # every matchup reached ladder.n
+    chunks: int = 0
+
+
+def scores(ladder: Ladder, estimates: dict[tuple[str, str], MatchupEstimate],
+           inflight: dict[tuple[str, str], int] | None = None,
+           ) -> tuple[dict[str, float], dict[str, float]]:
+    """(score, score variance) per build: mean win share over the whole field."""
+    inflight = inflight or {}
+    k = len(ladder.builds)
+    total = {name: 0.0 for name in ladder.builds}
+    var = {name: 0.0 for name in ladder.builds}
+    for (a, b), m in estimates.items():
+        pa = m.wins_a / m.n if m.n else 0.5
+        pb = m.wins_b / m.n if m.n else 0.5
+        v = share_variance(m.wins_a, m.n + inflight.get((a, b), 0))
+        total[a] += pa
+        total[b] += pb
+        var[a] += v
+        var[b] += v
+    scale = 1.0 / max(1, k - 1)
+    return ({name: total[name] * scale for name in total},
+            {name: var[name] * scale * scale for name in var})
+
+
+def priorities(
+    ladder: Ladder,
+    estimates: dict[tuple[str, str], MatchupEstimate],
+    inflight: dict[tuple[str, str], int],
+    cost: Callable[[tuple[str, str]], float],
+) -> dict[tuple[str, str], float]:
+    """Expected ordering-uncertainty reduction per second for one more chunk of each matchup."""
+    score, var = scores(ladder, estimates, inflight)
+    ordering = sorted(ladder.builds, key=lambda name: score[name], reverse=True)
+    k = len(ladder.builds)
+    scale = 1.0 / max(1, k - 1) ** 2
+
+    # Adjacent pairs: ambiguity per unit variance of the score difference,
+    # summed per build (g) and kept per head-to-head matchup (adjacent).
+    g = {name: 0.0 for name in ladder.builds}
+    adjacent: dict[tuple[str, str], float] = {}
+    for hi, lo in zip(ordering, ordering[1:]):
+        key = (hi, lo) if (hi, lo) in estimates else (lo, hi)
+        head_to_head = estimates.get(key)
+        pair_var = var[hi] + var[lo]
+        if head_to_head is not None:
+            # S_hi − S_lo counts their own matchup twice (±p), not once.
+            pair_var += 2 * scale * share_variance(head_to_head.wins_a,
+                                                    head_to_head.n + inflight.get(key, 0))
+        if pair_var <= 0:
+            continue
+        sd = math.sqrt(pair_var)
+        weight = 2.0 * _normal_cdf(-abs(score[hi] - score[lo]) / sd) / pair_var
+        g[hi] += weight
+        g[lo] += weight
+        adjacent[key] = weight
+
+    out: dict[tuple[str, str], float] = {}
+    for key, m in estimates.items():
+        n = m.n + inflight.get(key, 0)
+        if n >= ladder.n:
+            continue
+        chunk = min(ladder.chunk_size, ladder.n - n)
+        reduction = share_variance(m.wins_a, n) - share_variance(m.wins_a, n + chunk)
+        # A matchup enters its builds' differences with weight 1 each, and
+        # the difference between its own two builds with (1 + 1)² = 4.
+        weight = g[key[0]] + g[key[1]] + 2.0 * adjacent.get(key, 0.0)
+        out[key] = scale * reduction * weight / max(cost(key) * chunk, 1e-9)
+    return out
+
+
+def pilot_order(ladder: Ladder) -> list[tuple[str, str]]:
+    """Matchups ordered round by round (i vs i+1, then i vs i+2, ...).
+
+    If the budget runs out mid-pilot, every build has still played a
+    similar number of opponents.
+    """
+    builds = sorted(ladder.builds)
+    k = len(builds)
+    order = []
+    for offset in range(1, k // 2 + 1):
+        for i in range(k):
+            j = (i + offset) % k
+            if offset * 2 == k and i >= j:
+                continue              # the opposite pairs, once each
+            order.append(tuple(sorted((builds[i], builds[j]))))
+    return order
+
+
+def run_budgeted(
+    ladder: Ladder,
+    templates: dict[str, "Character"],
+    budget: float,
+    *,
+    workers: int = 1,
+    backend: str = "processes",
+    clock: Callable[[], float] = time.monotonic,
+    on_chunk: Callable[[ChunkResult], None] | None = None,
+) -> BudgetResult:
+    """Play *ladder* chunk by chunk until *budget* seconds have passed.
+
+    ``ladder.n`` caps the fights per matchup; the run also ends early if
+    every matchup reaches it.  No chunk is started whose estimated cost would
+    overrun the deadline, so the run finishes within about one chunk of it.
+    """
+    start = clock()
+    deadline = start + budget
+    estimates = {key: MatchupEstimate(*key, 0, 0, 0, 0.0) for key in ladder.matchups}
+    inflight: dict[tuple[str, str], int] = {}
+    next_index = {key: 0 for key in ladder.matchups}
+    pilots = pilot_order(ladder)
+    fights = chunks = 0
+    seconds = 0.0
+
+    def cost(key: tuple[str, str]) -> float:
+        """Seconds per fight: measured, or the field average before the pilot."""
+        m = estimates[key]
+        if m.n:
+            return m.seconds / m.n
+        return seconds / fights if fights else 0.0
+
+    def fitting_task(key: tuple[str, str], now: float) -> ChunkTask | None:
+        """The matchup's next chunk, if it has one that ends before the deadline."""
+        if next_index[key] * ladder.chunk_size >= ladder.n:
+            return None
+        task = ladder.task(*key, next_index[key])
+        return task if now + cost(key) * task.n <= deadline else None
+
+    def next_task() -> ChunkTask | None:
+        # The first pilot that fits, else the highest-priority matchup that
+        # fits: a chunk too long for the time left must not stop cheaper ones.
+        # Pilots that do not fit stay queued.
+        now = clock()
+        task = None
+        for i, key in enumerate(pilots):
+            task = fitting_task(key, now)
+            if task is not None:
+                del pilots[i]
+                break
+        if task is None:
+            ranked = priorities(ladder, estimates, inflight, cost)
+            for key in sorted(ranked, key=ranked.get, reverse=True):
+                task = fitting_task(key, now)
+                if task is not None:
+                    break
+        if task is None:
+            return None
+        key = (task.a, task.b)
+        next_index[key] += 1
+        inflight[key] = inflight.get(key, 0) + task.n
+        return task
+
+    def record(result: ChunkResult) -> None:
+        nonlocal fights, chunks, seconds
+        task, tally = result.task, result.tally
+        key = (task.a, task.b)
+        ladder.record(task, tally)
+        inflight[key] -= task.n
+        m = estimates[key]
+        m.n += tally.n
+        m.wins_a += tally.wins_a
+        m.wins_b += tally.wins_b
+        m.seconds += result.seconds
+        fights += tally.n
+        seconds += result.seconds
+        chunks += 1
+        if on_chunk is not None:
+            on_chunk(result)
+
+    if workers <= 1:
+        while clock() < deadline and (task := next_task()) is not None:
+            record(_timed_chunk(templates, task))
+    else:
+        pool, submit = chunk_pool(templates, workers, backend)
+        with pool:
+            running = set()
+            while True:
+                while len(running) < workers and clock() < deadline:
+                    task = next_task()
+                    if task is None:
+                        break
+                    running.add(submit(task))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+
+    score, var = scores(ladder, estimates)
+    ranking = sorted(((name, score[name] * 100, Z95 * math.sqrt(var[name]) * 100)
+                      for name in ladder.builds), key=lambda r: r[1], reverse=True)
+    return BudgetResult(
+        ladder=ladder,
+        ranking=ranking,
+        matchups=[estimates[key] for key in ladder.matchups],
+        fights=fights,
+        elapsed=clock() - start,
+        capped=all(m.n >= ladder.n for m in estimates.values()),
+        chunks=chunks,
+    )
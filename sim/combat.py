@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import re
+from typing import Callable
 
-from sim.dice import d20, eval_dice, roll
+from sim import audit
+from sim.dice import coin, d20, eval_dice, roll
 from sim.models import Character, CombatState, CombatPhase, Condition, ActiveEffect, DamageType, MasteryProperty
 from sim.actions import (
     resolve_attack,
@@ -17,7 +19,9 @@ from sim.actions import (
 )
 from sim.effects import apply_rage, apply_bear_totem_rage, apply_reckless_attack
 from sim.spells import cantrip_die_count, get_spell, SpellData
-from sim.tactics import TacticsEngine, TurnAction
+from sim.tactics import Plan, TacticsEngine, TurnAction
+
+Decide = Callable[[CombatState], Plan]
 
 
 def _pad_label(label: str) -> str:
@@ -66,15 +70,26 @@ def run_combat(
         state.turn_order = [b, a]
     else:
         # Tied initiative: pure coin flip — no DEX bonus
-        import random
-        state.turn_order = [a, b] if random.random() < 0.5 else [b, a]
+        state.turn_order = [a, b] if coin() else [b, a]
 
     state.log(f"Initiative: {a.name}={init_a}, {b.name}={init_b}")
     state.log(f"Turn order: {state.turn_order[0].name} → {state.turn_order[1].name}")
     state.log(f"Starting distance: {state.distance} ft")
 
+    # Tactics resolve what is fixed for the fight once, here
+    a.maneuver_picks = tactics_a.maneuver_picks()
+    b.maneuver_picks = tactics_b.maneuver_picks()
+    decide_a = tactics_a.bind(a)
+    decide_b = tactics_b.bind(b)
+
     # Combat loop
-    max_rounds = 100
+    _play_rounds(state, decide_a, decide_b, max_rounds=100)
+    return state
+
+
+def _play_rounds(state: CombatState, decide_a: Decide, decide_b: Decide, *, max_rounds: int) -> None:
+    """Play whole rounds until someone falls or *max_rounds* have been played."""
+    a, b = state.combatant_a, state.combatant_b
     while a.is_alive and b.is_alive and state.round_number < max_rounds:
         state.round_number += 1
         state.log(f"\n=== Round {state.round_number} ===")
@@ -82,47 +97,87 @@ def run_combat(
         for char in state.turn_order:
             if not char.is_alive:
                 continue
-            opponent = state.opponent_of(char)
-            tactics = tactics_a if char is a else tactics_b
-
-            _apply_start_of_turn_auras(char, opponent, state)
-            if not char.is_alive:
-                state.log(f"\n{char.name} has fallen! {opponent.name} wins!")
+            if not _take_turn(char, decide_a if char is a else decide_b, state):
                 break
+        _end_round(state)
 
-            if hasattr(char, "_savage_used_this_turn"):
-                char._savage_used_this_turn = False
 
-            _execute_turn(char, opponent, tactics, state)
+def _take_turn(char: Character, decide: Decide, state: CombatState) -> bool:
+    """One combatant's turn, with any Time Stop extra turns. False once someone falls."""
+    opponent = state.opponent_of(char)
 
-            if not opponent.is_alive:
-                state.log(f"\n{opponent.name} has fallen! {char.name} wins!")
-                break
+    _apply_start_of_turn_auras(char, opponent, state)
+    if not char.is_alive:
+        state.log(f"\n{char.name} has fallen! {opponent.name} wins!")
+        return False
 
-            # Extra turns (Time Stop): take additional turns if granted
-            extra_turn_limit = 10  # safety cap
-            while char.extra_turns_remaining > 0 and extra_turn_limit > 0 and char.is_alive and opponent.is_alive:
-                char.extra_turns_remaining -= 1
-                extra_turn_limit -= 1
-                state.log(f"\n=== {char.name} EXTRA TURN (Time Stop) ===")
-                _execute_turn(char, opponent, tactics, state)
-                if not opponent.is_alive:
-                    state.log(f"\n{opponent.name} has fallen! {char.name} wins!")
-                    break
+    if hasattr(char, "_savage_used_this_turn"):
+        char._savage_used_this_turn = False
 
-        # Transition from ranged phase to melee at end of round 1
-        if state.phase == CombatPhase.RANGED:
-            state.phase = CombatPhase.MELEE
-            state.distance = 5
-            state.log("--- Both sides close to melee range. ---")
+    _execute_turn(char, opponent, decide, state)
 
-    return state
+    if not opponent.is_alive:
+        state.log(f"\n{opponent.name} has fallen! {char.name} wins!")
+        return False
+    return _take_extra_turns(char, decide, state)
+
+
+def _take_extra_turns(char: Character, decide: Decide, state: CombatState) -> bool:
+    opponent = state.opponent_of(char)
+    extra_turn_limit = 10  # safety cap
+    while char.extra_turns_remaining > 0 and extra_turn_limit > 0 and char.is_alive and opponent.is_alive:
+        char.extra_turns_remaining -= 1
+        extra_turn_limit -= 1
+        state.log(f"\n=== {char.name} EXTRA TURN (Time Stop) ===")
+        _execute_turn(char, opponent, decide, state)
+        if not opponent.is_alive:
+            state.log(f"\n{opponent.name} has fallen! {char.name} wins!")
+            return False
+    return True
+
+
+def _end_round(state: CombatState) -> None:
+    # Transition from ranged phase to melee at end of round 1
+    if state.phase == CombatPhase.RANGED:
+        state.phase = CombatPhase.MELEE
+        state.distance = 5
+        state.log("--- Both sides close to melee range. ---")
+
+
+def play_out(
+    state: CombatState,
+    char: Character,
+    plan: Plan,
+    decide_a: Decide,
+    decide_b: Decide,
+    *,
+    max_rounds: int,
+) -> None:
+    """Continue a fight from inside *char*'s turn, just before it acts.
+
+    *char* carries out *plan* for the rest of the turn; the fight then goes
+    on with *decide_a* / *decide_b* until someone falls or round
+    *max_rounds* ends.  Used by search tactics to roll out a choice on a
+    copy of the live state.
+    """
+    a = state.combatant_a
+    decide = decide_a if char is a else decide_b
+    opponent = state.opponent_of(char)
+    _execute_plan(char, opponent, plan, state)
+    if not opponent.is_alive or not _take_extra_turns(char, decide, state):
+        return
+    order = state.turn_order
+    for other in order[order.index(char) + 1:]:
+        if other.is_alive and not _take_turn(other, decide_a if other is a else decide_b, state):
+            return
+    _end_round(state)
+    _play_rounds(state, decide_a, decide_b, max_rounds=max_rounds)
 
 
 def _execute_turn(
     char: Character,
     opponent: Character,
-    tactics: TacticsEngine,
+    decide: Decide,
     state: CombatState,
 ) -> None:
     """Execute a single character's turn."""
@@ -213,120 +268,179 @@ def _execute_turn(
         _tick_stunning_strike_expiry(char, state)
         return
 
-    decisions = tactics.decide_turn(char, state)
+    _execute_plan(char, opponent, decide(state), state)
 
+
+def _execute_plan(
+    char: Character,
+    opponent: Character,
+    decisions: Plan,
+    state: CombatState,
+) -> None:
+    """Carry out a turn plan, skipping what the action economy no longer allows."""
     is_ranged_phase = state.phase == CombatPhase.RANGED
     _melee_skip_logged = False
+    counters = char.audit
 
-    _melee_action_kinds = frozenset({
-        "attack", "action_surge", "frenzy_attack", "flurry",
-        "martial_arts_strike", "open_hand_flurry", "booming_blade",
-    })
-
-    for action in decisions:
+    for i, action in enumerate(decisions):
         if not opponent.is_alive:
+            if counters is not None:
+                for rest in decisions[i:]:
+                    audit.count(counters, rest.kind, audit.TARGET_DOWN)
             break
 
-        if action.kind in _melee_action_kinds:
+        if action.kind in _MELEE_ACTION_KINDS:
             if is_ranged_phase:
                 if not _melee_skip_logged:
                     state.log(f"  [Ranged phase — {char.name} cannot attack in melee]")
                     _melee_skip_logged = True
+                if counters is not None:
+                    audit.count(counters, action.kind, audit.RANGED_PHASE)
                 continue
 
-        if action.kind == "rage":
-            _do_rage(char, state)
-        elif action.kind == "reckless":
-            _do_reckless(char, state)
-        elif action.kind == "ranged_attack":
-            if not char.action_used:
-                _do_ranged_attack(char, opponent, action, state)
-        elif action.kind == "move":
-            _do_move(char, opponent, state)
-        elif action.kind == "attack":
-            if not char.action_used:
-                _do_melee_attack(char, opponent, action, state)
-        elif action.kind == "cast_spell":
-            spell_name = action.extra.get("spell", "")
-            spell = get_spell(spell_name) if spell_name else None
-            is_bonus_spell = bool(spell and (spell.bonus_action or spell_name == "shillelagh"))
-            if spell_name and spell and is_bonus_spell:
-                if not char.bonus_action_used:
-                    _do_cast_spell(char, opponent, spell_name, action.extra.get("slot_level", 0), state)
-            elif not char.action_used and spell_name:
-                _do_cast_spell(char, opponent, spell_name, action.extra.get("slot_level", 0), state)
-        elif action.kind == "call_lightning_bolt":
-            if not char.action_used:
-                effect = _find_effect(char, "CallLightning")
-                if effect is not None:
-                    char.action_used = True
-                    _resolve_call_lightning_bolt(char, opponent, int(effect.extra.get("slot_level", 3)), state)
-        elif action.kind == "spiritual_weapon_attack":
-            _do_spiritual_weapon_attack(char, opponent, state)
-        elif action.kind == "flurry":
-            _do_flurry(char, opponent, state)
-        elif action.kind == "martial_arts_strike":
-            _do_martial_arts_strike(char, opponent, state)
-        elif action.kind == "cunning_hide":
-            _do_cunning_hide(char, state)
-        elif action.kind == "action_surge":
-            _do_action_surge(char, opponent, action, state, decisions)
-        elif action.kind == "second_wind":
-            _do_second_wind_action(char, state)
-        elif action.kind == "patient_defense":
-            _do_patient_defense(char, state)
-        elif action.kind == "adrenaline_rush":
-            _do_adrenaline_rush(char, opponent, state)
-        elif action.kind == "vow_of_enmity":
-            _do_vow_of_enmity(char, state)
-        elif action.kind == "hunters_mark":
-            _do_hunters_mark(char, state)
-        elif action.kind == "heroic_inspiration":
-            _do_heroic_inspiration(char, state)
-        elif action.kind == "large_form":
-            _do_large_form(char, state)
-        elif action.kind == "eldritch_blast":
-            if not char.action_used:
-                _do_eldritch_blast(char, opponent, state)
-        elif action.kind == "armor_of_agathys":
-            _do_armor_of_agathys(char, state)
-        elif action.kind == "hex":
-            _do_hex(char, state)
-        elif action.kind == "breath_weapon":
-            if not char.action_used:
-                _do_breath_weapon(char, opponent, state)
-        elif action.kind == "frenzy_attack":
-            _do_frenzy_attack(char, opponent, state)
-        elif action.kind == "open_hand_flurry":
-            _do_open_hand_flurry(char, opponent, state)
-        elif action.kind == "shadow_arts":
-            _do_shadow_arts(char, state)
-        elif action.kind == "fast_hands":
-            _do_fast_hands(char, state)
-        elif action.kind == "steady_aim":
-            _do_steady_aim(char, state)
-        elif action.kind == "booming_blade":
-            if not char.action_used:
-                _do_booming_blade(char, opponent, state)
-        elif action.kind == "bladesong":
-            _do_bladesong(char, state)
-        elif action.kind == "hexblade_curse":
-            _do_hexblade_curse(char, opponent, state)
-        elif action.kind == "sacred_weapon":
-            _do_sacred_weapon(char, state)
-        elif action.kind == "blade_flourish":
-            _do_blade_flourish(char, opponent, state)
-        elif action.kind == "war_magic_attack":
-            _do_war_magic_attack(char, opponent, state)
-        elif action.kind == "shadow_step":
-            _do_shadow_step(char, state)
-        elif action.kind == "wholeness_of_body":
-            _do_wholeness_of_body(char, state)
+        if counters is None:
+            _do_action(char, opponent, action, state, decisions)
+        else:
+            before = _footprint(char, opponent, state)
+            skipped = _do_action(char, opponent, action, state, decisions)
+            if skipped is None:
+                skipped = audit.EXECUTED if _footprint(char, opponent, state) != before else audit.NO_EFFECT
+            audit.count(counters, action.kind, skipped)
 
     char.end_turn()
     _tick_stunning_strike_expiry(char, state)
 
 
+_MELEE_ACTION_KINDS = frozenset({
+    "attack", "action_surge", "frenzy_attack", "flurry",
+    "martial_arts_strike", "open_hand_flurry", "booming_blade",
+})
+
+
+def _footprint(char: Character, opponent: Character, state: CombatState) -> tuple:
+    """What an action can change, compared before and after it when auditing."""
+    return (
+        char.action_used, char.bonus_action_used, state.distance,
+        char.current_hp, char.temp_hp, opponent.current_hp, opponent.temp_hp,
+        len(char.active_effects), len(opponent.active_effects),
+        len(char.conditions), len(opponent.conditions),
+        sum(r.current for r in char.resources.values()),
+    )
+
+
+def _do_action(
+    char: Character,
+    opponent: Character,
+    action: TurnAction,
+    state: CombatState,
+    decisions: Plan,
+) -> int | None:
+    """Carry out one planned action; the audit outcome if it was skipped, else None."""
+    kind = action.kind
+    if kind == "rage":
+        _do_rage(char, state)
+    elif kind == "reckless":
+        _do_reckless(char, state)
+    elif kind == "ranged_attack":
+        if char.action_used:
+            return audit.ACTION_USED
+        _do_ranged_attack(char, opponent, action, state)
+    elif kind == "move":
+        _do_move(char, opponent, state)
+    elif kind == "attack":
+        if char.action_used:
+            return audit.ACTION_USED
+        _do_melee_attack(char, opponent, action, state)
+    elif kind == "cast_spell":
+        spell_name = action.extra.get("spell", "")
+        spell = get_spell(spell_name) if spell_name else None
+        is_bonus_spell = bool(spell and (spell.bonus_action or spell_name == "shillelagh"))
+        slot_level = action.extra.get("slot_level", 0)
+        if spell_name and spell and is_bonus_spell:
+            if char.bonus_action_used:
+                return audit.BONUS_USED
+        elif char.action_used:
+            return audit.ACTION_USED
+        if not spell_name:
+            return None
+        out_of_slots = slot_level > 0 and not char.has_spell_slot(slot_level)
+        _do_cast_spell(char, opponent, spell_name, slot_level, state)
+        if out_of_slots:
+            return audit.NO_SLOT
+    elif kind == "call_lightning_bolt":
+        if char.action_used:
+            return audit.ACTION_USED
+        effect = _find_effect(char, "CallLightning")
+        if effect is not None:
+            char.action_used = True
+            _resolve_call_lightning_bolt(char, opponent, int(effect.extra.get("slot_level", 3)), state)
+    elif kind == "spiritual_weapon_attack":
+        _do_spiritual_weapon_attack(char, opponent, state)
+    elif kind == "flurry":
+        _do_flurry(char, opponent, state)
+    elif kind == "martial_arts_strike":
+        _do_martial_arts_strike(char, opponent, state)
+    elif kind == "cunning_hide":
+        _do_cunning_hide(char, state)
+    elif kind == "action_surge":
+        _do_action_surge(char, opponent, action, state, decisions)
+    elif kind == "second_wind":
+        _do_second_wind_action(char, state)
+    elif kind == "patient_defense":
+        _do_patient_defense(char, state)
+    elif kind == "adrenaline_rush":
+        _do_adrenaline_rush(char, opponent, state)
+    elif kind == "vow_of_enmity":
+        _do_vow_of_enmity(char, state)
+    elif kind == "hunters_mark":
+        _do_hunters_mark(char, state)
+    elif kind == "heroic_inspiration":
+        _do_heroic_inspiration(char, state)
+    elif kind == "large_form":
+        _do_large_form(char, state)
+    elif kind == "eldritch_blast":
+        if char.action_used:
+            return audit.ACTION_USED
+        _do_eldritch_blast(char, opponent, state)
+    elif kind == "armor_of_agathys":
+        _do_armor_of_agathys(char, state)
+    elif kind == "hex":
+        _do_hex(char, state)
+    elif kind == "breath_weapon":
+        if char.action_used:
+            return audit.ACTION_USED
+        _do_breath_weapon(char, opponent, state)
+    elif kind == "frenzy_attack":
+        _do_frenzy_attack(char, opponent, state)
+    elif kind == "open_hand_flurry":
+        _do_open_hand_flurry(char, opponent, state)
+    elif kind == "shadow_arts":
+        _do_shadow_arts(char, state)
+    elif kind == "fast_hands":
+        _do_fast_hands(char, state)
+    elif kind == "steady_aim":
+        _do_steady_aim(char, state)
+    elif kind == "booming_blade":
+        if char.action_used:
+            return audit.ACTION_USED
+        _do_booming_blade(char, opponent, state)
+    elif kind == "bladesong":
+        _do_bladesong(char, state)
+    elif kind == "hexblade_curse":
+        _do_hexblade_curse(char, opponent, state)
+    elif kind == "sacred_weapon":
+        _do_sacred_weapon(char, state)
+    elif kind == "blade_flourish":
+        _do_blade_flourish(char, opponent, state)
+    elif kind == "war_magic_attack":
+        _do_war_magic_attack(char, opponent, state)
+    elif kind == "shadow_step":
+        _do_shadow_step(char, state)
+    elif kind == "wholeness_of_body":
+        _do_wholeness_of_body(char, state)
+    return None
+
+
 def _log_start_of_turn_status(char: Character, state: CombatState) -> None:
     """Log STATUS lines for effects that will expire at start of turn."""
     for e in char.active_effects:
@@ -1033,7 +1147,7 @@ def _do_cunning_hide(char: Character, state: CombatState) -> None:
 
 def _do_action_surge(
     char: Character, opponent: Character, action: TurnAction,
-    state: CombatState, decisions: list[TurnAction]
+    state: CombatState, decisions: Plan
 ) -> None:
     res = char.resources.get("action_surge")
     if not res or not res.available or not char.action_used:
@@ -1,10 +1,117 @@
-"""Dice rolling and expression evaluation."""
+"""Dice rolling and expression evaluation.
+
+Every random draw the engine makes goes through ``_draw(lo, hi)``, which
+asks the calling thread's active ``DiceContext``.  A context owns the
+draw function and the legacy roll log; ``DiceContext(seed)`` also owns a
+private ``random.Random``, so seeded runs in different threads never share
+or perturb each other's streams.  A thread that has not activated a context
+gets a default one drawing from the global ``random`` module, as the engine
+always did.
+
+``recording()`` swaps in a draw that appends each result to a tape, and
+``replaying(tape)`` one that returns the taped results in order.  A fight
+replayed from its tape therefore takes exactly the same branches as when it
+was recorded — provided every engine mode draws identically, which is why
+nothing may roll dice only when logging is enabled.
+"""
 
 from __future__ import annotations
 
 import random
 import re
+import threading
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import Callable, Iterator
+
+
+class DiceContext:
+    """Per-run dice state: where draws come from, and the legacy roll log."""
+
+    __slots__ = ("rng", "draw", "roll_log")
+
+    def __init__(self, seed: int | None = None, *, rng: random.Random | None = None):
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.rng = rng
+        self.draw: Callable[[int, int], int] = rng.randint if rng is not None else random.randint
+        self.roll_log: list[str] = []
+
+
+class _Active(threading.local):
+    def __init__(self) -> None:
+        self.ctx = DiceContext()
+
+
+_active = _Active()
+
+
+def current() -> DiceContext:
+    """The calling thread's active dice context."""
+    return _active.ctx
+
+
+@contextmanager
+def using(ctx: DiceContext) -> Iterator[DiceContext]:
+    """Make *ctx* the calling thread's dice context for the block."""
+    previous, _active.ctx = _active.ctx, ctx
+    try:
+        yield ctx
+    finally:
+        _active.ctx = previous
+
+
+def _draw(lo: int, hi: int) -> int:
+    return _active.ctx.draw(lo, hi)
+
+
+class TapeError(RuntimeError):
+    """A replayed fight drew differently from the recorded one."""
+
+
+@contextmanager
+def recording() -> Iterator[array]:
+    """Capture every draw made inside the block into an ``array('H')``."""
+    ctx = _active.ctx
+    tape = array("H")
+    inner = ctx.draw
+
+    def draw(lo: int, hi: int) -> int:
+        value = inner(lo, hi)
+        tape.append(value)
+        return value
+
+    ctx.draw = draw
+    try:
+        yield tape
+    finally:
+        ctx.draw = inner
+
+
+@contextmanager
+def replaying(tape: array) -> Iterator[None]:
+    """Serve draws from *tape* instead of the RNG; the block must use all of it."""
+    ctx = _active.ctx
+    pos = 0
+
+    def draw(lo: int, hi: int) -> int:
+        nonlocal pos
+        if pos >= len(tape):
+            raise TapeError(f"tape exhausted after {pos} draws")
+        value = tape[pos]
+        if not lo <= value <= hi:
+            raise TapeError(f"draw {pos}: taped {value} is outside {lo}..{hi}")
+        pos += 1
+        return value
+
+    previous, ctx.draw = ctx.draw, draw
+    try:
+        yield
+    finally:
+        ctx.draw = previous
+    if pos != len(tape):
+        raise TapeError(f"fight used {pos} of {len(tape)} taped draws")
 
 
 @dataclass(frozen=True)
@@ -29,18 +136,23 @@ class D20Result:
 
 def roll(n: int, sides: int) -> tuple[int, ...]:
     """Roll n dice with given sides, return individual results."""
-    return tuple(random.randint(1, sides) for _ in range(n))
+    return tuple(_draw(1, sides) for _ in range(n))
 
 
 def roll_with_minimum(n: int, sides: int, minimum: int = 1) -> tuple[int, ...]:
     """Roll n dice, treating any result below *minimum* as *minimum*."""
     results = []
     for _ in range(n):
-        r = random.randint(1, sides)
+        r = _draw(1, sides)
         results.append(max(r, minimum))
     return tuple(results)
 
 
+def coin() -> bool:
+    """A fair coin flip."""
+    return _draw(1, 2) == 1
+
+
 def d20(advantage: bool = False, disadvantage: bool = False) -> int:
     """Roll a d20 with advantage/disadvantage. Returns just the chosen value."""
     return d20_detail(advantage=advantage, disadvantage=disadvantage).chosen
@@ -49,15 +161,15 @@ def d20(advantage: bool = False, disadvantage: bool = False) -> int:
 def d20_detail(advantage: bool = False, disadvantage: bool = False) -> D20Result:
     """Roll a d20, returning full detail including both dice for adv/disadv."""
     if advantage and disadvantage:
-        result = random.randint(1, 20)
+        result = _draw(1, 20)
         return D20Result(chosen=result, other=None, advantage=False, disadvantage=False)
     if advantage:
-        a, b = random.randint(1, 20), random.randint(1, 20)
+        a, b = _draw(1, 20), _draw(1, 20)
         return D20Result(chosen=max(a, b), other=min(a, b), advantage=True, disadvantage=False)
     if disadvantage:
-        a, b = random.randint(1, 20), random.randint(1, 20)
+        a, b = _draw(1, 20), _draw(1, 20)
         return D20Result(chosen=min(a, b), other=max(a, b), advantage=False, disadvantage=True)
-    result = random.randint(1, 20)
+    result = _draw(1, 20)
     return D20Result(chosen=result, other=None, advantage=False, disadvantage=False)
 
 
@@ -146,20 +258,17 @@ def eval_dice_twice_take_best(expr: str, minimum: int | None = None) -> SavageRe
 # ---------------------------------------------------------------------------
 # Legacy roll log — kept for backward compatibility but no longer used for display
 # ---------------------------------------------------------------------------
-_roll_log: list[str] = []
-
 
 def push_roll(entry: str) -> None:
-    _roll_log.append(entry)
+    _active.ctx.roll_log.append(entry)
 
 
 def flush_rolls() -> str:
-    global _roll_log
-    out = f"[{', '.join(_roll_log)}]" if _roll_log else "[]"
-    _roll_log = []
+    ctx = _active.ctx
+    out = f"[{', '.join(ctx.roll_log)}]" if ctx.roll_log else "[]"
+    ctx.roll_log = []
     return out
 
 
 def clear_rolls() -> None:
-    global _roll_log
-    _roll_log = []
+    _active.ctx.roll_log = []
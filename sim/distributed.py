@@ -0,0 +1,308 @@
+"""Multi-node ladders: a TCP coordinator hands chunks to pull-based workers.
+
+The coordinator owns a Ladder.  Workers — on this machine or others with the
+same checkout — connect, pull one chunk task at a time, simulate it and send
+back the chunk tally.  Chunks carry their own seed (see sim.ladder), so the
+merged ladder is identical to a single-node run with the same seed no
+matter how many workers took part or in which order they finished.
+
+Protocol: one JSON object per line over a persistent TCP connection, each
+request answered by one response line::
+
+    {"op": "hello"}                          -> {"engine": ..., "builds": {name: hash}}
+    {"op": "get"}                            -> {"task": {...}} | {"wait": s} | {"done": true}
+    {"op": "put", "task": {...}, "tally": {...}, "worker": pid, "seconds": s}
+                                             -> {"ok": true}
+
+On hello a worker checks that its engine version and build hashes match the
+coordinator's (sim.store.engine_version / build_hash), and refuses to run
+otherwise — a node with different code or data would silently skew results.
+Tasks are leased: one not returned within *lease* seconds (a worker died)
+is handed out again, and duplicate results are ignored.
+
+There is no authentication; bind to a trusted network only.
+``spawn_local_workers`` is the single-machine stand-in for a cluster: it
+runs workers as local processes against the same TCP coordinator.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+from sim.ladder import ChunkResult, ChunkTask, Ladder, MatchupTally, run_chunk, save_checkpoint
+from sim.loader import load_build_by_name
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from sim.progress import Progress
+
+DEFAULT_PORT = 8766
+DEFAULT_LEASE = 300.0
+
+
+class ProtocolError(RuntimeError):
+    """The peer sent something this side cannot use (or runs different code/data)."""
+
+
+def _fingerprint(builds: list[str]) -> dict:
+    from sim.store import _BUILDS_DIR, build_hash, engine_version
+
+    return {
+        "engine": engine_version(),
+        "builds": {name: build_hash((_BUILDS_DIR / f"{name}.yaml").read_bytes())
+                   for name in builds},
+    }
+
+
+def _task_to_dict(task: ChunkTask) -> dict:
+    return {"a": task.a, "b": task.b, "index": task.index, "n": task.n, "seed": task.seed}
+
+
+def parse_address(text: str, default_port: int = DEFAULT_PORT) -> tuple[str, int]:
+    """'host:port', 'host' or ':port' -> (host, port)."""
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return host or "127.0.0.1", int(port) if port else default_port
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator: Coordinator = self.server.coordinator
+        for line in self.rfile:
+            try:
+                reply = coordinator.handle(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """Serves a ladder's pending chunks to workers and merges their tallies."""
+
+    def __init__(
+        self,
+        ladder: Ladder,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        *,
+        lease: float = DEFAULT_LEASE,
+        progress: "Progress | None" = None,
+        on_chunk: Callable[[ChunkTask, MatchupTally], None] | None = None,
+    ):
+        self.ladder = ladder
+        self.lease = lease
+        self.progress = progress
+        self.on_chunk = on_chunk
+        self.fingerprint = _fingerprint(ladder.builds)
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._pending: deque[ChunkTask] = deque(ladder.pending())
+        self._leased: dict[tuple[str, str, int], tuple[ChunkTask, float]] = {}
+        if not self._pending:
+            self._finished.set()
+        self._server = _Server((host, port), _Handler)
+        self._server.coordinator = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "Coordinator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "Coordinator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def wait(
+        self,
+        timeout: float | None = None,
+        *,
+        run_dir: "str | Path | None" = None,
+        checkpoint_every: float = 30.0,
+    ) -> bool:
+        """Block until every chunk is in (True) or *timeout* passes (False).
+
+        With *run_dir*, the ladder is checkpointed at intervals and on the
+        way out (Ctrl-C included), exactly as run_ladder() does.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                step = checkpoint_every if run_dir is not None else 1.0
+                if end is not None:
+                    step = min(step, max(0.0, end - time.monotonic()))
+                if self._finished.wait(step):
+                    return True
+                if end is not None and time.monotonic() >= end:
+                    return False
+                if run_dir is not None:
+                    with self._lock:
+                        save_checkpoint(self.ladder, run_dir)
+        finally:
+            if run_dir is not None:
+                with self._lock:
+                    save_checkpoint(self.ladder, run_dir)
+
+    # --- Requests (called on server threads) ---
+
+    def handle(self, request: dict) -> dict:
+        op = request["op"]
+        if op == "hello":
+            return self.fingerprint
+        if op == "get":
+            return self._get()
+        if op == "put":
+            self._put(request)
+            return {"ok": True}
+        raise ValueError(f"unknown op {op!r}")
+
+    def _get(self) -> dict:
+        with self._lock:
+            if self._finished.is_set():
+                return {"done": True}
+            now = time.monotonic()
+            for key, (task, expiry) in list(self._leased.items()):
+                if expiry <= now:                 # worker presumed dead
+                    del self._leased[key]
+                    self._pending.appendleft(task)
+            if not self._pending:
+                return {"wait": 0.5}
+            task = self._pending.popleft()
+            self._leased[(task.a, task.b, task.index)] = (task, now + self.lease)
+            return {"task": _task_to_dict(task)}
+
+    def _put(self, request: dict) -> None:
+        task = self.ladder.task(request["task"]["a"], request["task"]["b"], request["task"]["index"])
+        tally = MatchupTally.from_dict(request["tally"])
+        with self._lock:
+            key = (task.a, task.b, task.index)
+            if task.index in self.ladder.chunks[(task.a, task.b)]:
+                return                            # a re-leased duplicate
+            self._leased.pop(key, None)
+            try:
+                self._pending.remove(task)        # finished after its lease expired
+            except ValueError:
+                pass
+            self.ladder.record(task, tally)
+            if self.progress is not None:
+                self.progress.record(ChunkResult(task, tally, int(request.get("worker", 0)),
+                                                 float(request.get("seconds", 0.0))))
+            if self.on_chunk is not None:
+                self.on_chunk(task, tally)
+            if self.ladder.is_complete:
+                self._finished.set()
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class _Connection:
+    def __init__(self, address: tuple[str, int], timeout: float):
+        self._sock = socket.create_connection(address, timeout=timeout)
+        self._file = self._sock.makefile("rwb")
+
+    def call(self, request: dict) -> dict:
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("coordinator closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ProtocolError(reply["error"])
+        return reply
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+
+def run_worker(
+    address: tuple[str, int],
+    *,
+    max_tasks: int | None = None,
+    connect_retries: int = 10,
+    timeout: float = 600.0,
+) -> int:
+    """Pull and simulate chunks until the coordinator is done; returns chunks run."""
+    for attempt in range(connect_retries):
+        try:
+            conn = _Connection(address, timeout)
+            break
+        except OSError:
+            if attempt == connect_retries - 1:
+                raise
+            time.sleep(0.5)
+
+    done = 0
+    try:
+        fingerprint = conn.call({"op": "hello"})
+        local = _fingerprint(list(fingerprint["builds"]))
+        if local != fingerprint:
+            raise ProtocolError("this node's engine or build files differ from the coordinator's")
+        templates = {}
+        while max_tasks is None or done < max_tasks:
+            reply = conn.call({"op": "get"})
+            if reply.get("done"):
+                break
+            if "wait" in reply:
+                time.sleep(reply["wait"])
+                continue
+            task = ChunkTask(**reply["task"])
+            for name in (task.a, task.b):
+                if name not in templates:
+                    templates[name] = load_build_by_name(name)
+            start = time.perf_counter()
+            tally = run_chunk(templates[task.a], templates[task.b], task)
+            conn.call({"op": "put", "task": reply["task"], "tally": tally.to_dict(),
+                       "worker": os.getpid(), "seconds": time.perf_counter() - start})
+            done += 1
+    except ConnectionError:
+        pass                                      # coordinator finished and went away
+    finally:
+        conn.close()
+    return done
+
+
+def _local_worker(address: tuple[str, int]) -> None:
+    run_worker(address)
+
+
+def spawn_local_workers(address: tuple[str, int], count: int) -> list[multiprocessing.Process]:
+    """Local-process stand-in for remote nodes: *count* workers on this machine."""
+    procs = [multiprocessing.Process(target=_local_worker, args=(address,), daemon=True)
+             for _ in range(count)]
+    for p in procs:
+        p.start()
+    return procs
@@ -5,18 +5,26 @@ Measures:
 - Sustained DPR (average over many rounds, no Action Surge)
 - Burst DPR (round 1 with Action Surge if available)
 - DPR vs various ACs
+- DPR round by round through a fight, as limited resources run down
 """
 
 from __future__ import annotations
+import math
 import sys
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Sequence
 from sim.loader import load_build
-from sim.dice import d20, eval_dice, eval_dice_twice_take_best
+from sim.dice import DiceContext, d20, eval_dice, using
 from sim.models import Character, Weapon, MasteryProperty
-from sim.actions import _calc_damage, _has_advantage, _has_disadvantage
 
 BUILDS_DIR = Path(__file__).parent / "data" / "builds"
 N_ROUNDS = 5000  # rounds to simulate for DPR
+N_FIGHTS = 2000  # multi-round fights to simulate for a DPR curve
+RAGE_DAMAGE = 2  # sim.effects.apply_rage's bonus (levels 1-8)
+SMITE_DICE = {1: "2d8", 2: "3d8"}  # Divine Smite by slot level, as in sim.actions
+TARGET_SAVE = 2  # the dummy's STR and WIS save bonus against Trip and Menacing Attack
 
 
 def simulate_dpr(char_template: Character, target_ac: int, n: int = N_ROUNDS, 
@@ -27,190 +35,361 @@ def simulate_dpr(char_template: Character, target_ac: int, n: int = N_ROUNDS,
     Simplified: character attacks every round, uses class features optimally.
     No movement, no distance — pure damage output.
     """
-    total_damage = 0
-    
+    return simulate_dpr_sweep(char_template, [target_ac], n, use_surge, use_hide, depleted)[0]
+
+
+def simulate_dpr_sweep(char_template: Character, target_acs: Sequence[int], n: int = N_ROUNDS,
+                       use_surge: bool = False, use_hide: bool = False,
+                       depleted: bool = False) -> list[float]:
+    """simulate_dpr() against every AC in *target_acs* in a single pass.
+
+    Each round is rolled once.  An attack's d20 and the damage dice are
+    shared by every AC ("lane"), and only the per-target bookkeeping —
+    hit or miss, Vex, Sneak Attack, Savage Attacker, giant uses — is kept
+    per lane, so a 16-AC sweep costs little more than one AC.  The
+    template is only read, never copied.  Each lane draws the dice a
+    one-AC run would, so a lane's DPR has the same distribution as a
+    separate run, and the lanes share their luck (a smooth AC curve).
+    """
+    acs = list(target_acs)
+    totals = [0] * len(acs)
+    attacker = _Attacker.of(char_template, use_hide)
+    if attacker.weapon is None:
+        return [0.0 for _ in acs]
+    sequences = 2 if use_surge and char_template.resources.get("action_surge") else 1
+
     for _ in range(n):
-        char = char_template.deep_copy()
-        # Depleted mode: drain all limited resources
-        if depleted:
-            for res in char.resources.values():
-                res.current = 0
-        round_damage = 0
-        advantage = False
-        
-        # Heroic Inspiration: advantage on first attack
-        heroic_available = False
-        hi_res = char.resources.get("heroic_inspiration")
-        if hi_res and hi_res.available:
-            heroic_available = True
-            hi_res.spend()
-        
-        # Reckless Attack (Barbarian) — always on in aggressive mode
-        if "reckless_attack" in char.features:
-            advantage = True
-        
-        # Pre-round: if Hide allowed and we're a rogue, assume successful hide
-        if use_hide and char.sneak_attack_dice:
-            advantage = True
-        
-        # Determine number of attack sequences
-        num_sequences = 1
-        if use_surge and char.resources.get("action_surge"):
-            num_sequences = 2
-        
-        for seq in range(num_sequences):
-            # Reset savage attacker per turn
-            char._savage_used_this_turn = False
-            
-            # Find weapons
-            melee_weapons = [w for w in char.weapons if w.is_melee or w.is_finesse]
-            nick_weapon = None
-            main_weapon = None
-            
-            for w in melee_weapons:
-                if w.mastery == MasteryProperty.NICK:
-                    nick_weapon = w
-                elif main_weapon is None:
-                    main_weapon = w
-            
-            if nick_weapon and not main_weapon:
-                main_weapon = nick_weapon
-                nick_weapon = None
-            
-            # If we have Nick weapon, attack with it first to trigger extra attack
-            if nick_weapon and main_weapon:
-                # Attack with Nick weapon
-                attack_weapon = nick_weapon
-                off_weapon = main_weapon
-            elif main_weapon:
-                attack_weapon = main_weapon
-                off_weapon = None
-            else:
-                attack_weapon = char.weapons[0] if char.weapons else None
-                off_weapon = None
-            
-            if not attack_weapon:
-                continue
-            
-            num_attacks = 1 + char.extra_attacks
-            vex_advantage = False
-            
-            for atk_idx in range(num_attacks):
-                atk_adv = advantage or vex_advantage or (heroic_available and atk_idx == 0 and seq == 0)
-                if heroic_available and atk_idx == 0 and seq == 0:
-                    heroic_available = False  # consumed
-                dmg = _resolve_single_attack(char, attack_weapon, target_ac, atk_adv)
-                round_damage += dmg
-                
-                # Fire Giant: +1d10 fire on hit
-                if dmg > 0 and char.giant_ancestry == "fire":
-                    fire_res = char.resources.get("fire_giant")
-                    if fire_res and fire_res.available:
-                        fire_res.spend()
-                        round_damage += eval_dice("1d10").total
-                
-                # Hill Giant: free prone on hit → advantage on subsequent attacks
-                if dmg > 0 and char.giant_ancestry == "hill":
-                    hill_res = char.resources.get("hill_giant")
-                    if hill_res and hill_res.available:
-                        hill_res.spend()
-                        vex_advantage = True  # prone = advantage on melee
-                
-                # Vex mastery on hit
-                if dmg > 0 and attack_weapon.mastery == MasteryProperty.VEX:
-                    vex_advantage = True
-                
-                # Graze on miss
-                if dmg == 0 and attack_weapon.mastery == MasteryProperty.GRAZE:
-                    graze = max(0, char._attack_ability_mod(attack_weapon))
-                    round_damage += graze
-            
-            # Nick extra attack
-            if nick_weapon and off_weapon:
-                nick_adv = advantage or vex_advantage
-                # Nick attack: no ability mod to damage unless TWF style
-                nick_dmg = _resolve_single_attack(
-                    char, off_weapon, target_ac, nick_adv, 
-                    no_ability_mod=char.fighting_style != "two_weapon_fighting"
-                )
-                round_damage += nick_dmg
-                
-                # Fire Giant on nick hit
-                if nick_dmg > 0 and char.giant_ancestry == "fire":
-                    fire_res = char.resources.get("fire_giant")
-                    if fire_res and fire_res.available:
-                        fire_res.spend()
-                        round_damage += eval_dice("1d10").total
-                
-                # Hill Giant on nick hit
-                if nick_dmg > 0 and char.giant_ancestry == "hill":
-                    hill_res = char.resources.get("hill_giant")
-                    if hill_res and hill_res.available:
-                        hill_res.spend()
-                        # already prone, no further effect in DPS sim
-                
-                if nick_dmg > 0 and off_weapon.mastery == MasteryProperty.VEX:
-                    vex_advantage = True
-                    
-                if nick_dmg == 0 and off_weapon.mastery == MasteryProperty.GRAZE:
-                    graze = max(0, char._attack_ability_mod(off_weapon))
-                    round_damage += graze
-        
-        total_damage += round_damage
-    
-    return total_damage / n
+        # Every round starts from the build's full (or empty) resources.
+        pool = _Pool.of(char_template, len(acs), depleted)
+        for i, damage in enumerate(attacker.round(acs, sequences, pool)):
+            totals[i] += damage
 
+    return [total / n for total in totals]
 
-def _resolve_single_attack(char: Character, weapon: Weapon, target_ac: int,
-                           has_adv: bool, no_ability_mod: bool = False) -> int:
-    """Resolve a single attack, return damage dealt (0 on miss, ignoring graze)."""
-    roll = d20(advantage=has_adv)
-    
-    if roll == 1:
-        return 0  # nat 1 always misses (graze handled separately)
-    
-    is_crit = roll >= char.crit_threshold
-    attack_bonus = char.attack_modifier(weapon)
-    total = roll + attack_bonus
-    
-    if not is_crit and total < target_ac:
+
+@dataclass
+class DprCurve:
+    """Damage by round over *n* fights of *rounds* rounds, per AC.
+
+    Sums and sums of squares are kept per AC and round, both for the round's
+    own damage and for the running total through that round.
+    """
+    acs: list[int]
+    rounds: int
+    n: int
+    sums: list[list[int]]          # [ac index][round index]
+    squares: list[list[int]]
+    cum_sums: list[list[int]]
+    cum_squares: list[list[int]]
+
+    def round_dpr(self, ac_index: int, r: int) -> tuple[float, float]:
+        """(mean, 95% CI half-width) of the damage dealt in round *r* (0-based)."""
+        return _mean_ci(self.sums[ac_index][r], self.squares[ac_index][r], self.n)
+
+    def cumulative(self, ac_index: int, r: int) -> tuple[float, float]:
+        """(mean, 95% CI half-width) of the total damage through round *r*."""
+        return _mean_ci(self.cum_sums[ac_index][r], self.cum_squares[ac_index][r], self.n)
+
+
+def _mean_ci(total: float, squares: float, n: int) -> tuple[float, float]:
+    if n == 0:
+        return 0.0, 0.0
+    mean = total / n
+    if n < 2:
+        return mean, 0.0
+    variance = max(0.0, (squares - n * mean * mean) / (n - 1))
+    return mean, 1.96 * math.sqrt(variance / n)
+
+
+def dpr_curve(char_template: Character, target_acs: Sequence[int], rounds: int = 10,
+              n: int = N_FIGHTS, use_hide: bool = False) -> DprCurve:
+    """Sustained damage round by round, with limited resources running down.
+
+    Each of the *n* trials is one continuous fight against a static target:
+    a barbarian rages from round 1 if a use is left, Action Surge doubles
+    the first round it is available, Heroic Inspiration goes on the first
+    attack, and superiority dice (Trip/Menacing Attack), Divine Smite slots
+    and Fire and Hill Giant uses are spent hit by hit, none of it coming
+    back between rounds.  As in combat, Trip (Menacing) is only tried on a
+    target not already prone (frightened), against a STR (WIS) save.  Per-turn riders (Sneak Attack, Savage Attacker)
+    reset every round.  Like simulate_dpr_sweep()
+    the template is never copied and every AC shares the dice.
+    """
+    acs = list(target_acs)
+    attacker = _Attacker.of(char_template, use_hide)
+    curve = DprCurve(acs, rounds, n, *([[0] * rounds for _ in acs] for _ in range(4)))
+    if attacker.weapon is None:
+        return curve
+
+    for _ in range(n):
+        pool = _Pool.of(char_template, len(acs), fight=True)
+        running = [0] * len(acs)
+        for r in range(rounds):
+            sequences = 1
+            if pool.surges:
+                pool.surges -= 1
+                sequences = 2
+            for i, damage in enumerate(attacker.round(acs, sequences, pool)):
+                running[i] += damage
+                curve.sums[i][r] += damage
+                curve.squares[i][r] += damage * damage
+                curve.cum_sums[i][r] += running[i]
+                curve.cum_squares[i][r] += running[i] * running[i]
+    return curve
+
+
+def _curve_task(template: Character, acs: list[int], rounds: int, n: int,
+                use_hide: bool, seed: int | None) -> DprCurve:
+    with using(DiceContext(seed)) if seed is not None else nullcontext():
+        return dpr_curve(template, acs, rounds, n, use_hide)
+
+
+def dpr_curves(templates: dict[str, Character], target_acs: Sequence[int], rounds: int = 10,
+               n: int = N_FIGHTS, use_hide: bool = False, *, seed: int | None = None,
+               workers: int = 1, backend: str = "processes") -> dict[str, DprCurve]:
+    """dpr_curve() for every build, one build per task on a pool of *workers*.
+
+    Each build draws from its own seeded DiceContext (sim.ladder.chunk_seed),
+    so a seeded run gives the same curves for any worker count.
+    """
+    from sim.ladder import chunk_seed, make_executor
+
+    jobs = {name: (template, list(target_acs), rounds, n, use_hide,
+                   chunk_seed(seed, name, "dpr_curve", rounds))
+            for name, template in templates.items()}
+    if workers <= 1 or len(jobs) <= 1:
+        return {name: _curve_task(*job) for name, job in jobs.items()}
+    with make_executor(workers, backend) as pool:
+        futures = {name: pool.submit(_curve_task, *job) for name, job in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+@dataclass
+class _Pool:
+    """Limited resources per AC lane, spent as a round (or a fight) goes on."""
+    heroic: int
+    surges: int
+    fire: list[int]
+    hill: list[int]
+    raging: bool
+    superiority: list[int]
+    smites: list[list[int]]         # per lane: slots left by level, [unused, 1st, 2nd]
+
+    @classmethod
+    def of(cls, char: Character, lanes: int, depleted: bool = False, fight: bool = False) -> "_Pool":
+        """The build's resources; with *fight*, also those a whole fight spends.
+
+        Rage, superiority dice and Divine Smite slots only come with *fight*:
+        a one-round sample that started each round full would spend them
+        every round.
+        """
+        def uses(key: str) -> int:
+            res = char.resources.get(key)
+            return 0 if depleted or res is None else res.current
+
+        fire = uses("fire_giant") if char.giant_ancestry == "fire" else 0
+        hill = uses("hill_giant") if char.giant_ancestry == "hill" else 0
+        raging, superiority, slots = False, 0, [0, 0, 0]
+        if fight:
+            raging = "rage" in char.features and uses("rage") > 0
+            if "trip" in char.maneuvers or "menacing" in char.maneuvers:
+                superiority = uses("superiority_dice")
+            if "divine_smite" in char.features:
+                slots = [0, uses("spell_slot_1"), uses("spell_slot_2")]
+        return cls(uses("heroic_inspiration"), uses("action_surge"), [fire] * lanes, [hill] * lanes,
+                   raging, [superiority] * lanes, [list(slots) for _ in range(lanes)])
+
+
+@dataclass(frozen=True)
+class _Attacker:
+    """What a round of attacks needs from a build, worked out once."""
+    char: Character
+    weapon: Weapon | None
+    off_weapon: Weapon | None       # Nick extra attack
+    attacks: int
+    advantage: bool
+    nick_no_mod: bool
+    sneak: bool
+    rage: int                       # rage damage per hit with the weapon, off-hand weapon
+    off_rage: int
+
+    @classmethod
+    def of(cls, char: Character, use_hide: bool = False) -> "_Attacker":
+        weapon, off_weapon = _pick_dps_weapons(char)
+        return cls(
+            char, weapon, off_weapon,
+            attacks=1 + char.extra_attacks,
+            # Reckless Attack is always on; a successful Hide gives a rogue advantage.
+            advantage="reckless_attack" in char.features or bool(use_hide and char.sneak_attack_dice),
+            nick_no_mod=char.fighting_style != "two_weapon_fighting",
+            sneak=bool(char.sneak_attack_dice) and not char.sneak_attack_used,
+            rage=_rage_damage(char, weapon), off_rage=_rage_damage(char, off_weapon),
+        )
+
+    def round(self, acs: list[int], sequences: int, pool: _Pool) -> list[int]:
+        """One turn of attacks (*sequences* Attack actions) against every AC."""
+        char = self.char
+        lanes = range(len(acs))
+        round_damage = [0] * len(acs)
+        sneak_ready = [self.sneak] * len(acs)
+        # Trip / Hill Giant and Menacing Attack conditions, lasting until the target's turn
+        prone = [False] * len(acs)
+        frightened = [False] * len(acs)
+
+        for seq in range(sequences):
+            savage_ready = [char.has_savage_attacker] * len(acs)
+            vex = [False] * len(acs)
+            for atk_idx in range(self.attacks):
+                first = bool(pool.heroic) and atk_idx == 0 and seq == 0
+                if first:
+                    pool.heroic -= 1
+                adv = [self.advantage or vex[i] or prone[i] or first for i in lanes]
+                hits = _resolve_attack_lanes(char, self.weapon, acs, adv, savage_ready, sneak_ready,
+                                             pool.smites, rage=self.rage if pool.raging else 0)
+                _after_attack(char, self.weapon, hits, round_damage, pool, vex, prone, frightened)
+
+            if self.off_weapon is not None:
+                adv = [self.advantage or vex[i] or prone[i] for i in lanes]
+                hits = _resolve_attack_lanes(char, self.off_weapon, acs, adv, savage_ready, sneak_ready,
+                                             pool.smites, rage=self.off_rage if pool.raging else 0,
+                                             no_ability_mod=self.nick_no_mod)
+                # Already prone after a Hill Giant hit: the use is spent for nothing.
+                _after_attack(char, self.off_weapon, hits, round_damage, pool, vex, prone, frightened,
+                              knock_prone=False)
+        return round_damage
+
+
+def _pick_dps_weapons(char: Character) -> tuple[Weapon | None, Weapon | None]:
+    """(weapon for the Attack action, Nick off-hand weapon or None)."""
+    nick_weapon = None
+    main_weapon = None
+    for w in char.weapons:
+        if not (w.is_melee or w.is_finesse):
+            continue
+        if w.mastery == MasteryProperty.NICK:
+            nick_weapon = w
+        elif main_weapon is None:
+            main_weapon = w
+    if nick_weapon and not main_weapon:
+        return nick_weapon, None
+    if nick_weapon and main_weapon:
+        # Attack with the Nick weapon first to trigger the extra attack
+        return nick_weapon, main_weapon
+    if main_weapon:
+        return main_weapon, None
+    return (char.weapons[0] if char.weapons else None), None
+
+
+def _rage_damage(char: Character, weapon: Weapon | None) -> int:
+    """Rage damage per hit with *weapon* while raging (Character.damage_modifier's rule)."""
+    if (weapon is None or "rage" not in char.features
+            or not weapon.is_melee or weapon.is_ranged):
         return 0
-    
-    # Calculate damage
+    return RAGE_DAMAGE if not weapon.is_finesse or char.str_mod >= char.dex_mod else 0
+
+
+def _after_attack(char: Character, weapon: Weapon, hits: list[int], round_damage: list[int],
+                  pool: _Pool, vex: list[bool], prone: list[bool], frightened: list[bool],
+                  knock_prone: bool = True) -> None:
+    """On-hit and on-miss riders of one attack, per lane."""
+    fire_left, hill_left, sup_left = pool.fire, pool.hill, pool.superiority
+    fire_die = sup_die = save = None
+    for i, dmg in enumerate(hits):
+        round_damage[i] += dmg
+        if dmg > 0:
+            # Trip / Menacing Attack: a superiority die on a hit against a target
+            # not yet prone / frightened, which a failed save then makes it
+            if sup_left[i]:
+                trip = "trip" in char.maneuvers
+                condition = prone if trip else frightened
+                if not condition[i]:
+                    sup_left[i] -= 1
+                    if sup_die is None:
+                        sup_die = eval_dice(char.superiority_die_size).total
+                        save = d20() + TARGET_SAVE
+                    round_damage[i] += sup_die
+                    if save < 8 + char.str_mod + char.proficiency_bonus:
+                        condition[i] = True
+            # Fire Giant: +1d10 fire on hit
+            if fire_left[i]:
+                fire_left[i] -= 1
+                if fire_die is None:
+                    fire_die = eval_dice("1d10").total
+                round_damage[i] += fire_die
+            # Hill Giant: free prone on hit → advantage on subsequent attacks
+            if hill_left[i]:
+                hill_left[i] -= 1
+                prone[i] = prone[i] or knock_prone
+            if weapon.mastery == MasteryProperty.VEX:
+                vex[i] = True
+        elif weapon.mastery == MasteryProperty.GRAZE:
+            round_damage[i] += max(0, char._attack_ability_mod(weapon))
+
+
+def _resolve_attack_lanes(char: Character, weapon: Weapon, target_acs: list[int], adv: list[bool],
+                          savage_ready: list[bool], sneak_ready: list[bool], smites: list[list[int]],
+                          rage: int = 0, no_ability_mod: bool = False) -> list[int]:
+    """One attack against every AC at once: damage per lane (0 on a miss).
+
+    The d20s and damage dice are drawn once, lazily — d20, damage, Savage
+    Attacker's second set, crit dice, Sneak Attack, Divine Smite — and
+    shared by every lane that needs them.  *smites* is spent per lane,
+    highest slot first, on every melee hit.
+    """
+    low = d20()
+    high = max(low, d20()) if any(adv) else low
+    bonus = char.attack_modifier(weapon)
     gwf_min = None
     if (char.fighting_style == "great_weapon_fighting"
             and (weapon.is_two_handed or weapon.is_versatile)
             and weapon.is_melee):
         gwf_min = 3
-    
-    if char.has_savage_attacker and not getattr(char, "_savage_used_this_turn", False):
-        base = eval_dice_twice_take_best(weapon.damage_dice, minimum=gwf_min)
-        char._savage_used_this_turn = True
-    else:
-        base = eval_dice(weapon.damage_dice, minimum=gwf_min)
-    
-    damage = base.total
-    
-    if is_crit:
-        crit_extra = eval_dice(weapon.damage_dice, minimum=gwf_min)
-        damage += crit_extra.total
-    
-    if not no_ability_mod:
-        damage += char.damage_modifier(weapon)
-    
-    # Sneak Attack
-    if char.sneak_attack_dice and not char.sneak_attack_used and has_adv:
-        sa = eval_dice(char.sneak_attack_dice).total
+    flat = (0 if no_ability_mod else char.damage_modifier(weapon)) + rage
+
+    base = second = crit_extra = sneak = sneak_crit = None
+    smite_dice: dict[int, int] = {}     # slot level, and -level for the crit dice
+    out = []
+    for i, ac in enumerate(target_acs):
+        roll = high if adv[i] else low
+        is_crit = roll >= char.crit_threshold
+        if roll == 1 or (not is_crit and roll + bonus < ac):
+            out.append(0)
+            continue
+        if base is None:
+            base = eval_dice(weapon.damage_dice, minimum=gwf_min).total
+        damage = base
+        if savage_ready[i]:
+            savage_ready[i] = False
+            if second is None:
+                second = eval_dice(weapon.damage_dice, minimum=gwf_min).total
+            damage = max(base, second)
         if is_crit:
-            sa += eval_dice(char.sneak_attack_dice).total
-        damage += sa
-        char.sneak_attack_used = True
-    
-    # Rage damage
-    if char.is_raging and weapon.is_melee:
-        damage += char.rage_damage
-    
-    return max(1, damage)
+            if crit_extra is None:
+                crit_extra = eval_dice(weapon.damage_dice, minimum=gwf_min).total
+            damage += crit_extra
+        damage += flat
+        if sneak_ready[i] and adv[i]:
+            sneak_ready[i] = False
+            if sneak is None:
+                sneak = eval_dice(char.sneak_attack_dice).total
+            damage += sneak
+            if is_crit:
+                if sneak_crit is None:
+                    sneak_crit = eval_dice(char.sneak_attack_dice).total
+                damage += sneak_crit
+        slots = smites[i]
+        level = 2 if slots[2] else 1 if slots[1] else 0
+        if level and weapon.is_melee:
+            slots[level] -= 1
+            if level not in smite_dice:
+                smite_dice[level] = eval_dice(SMITE_DICE[level]).total
+            damage += smite_dice[level]
+            if is_crit:
+                if -level not in smite_dice:
+                    smite_dice[-level] = eval_dice(SMITE_DICE[level]).total
+                damage += smite_dice[-level]
+        out.append(max(1, damage))
+    return out
 
 
 def main():
@@ -0,0 +1,233 @@
+"""Fight snapshots: branch a fight from an exact mid-fight state.
+
+A Snapshot holds only what a fight mutates — HP, resources, conditions,
+effects, turn flags, range, round and turn order — as frozen values.
+Everything else on a Character (weapons, features, spell lists, ...) never
+changes during a fight and is shared by reference, not copied.  From one
+snapshot, ``restore(state)`` rewinds a live fight in place and ``fork()``
+builds an independent copy, each in O(fields) rather than a deep copy of
+both combatants.
+
+estimate_win_prob() runs many continuations of a snapshot, split into
+seeded chunks on a worker pool, to answer what-if questions: snapshot the
+fight before a decision, then compare continuations with and without it.
+"""
+
+from __future__ import annotations
+
+import copy
+from array import array
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sim.budget import wilson_interval
+from sim.combat import _play_rounds, play_out
+from sim.dice import DiceContext, using
+from sim.ladder import chunk_seed, make_executor
+from sim.models import AbilityScores, ActiveEffect, Character, CombatPhase, CombatState, Condition, Resource
+from sim.tactics import load_tactics
+
+if TYPE_CHECKING:
+    from sim.tactics import Plan, TacticsEngine
+
+# Character attributes mutated in place during a fight; every other
+# attribute is only ever reassigned, so a snapshot can share its value.
+_MUTABLE = frozenset({"resources", "conditions", "active_effects", "ability_scores", "metrics"})
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _copy_effect(effect: ActiveEffect) -> ActiveEffect:
+    # Durations and extra counters tick down; the rest of an effect is fixed.
+    copied = copy.copy(effect)
+    copied.extra = dict(effect.extra)
+    return copied
+
+
+@dataclass(frozen=True)
+class _Side:
+    """One combatant's mutable state."""
+    attrs: tuple[tuple[str, Any], ...]
+    resources: tuple[tuple[str, str, int, int, str], ...]
+    conditions: frozenset[Condition]
+    effects: tuple[ActiveEffect, ...]     # private copies, never mutated
+    abilities: tuple[int, ...]
+    metrics: bytes
+
+    @classmethod
+    def of(cls, char: Character) -> "_Side":
+        return cls(
+            attrs=tuple((k, v) for k, v in vars(char).items() if k not in _MUTABLE),
+            resources=tuple((key, r.name, r.current, r.maximum, r.recharge)
+                            for key, r in char.resources.items()),
+            conditions=frozenset(char.conditions),
+            effects=tuple(map(_copy_effect, char.active_effects)),
+            abilities=tuple(vars(char.ability_scores).values()),
+            metrics=char.metrics.tobytes(),
+        )
+
+    def apply(self, char: Character) -> None:
+        attrs = vars(char)
+        attrs.clear()
+        attrs.update(self.attrs)
+        char.resources = {key: Resource(name, current, maximum, recharge)
+                          for key, name, current, maximum, recharge in self.resources}
+        char.conditions = set(self.conditions)
+        char.active_effects = list(map(_copy_effect, self.effects))
+        char.ability_scores = AbilityScores(*self.abilities)
+        char.metrics = array("I", self.metrics)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The mutable state of a fight, frozen; restore or fork it any number of times."""
+    a: _Side
+    b: _Side
+    distance: int
+    round_number: int
+    phase: CombatPhase
+    starting_distance: int
+    order: tuple[bool, ...]       # turn order; True for combatant_a
+    log_length: int
+
+    def restore(self, state: CombatState) -> None:
+        """Rewind *state* (the fight this was taken from) to the snapshot, in place."""
+        a, b = state.combatant_a, state.combatant_b
+        self.a.apply(a)
+        self.b.apply(b)
+        state.distance = self.distance
+        state.round_number = self.round_number
+        state.phase = self.phase
+        state.starting_distance = self.starting_distance
+        state.turn_order = [a if is_a else b for is_a in self.order]
+        del state.combat_log[self.log_length:]
+
+    def fork(self) -> CombatState:
+        """A new, independent fight in the snapshot's state (quiet, empty log)."""
+        a = Character.__new__(Character)
+        b = Character.__new__(Character)
+        self.a.apply(a)
+        self.b.apply(b)
+        a.audit = b.audit = None      # what-if play is not part of the audited fight
+        return CombatState(
+            a, b, distance=self.distance, round_number=self.round_number,
+            turn_order=[a if is_a else b for is_a in self.order],
+            phase=self.phase, starting_distance=self.starting_distance,
+        )
+
+
+def snapshot(state: CombatState) -> Snapshot:
+    """Capture *state* between turns, or inside a turn before its actions."""
+    a = state.combatant_a
+    return Snapshot(
+        a=_Side.of(a),
+        b=_Side.of(state.combatant_b),
+        distance=state.distance,
+        round_number=state.round_number,
+        phase=state.phase,
+        starting_distance=state.starting_distance,
+        order=tuple(c is a for c in state.turn_order),
+        log_length=len(state.combat_log),
+    )
+
+
+def fork(state: CombatState) -> CombatState:
+    """An independent copy of *state*, cheaper than a deep copy."""
+    return snapshot(state).fork()
+
+
+@dataclass
+class WinEstimate:
+    """Outcomes of n continuations, from combatant A's side."""
+    n: int
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+
+    @property
+    def p(self) -> float:
+        """A's estimated win probability."""
+        return self.wins_a / self.n if self.n else 0.0
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """95% Wilson interval for A's win probability."""
+        low, high = wilson_interval(self.wins_a, self.n)
+        return low / 100, high / 100
+
+
+def _continue(
+    snap: Snapshot, n: int, tactic1: "str | TacticsEngine", tactic2: "str | TacticsEngine",
+    plan: "tuple[bool, Plan] | None", max_rounds: int, seed: int | None,
+) -> tuple[int, int, int]:
+    """Play *n* continuations of *snap*; (A wins, B wins, draws)."""
+    tactics_a, tactics_b = load_tactics(tactic1), load_tactics(tactic2)
+    wins_a = wins_b = 0
+    with using(DiceContext(seed)) if seed is not None else nullcontext():
+        for _ in range(n):
+            state = snap.fork()
+            a, b = state.combatant_a, state.combatant_b
+            a.maneuver_picks, b.maneuver_picks = tactics_a.maneuver_picks(), tactics_b.maneuver_picks()
+            decide_a, decide_b = tactics_a.bind(a), tactics_b.bind(b)
+            if plan is None:
+                _play_rounds(state, decide_a, decide_b, max_rounds=max_rounds)
+            else:
+                play_out(state, a if plan[0] else b, plan[1], decide_a, decide_b,
+                         max_rounds=max_rounds)
+            if not b.is_alive:
+                wins_a += 1
+            elif not a.is_alive:
+                wins_b += 1
+    return wins_a, wins_b, n - wins_a - wins_b
+
+
+def estimate_win_prob(
+    state: CombatState | Snapshot,
+    n: int,
+    tactic1: "str | TacticsEngine" = "aggressive",
+    tactic2: "str | TacticsEngine" = "aggressive",
+    *,
+    actor: Character | None = None,
+    plan: "Plan | None" = None,
+    max_rounds: int = 100,
+    seed: int | None = None,
+    workers: int = 1,
+    backend: str = "processes",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> WinEstimate:
+    """Combatant A's chance to win *state* from here, over *n* continuations.
+
+    With no *plan* the state must be at a round boundary and play resumes
+    with the next round.  With a *plan*, *state* is inside *actor*'s turn
+    (after start_turn()), and *actor* carries out *plan* first — the way to
+    compare one decision against another.  Continuations run in seeded
+    chunks, so a seeded estimate is the same for any worker count.
+    """
+    if (actor is None) != (plan is None):
+        raise ValueError("actor and plan go together")
+    if isinstance(state, Snapshot):
+        if actor is not None:
+            raise ValueError("pass the live state, not a snapshot, with a plan")
+        snap = state
+    else:
+        snap = snapshot(state)
+    a_name = dict(snap.a.attrs)["name"]
+    b_name = dict(snap.b.attrs)["name"]
+    what = None if plan is None else (actor is state.combatant_a, plan)
+
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    jobs = [(snap, size, tactic1, tactic2, what, max_rounds, chunk_seed(seed, a_name, b_name, i))
+            for i, size in enumerate(sizes)]
+    if workers > 1 and len(jobs) > 1:
+        with make_executor(workers, backend) as pool:
+            results = list(pool.map(_continue, *zip(*jobs)))
+    else:
+        results = [_continue(*job) for job in jobs]
+
+    estimate = WinEstimate(n)
+    for wins_a, wins_b, draws in results:
+        estimate.wins_a += wins_a
+        estimate.wins_b += wins_b
+        estimate.draws += draws
+    return estimate
@@ -0,0 +1,156 @@
+"""Golden determinism corpus: pins the engine's exact behaviour.
+
+The corpus is a fixed set of seeded fights between one level-5 build per
+subclass, every pairing (mirror matches included).  For each fight it stores
+a CRC of the full dice-draw sequence (see sim.dice.recording) together with
+the outcome::
+
+    "<crc32 of draws> <draw count> <rounds> <hp_a> <hp_b>"
+
+A pure speedup of combat.py/actions.py must reproduce every line exactly.
+Any change in which dice are rolled, or in what they do, shows up as a
+mismatch in a specific fight, which ``dnd-sim replay`` can then re-run with
+a full log.  Deliberate rule changes are accepted with
+``dnd-sim golden --accept``.  That regenerates the corpus and prints how the
+aggregate win rates moved, so a reviewer can see the rules impact at a
+glance.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from sim.combat import run_combat
+from sim.dice import DiceContext, recording, using
+from sim.loader import load_build_by_name
+from sim.tactics import load_tactics
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_BUILDS_DIR = _PROJECT_ROOT / "data" / "builds"
+GOLDEN_FILE = _PROJECT_ROOT / "tests" / "golden" / "corpus.json"
+
+GOLDEN_LEVEL = 5
+FIGHTS_PER_PAIRING = 8
+FORMAT_VERSION = 1
+
+
+def representatives(level: int = GOLDEN_LEVEL) -> list[str]:
+    """The first build (by name) of every class/subclass at *level*."""
+    reps: dict[tuple, str] = {}
+    for path in sorted(_BUILDS_DIR.glob("*.yaml")):
+        raw = yaml.safe_load(path.read_text()) or {}
+        if raw.get("level") == level:
+            reps.setdefault((raw.get("class"), raw.get("subclass")), path.stem)
+    return sorted(reps.values())
+
+
+def pairing_seed(a: str, b: str) -> int:
+    return zlib.crc32(f"golden:{a}:{b}".encode())
+
+
+def run_pairing(a: str, b: str, n: int = FIGHTS_PER_PAIRING, templates: dict | None = None) -> list[str]:
+    """Fight lines for one pairing (see module docstring for the format)."""
+    templates = templates if templates is not None else {}
+    for name in (a, b):
+        if name not in templates:
+            templates[name] = load_build_by_name(name)
+    tactics = load_tactics("aggressive")
+    lines = []
+    with using(DiceContext(pairing_seed(a, b))):
+        for _ in range(n):
+            ca, cb = templates[a].deep_copy(), templates[b].deep_copy()
+            with recording() as draws:
+                state = run_combat(ca, cb, tactics, tactics)
+            lines.append(f"{zlib.crc32(draws.tobytes()):08x} {len(draws)} "
+                         f"{state.round_number} {ca.current_hp} {cb.current_hp}")
+    return lines
+
+
+def generate(builds: list[str] | None = None, n: int = FIGHTS_PER_PAIRING) -> dict:
+    builds = builds if builds is not None else representatives()
+    templates: dict = {}
+    pairings = []
+    for i, a in enumerate(builds):
+        for b in builds[i:]:
+            pairings.append({"a": a, "b": b, "fights": run_pairing(a, b, n, templates)})
+    return {"version": FORMAT_VERSION, "builds": builds, "fights": n, "pairings": pairings}
+
+
+def rerun(corpus: dict) -> dict:
+    """The corpus's own pairings, re-simulated by the current engine."""
+    return generate(corpus["builds"], corpus["fights"])
+
+
+def load(path: str | Path = GOLDEN_FILE) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def save(corpus: dict, path: str | Path = GOLDEN_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(corpus, indent=1) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Diffing
+# ---------------------------------------------------------------------------
+
+def _win_rate_a(lines: list[str]) -> float:
+    wins = 0
+    for line in lines:
+        _, _, _, hp_a, hp_b = line.split()
+        wins += int(hp_a) > 0 and int(hp_b) <= 0
+    return wins / len(lines) * 100 if lines else 0.0
+
+
+@dataclass
+class PairingDiff:
+    a: str
+    b: str
+    draws_changed: int       # fights whose dice sequence differs
+    outcomes_changed: int    # fights whose rounds or final HP differ
+    first_changed: int       # index of the first differing fight (for replay)
+    old_win_rate_a: float
+    new_win_rate_a: float
+
+
+@dataclass
+class GoldenDiff:
+    fights: int = 0
+    pairings: list[PairingDiff] = field(default_factory=list)
+    added: list[tuple[str, str]] = field(default_factory=list)
+    removed: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def identical(self) -> bool:
+        return not (self.pairings or self.added or self.removed)
+
+
+def diff(old: dict, new: dict) -> GoldenDiff:
+    old_map = {(p["a"], p["b"]): p["fights"] for p in old["pairings"]}
+    new_map = {(p["a"], p["b"]): p["fights"] for p in new["pairings"]}
+    result = GoldenDiff(
+        added=sorted(new_map.keys() - old_map.keys()),
+        removed=sorted(old_map.keys() - new_map.keys()),
+    )
+    for key in sorted(old_map.keys() & new_map.keys()):
+        before, after = old_map[key], new_map[key]
+        result.fights += len(after)
+        changed = [i for i, (x, y) in enumerate(zip(before, after)) if x != y]
+        if not changed and len(before) == len(after):
+            continue
+        outcomes = sum(x.split()[2:] != y.split()[2:] for x, y in zip(before, after))
+        result.pairings.append(PairingDiff(
+            key[0], key[1],
+            draws_changed=len(changed) + abs(len(before) - len(after)),
+            outcomes_changed=outcomes,
+            first_changed=changed[0] if changed else min(len(before), len(after)),
+            old_win_rate_a=_win_rate_a(before),
+            new_win_rate_a=_win_rate_a(after),
+        ))
+    return result
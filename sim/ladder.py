@@ -0,0 +1,485 @@
+"""Round-robin ladder: chunked matchups, mergeable tallies, checkpoint/resume.
+
+Every matchup is split into fixed-size chunks, and each chunk gets its own
+seed derived from (run seed, build names, chunk index).  A chunk therefore
+produces the same tally no matter when, where or in which order it runs,
+which is what lets an interrupted ladder resume from its last checkpoint and
+still finish with exactly the numbers an uninterrupted seeded run would give.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from array import array
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from sim import audit, metrics
+from sim.fightlog import FightColumns
+from sim.runner import run_matchup
+from sim.sketch import (
+    SIDE_SWAP,
+    Histogram,
+    merge_sketches,
+    sketches_from_dict,
+    sketches_to_dict,
+)
+
+if TYPE_CHECKING:
+    from sim.fightlog import FightLogWriter
+    from sim.models import Character
+    from sim.progress import Progress
+
+CHECKPOINT_FILE = "checkpoint.json"
+DEFAULT_CHUNK_SIZE = 500
+BACKENDS = ("processes", "threads")
+
+
+@dataclass
+class MatchupTally:
+    """Mergeable outcome counts for one matchup (a vs b)."""
+    n: int = 0
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+    total_rounds: int = 0
+    total_rounds_sq: int = 0     # second moment, for rounds variance
+    # rounds / damage / HP-left distributions (see sim.sketch)
+    sketches: dict[str, Histogram] = field(default_factory=dict)
+    # feature-usage totals per side (see sim.metrics)
+    metrics_a: array = field(default_factory=metrics.new_counters)
+    metrics_b: array = field(default_factory=metrics.new_counters)
+    # decision-audit totals per side, for audited runs only (see sim.audit)
+    audit_a: array | None = None
+    audit_b: array | None = None
+
+    @classmethod
+    def from_stats(cls, stats: dict) -> "MatchupTally":
+        """Build a tally from a run_matchup() result dict."""
+        return cls(
+            n=stats["n"],
+            wins_a=stats["combatant_a"]["wins"],
+            wins_b=stats["combatant_b"]["wins"],
+            draws=stats["draws"],
+            total_rounds=stats["total_rounds"],
+            total_rounds_sq=stats["total_rounds_sq"],
+            sketches=stats.get("sketches", {}),
+            metrics_a=array("I", stats["combatant_a"]["metrics"]),
+            metrics_b=array("I", stats["combatant_b"]["metrics"]),
+            audit_a=stats["combatant_a"].get("audit"),
+            audit_b=stats["combatant_b"].get("audit"),
+        )
+
+    def merge(self, other: "MatchupTally") -> None:
+        self.n += other.n
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        self.draws += other.draws
+        self.total_rounds += other.total_rounds
+        self.total_rounds_sq += other.total_rounds_sq
+        merge_sketches(self.sketches, other.sketches)
+        metrics.accumulate(self.metrics_a, other.metrics_a)
+        metrics.accumulate(self.metrics_b, other.metrics_b)
+        if other.audit_a is not None:
+            if self.audit_a is None:
+                self.audit_a, self.audit_b = audit.new_counters(), audit.new_counters()
+            audit.accumulate(self.audit_a, other.audit_a)
+            audit.accumulate(self.audit_b, other.audit_b)
+
+    def flipped(self) -> "MatchupTally":
+        """The same tally seen from b's side."""
+        sketches = {SIDE_SWAP.get(key, key): Histogram.from_dict(h.to_dict())
+                    for key, h in self.sketches.items()}
+        return MatchupTally(self.n, self.wins_b, self.wins_a, self.draws,
+                            self.total_rounds, self.total_rounds_sq, sketches,
+                            array("I", self.metrics_b), array("I", self.metrics_a),
+                            *(None if c is None else array("I", c) for c in (self.audit_b, self.audit_a)))
+
+    _STRUCTURED = ("sketches", "metrics_a", "metrics_b", "audit_a", "audit_b")
+
+    def to_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self)
+                if f.name not in self._STRUCTURED}
+        data["sketches"] = sketches_to_dict(self.sketches)
+        data["metrics_a"] = metrics.to_dict(self.metrics_a)
+        data["metrics_b"] = metrics.to_dict(self.metrics_b)
+        if self.audit_a is not None:
+            data["audit_a"] = audit.to_dict(self.audit_a)
+            data["audit_b"] = audit.to_dict(self.audit_b)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MatchupTally":
+        names = {f.name for f in fields(cls)} - set(cls._STRUCTURED)
+        return cls(**{k: data[k] for k in names if k in data},
+                   sketches=sketches_from_dict(data.get("sketches", {})),
+                   metrics_a=metrics.from_dict(data.get("metrics_a", {})),
+                   metrics_b=metrics.from_dict(data.get("metrics_b", {})),
+                   audit_a=audit.from_dict(data["audit_a"]) if "audit_a" in data else None,
+                   audit_b=audit.from_dict(data["audit_b"]) if "audit_b" in data else None)
+
+    @property
+    def win_rate_a(self) -> float:
+        return self.wins_a / self.n * 100 if self.n else 0.0
+
+    @property
+    def win_rate_b(self) -> float:
+        return self.wins_b / self.n * 100 if self.n else 0.0
+
+    @property
+    def avg_rounds(self) -> float:
+        return self.total_rounds / self.n if self.n else 0.0
+
+    @property
+    def rounds_variance(self) -> float:
+        if self.n < 2:
+            return 0.0
+        mean = self.total_rounds / self.n
+        return max(0.0, (self.total_rounds_sq - self.n * mean * mean) / (self.n - 1))
+
+
+@dataclass(frozen=True)
+class ChunkTask:
+    """One slice of a matchup: fights [index*chunk_size, index*chunk_size + n)."""
+    a: str
+    b: str
+    index: int
+    n: int
+    seed: int | None
+    record: bool = False     # also return per-fight columns (see sim.fightlog)
+    audit: bool = False      # also count decisions by outcome (see sim.audit)
+
+
+def chunk_seed(seed: int | None, a: str, b: str, index: int) -> int | None:
+    """Stable per-chunk seed (independent of PYTHONHASHSEED and process)."""
+    if seed is None:
+        return None
+    return zlib.crc32(f"{seed}:{a}:{b}:{index}".encode())
+
+
+@dataclass
+class ChunkResult:
+    """A finished chunk as reported back by whichever process ran it."""
+    task: ChunkTask
+    tally: MatchupTally
+    worker: int          # pid of the simulating process (thread id with threads)
+    seconds: float       # wall time spent simulating the chunk
+    fights: "FightColumns | None" = None
+
+
+def run_chunk(
+    template_a: "Character",
+    template_b: "Character",
+    task: ChunkTask,
+    fights: "FightColumns | None" = None,
+) -> MatchupTally:
+    """Simulate one chunk and return its tally."""
+    stats = run_matchup(template_a, template_b, n=task.n, seed=task.seed, fights=fights,
+                        audit=task.audit)
+    return MatchupTally.from_stats(stats)
+
+
+def _timed_chunk(templates: dict[str, "Character"], task: ChunkTask) -> ChunkResult:
+    start = time.perf_counter()
+    fights = FightColumns() if task.record else None
+    tally = run_chunk(templates[task.a], templates[task.b], task, fights)
+    return ChunkResult(task, tally, os.getpid(), time.perf_counter() - start, fights)
+
+
+# Per-process templates for pool workers, installed once by the initializer
+# so tasks only carry a ChunkTask and results only a ChunkResult.
+_worker_templates: dict[str, "Character"] = {}
+
+
+def _init_worker(templates: dict[str, "Character"]) -> None:
+    _worker_templates.clear()
+    _worker_templates.update(templates)
+
+
+def _worker_chunk(task: ChunkTask) -> ChunkResult:
+    return _timed_chunk(_worker_templates, task)
+
+
+def _thread_chunk(templates: dict[str, "Character"], task: ChunkTask) -> ChunkResult:
+    result = _timed_chunk(templates, task)
+    result.worker = threading.get_native_id()
+    return result
+
+
+def make_executor(workers: int, backend: str = "processes") -> Executor:
+    """A pool of *workers* processes or threads (see BACKENDS)."""
+    if backend == "threads":
+        return ThreadPoolExecutor(max_workers=workers)
+    if backend == "processes":
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"unknown backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+
+
+def chunk_pool(
+    templates: dict[str, "Character"],
+    workers: int,
+    backend: str = "processes",
+) -> tuple[Executor, Callable[[ChunkTask], "Future[ChunkResult]"]]:
+    """A pool of *workers* for chunks, and its submit(task) function.
+
+    "processes" installs the templates once per worker process.  "threads"
+    shares them: fights only ever touch deep copies and every seeded chunk
+    draws from its own DiceContext, so nothing is pickled or forked, and on
+    a free-threaded CPython build the threads simulate in parallel.
+    """
+    if backend != "processes":
+        pool = make_executor(workers, backend)
+        return pool, lambda task: pool.submit(_thread_chunk, templates, task)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(templates,))
+    return pool, lambda task: pool.submit(_worker_chunk, task)
+
+
+class Ladder:
+    """Round-robin over *builds* with n fights per matchup, in seeded chunks."""
+
+    def __init__(
+        self,
+        builds: list[str],
+        n: int,
+        seed: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.builds = list(builds)
+        self.n = n
+        self.seed = seed
+        self.chunk_size = max(1, chunk_size)
+        # Pairs are stored name-sorted so the same two builds always share
+        # chunk seeds (and cache entries) whatever order they were listed in.
+        self.matchups = [
+            (a, b) if a < b else (b, a)
+            for i, a in enumerate(self.builds) for b in self.builds[i + 1:]
+        ]
+        # Completed chunk tallies: (a, b) -> {chunk index: tally}
+        self.chunks: dict[tuple[str, str], dict[int, MatchupTally]] = {
+            m: {} for m in self.matchups
+        }
+
+    # --- Work planning ---
+
+    def tasks_for(self, a: str, b: str) -> list[ChunkTask]:
+        return [self.task(a, b, index) for index in range(len(range(0, self.n, self.chunk_size)))]
+
+    def task(self, a: str, b: str, index: int) -> ChunkTask:
+        size = min(self.chunk_size, self.n - index * self.chunk_size)
+        return ChunkTask(a, b, index, size, chunk_seed(self.seed, a, b, index))
+
+    def pending(self) -> list[ChunkTask]:
+        """Chunks not yet recorded, in matchup order."""
+        return [
+            task
+            for a, b in self.matchups
+            for task in self.tasks_for(a, b)
+            if task.index not in self.chunks[(a, b)]
+        ]
+
+    def record(self, task: ChunkTask, tally: MatchupTally) -> None:
+        self.chunks[(task.a, task.b)][task.index] = tally
+
+    @property
+    def total_chunks(self) -> int:
+        return len(self.matchups) * len(range(0, self.n, self.chunk_size))
+
+    @property
+    def done_chunks(self) -> int:
+        return sum(len(c) for c in self.chunks.values())
+
+    @property
+    def is_complete(self) -> bool:
+        return self.done_chunks == self.total_chunks
+
+    def invalidate(self, builds: set[str]) -> int:
+        """Forget results of every matchup involving *builds*; returns how many."""
+        stale = [m for m in self.matchups if m[0] in builds or m[1] in builds]
+        for m in stale:
+            self.chunks[m] = {}
+        return len(stale)
+
+    def with_builds(self, builds: list[str]) -> "Ladder":
+        """Same run over a new build list, keeping results of surviving matchups."""
+        ladder = Ladder(builds, self.n, self.seed, self.chunk_size)
+        for m in ladder.matchups:
+            if m in self.chunks:
+                ladder.chunks[m] = dict(self.chunks[m])
+        return ladder
+
+    # --- Results ---
+
+    def tally(self, a: str, b: str) -> MatchupTally:
+        """Merged tally for a matchup so far (chunks merged in index order), from a's side."""
+        if a > b:
+            return self.tally(b, a).flipped()
+        total = MatchupTally()
+        chunks = self.chunks[(a, b)]
+        for index in sorted(chunks):
+            total.merge(chunks[index])
+        return total
+
+    def completed_matchups(self) -> list[tuple[str, str]]:
+        expected = len(range(0, self.n, self.chunk_size))
+        return [m for m in self.matchups if len(self.chunks[m]) == expected]
+
+    def ranking(self) -> list[tuple[str, float]]:
+        """(build, average win %) over completed matchups, best first."""
+        win_rates: dict[str, list[float]] = {name: [] for name in self.builds}
+        for a, b in self.completed_matchups():
+            t = self.tally(a, b)
+            win_rates[a].append(t.win_rate_a)
+            win_rates[b].append(t.win_rate_b)
+        ranking = [(name, sum(wr) / len(wr)) for name, wr in win_rates.items() if wr]
+        ranking.sort(key=lambda x: x[1], reverse=True)
+        return ranking
+
+    def feature_usage(self) -> dict[str, tuple[int, array]]:
+        """build -> (fights, summed metric counters) over completed matchups."""
+        usage = {name: [0, metrics.new_counters()] for name in self.builds}
+        for a, b in self.completed_matchups():
+            t = self.tally(a, b)
+            for name, counters in ((a, t.metrics_a), (b, t.metrics_b)):
+                usage[name][0] += t.n
+                metrics.accumulate(usage[name][1], counters)
+        return {name: (n, counters) for name, (n, counters) in usage.items() if n}
+
+    def audit_usage(self) -> dict[str, tuple[int, array]]:
+        """build -> (fights, summed decision-audit counters) over audited, completed matchups."""
+        usage = {name: [0, audit.new_counters()] for name in self.builds}
+        for a, b in self.completed_matchups():
+            t = self.tally(a, b)
+            if t.audit_a is None:
+                continue
+            for name, counters in ((a, t.audit_a), (b, t.audit_b)):
+                usage[name][0] += t.n
+                audit.accumulate(usage[name][1], counters)
+        return {name: (n, counters) for name, (n, counters) in usage.items() if n}
+
+    # --- Serialisation ---
+
+    def to_dict(self) -> dict:
+        return {
+            "builds": self.builds,
+            "n": self.n,
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+            "chunks": [
+                {"a": a, "b": b, "index": index, **tally.to_dict()}
+                for (a, b), chunks in self.chunks.items()
+                for index, tally in sorted(chunks.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Ladder":
+        ladder = cls(data["builds"], data["n"], data["seed"], data["chunk_size"])
+        for row in data["chunks"]:
+            row = dict(row)
+            key = (row.pop("a"), row.pop("b"))
+            index = row.pop("index")
+            ladder.chunks[key][index] = MatchupTally.from_dict(row)
+        return ladder
+
+
+# ---------------------------------------------------------------------------
+# Checkpointing
+# ---------------------------------------------------------------------------
+
+def save_checkpoint(ladder: Ladder, run_dir: str | Path) -> Path:
+    """Atomically write the ladder state to run_dir/checkpoint.json.
+
+    The state goes to a temporary file in the same directory, is fsynced, and
+    then renamed over the old checkpoint, so a crash at any point leaves
+    either the previous checkpoint or the new one — never a torn file.
+    """
+    run_dir = Path(run_dir)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    path = run_dir / CHECKPOINT_FILE
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(ladder.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def load_checkpoint(run_dir: str | Path) -> Ladder:
+    path = Path(run_dir) / CHECKPOINT_FILE
+    with open(path) as f:
+        return Ladder.from_dict(json.load(f))
+
+
+def run_ladder(
+    ladder: Ladder,
+    templates: dict[str, "Character"],
+    *,
+    run_dir: str | Path | None = None,
+    checkpoint_every: float = 30.0,
+    on_chunk: Callable[[ChunkTask, MatchupTally], None] | None = None,
+    workers: int = 1,
+    backend: str = "processes",
+    progress: "Progress | None" = None,
+    fight_log: "FightLogWriter | None" = None,
+    audit: bool = False,
+) -> Ladder:
+    """Simulate every pending chunk, checkpointing to *run_dir* at intervals.
+
+    With *workers* > 1 chunks run on a pool of processes or threads (see
+    chunk_pool); each chunk is seeded on its own, so the tallies are
+    identical to a single-process run.  With
+    *fight_log*, every fight is also appended to that columnar store; the
+    log is written before the checkpoint, and chunks it already holds are
+    skipped, so a resumed run does not duplicate rows.  With *audit*, every
+    chunk also counts both sides' decisions by outcome (see sim.audit).
+
+    A final checkpoint is always written on the way out — including on
+    Ctrl-C — so at most *checkpoint_every* seconds of work is lost to a hard
+    kill and none to an interrupt.
+    """
+    last_save = time.monotonic()
+
+    def _record(result: ChunkResult) -> None:
+        nonlocal last_save
+        if fight_log is not None and result.fights is not None:
+            fight_log.append(result.task.a, result.task.b, result.task.index, result.fights)
+        ladder.record(result.task, result.tally)
+        if progress is not None:
+            progress.record(result)
+        if on_chunk is not None:
+            on_chunk(result.task, result.tally)
+        if run_dir is not None and time.monotonic() - last_save >= checkpoint_every:
+            save_checkpoint(ladder, run_dir)
+            last_save = time.monotonic()
+
+    pending = ladder.pending()
+    if fight_log is not None:
+        pending = [replace(task, record=True) for task in pending]
+    if audit:
+        pending = [replace(task, audit=True) for task in pending]
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            for task in pending:
+                _record(_timed_chunk(templates, task))
+        else:
+            needed = {name for t in pending for name in (t.a, t.b)}
+            pool, submit = chunk_pool({name: templates[name] for name in needed},
+                                      workers, backend)
+            try:
+                futures = [submit(task) for task in pending]
+                for future in as_completed(futures):
+                    _record(future.result())
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        if run_dir is not None:
+            save_checkpoint(ladder, run_dir)
+    return ladder
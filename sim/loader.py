@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -28,12 +29,18 @@ def _load_yaml(path: str | Path) -> dict:
         return yaml.safe_load(f)
 
 
-# Cache loaded data files
+# Cache loaded data files (shared by every thread; filled under the lock)
 _cache: dict[str, dict] = {}
+_cache_lock = threading.Lock()
 
 
 def _get_data(filename: str) -> dict:
-    if filename not in _cache:
+    data = _cache.get(filename)
+    if data is not None:
+        return data
+    with _cache_lock:
+        if filename in _cache:
+            return _cache[filename]
         # Try data/<filename> first, then data/<subdir>/<filename>
         candidates = [
             _DATA_DIR / filename,
@@ -46,11 +53,9 @@ def _get_data(filename: str) -> dict:
         ]
         for p in candidates:
             if p.exists():
-                _cache[filename] = _load_yaml(p)
-                break
-        else:
-            raise FileNotFoundError(f"Data file {filename} not found in {_DATA_DIR}")
-    return _cache[filename]
+                data = _cache[filename] = _load_yaml(p)
+                return data
+        raise FileNotFoundError(f"Data file {filename} not found in {_DATA_DIR}")
 
 
 def _parse_weapon_property(prop: str) -> WeaponProperty | None:
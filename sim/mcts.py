@@ -0,0 +1,221 @@
+"""Monte Carlo tree search tactics: choose each turn by simulating it.
+
+At every decision the engine lists a handful of candidate turn plans —
+the aggressive and defensive plans, those plans minus one limited
+resource ("hold Action Surge"), and for casters the aggressive plan with
+its main action swapped for each castable spell, a cantrip or a weapon
+attack.  It then spends its budget on rollouts: fork the live fight
+(sim.fork), carry out a candidate, and let the greedy built-in tactics
+play both sides for a few rounds (sim.combat.play_out).  Candidates are chosen by
+UCB1, so promising plans get most of the rollouts, and the plan with the
+best mean result is played.  A rollout scores 1 for a win, 0 for a loss,
+and in between by remaining HP when the horizon ends the fight early.
+
+The tree is one ply deep — later turns in a rollout follow the greedy
+policy — which keeps the search cheap enough to run inside a ladder.
+
+Searched positions are cached by a compact hash of the decision state
+(HP, resources, conditions, effects, round and range).  A position that
+has already had its budget of rollouts — every fight's opening turn, for
+a start — is answered from the cache without simulating.
+
+Budgets: ``mcts`` runs 48 rollouts per decision, ``mcts:<n>`` runs n and
+``mcts:<s>s`` searches for s seconds.  Rollouts draw from the fight's
+dice, so seeded runs with a rollout budget are reproducible; a time
+budget is not.  The cache lives on the engine, so with parallel chunks
+each worker learns separately and results differ from a serial run.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from sim.combat import play_out
+from sim.fork import Snapshot, snapshot
+from sim.models import CombatPhase
+from sim.spells import get_spell
+from sim.tactics import (
+    Loadout,
+    Plan,
+    PriorityTactics,
+    TacticsEngine,
+    TurnAction,
+    _pick_cantrip_action,
+    cast_action,
+)
+
+if TYPE_CHECKING:
+    from sim.models import Character, CombatState
+
+DEFAULT_ROLLOUTS = 48
+
+# Limited resources a candidate plan may hold back for later.
+HOLDABLE = frozenset({
+    "rage", "action_surge", "second_wind", "heroic_inspiration", "large_form",
+    "vow_of_enmity", "sacred_weapon", "bladesong", "adrenaline_rush", "hexblade_curse",
+})
+# Kinds that take the turn's action; a caster's candidates swap this one.
+MAIN_ACTIONS = frozenset({
+    "attack", "ranged_attack", "cast_spell", "eldritch_blast", "booming_blade",
+    "breath_weapon", "call_lightning_bolt",
+})
+
+def position_key(char: "Character", state: "CombatState") -> int:
+    """Compact hash of everything a decision by *char* depends on."""
+    def side(c: "Character") -> tuple:
+        return (
+            c.name, c.current_hp, c.temp_hp, c.action_used, c.bonus_action_used,
+            c.concentration_effect, c.extra_turns_remaining,
+            frozenset(c.conditions),
+            tuple(r.current for r in c.resources.values()),
+            tuple((e.name, e.duration) for e in c.active_effects),
+        )
+    opponent = state.opponent_of(char)
+    return hash((state.round_number, state.phase, state.distance,
+                 state.turn_order[0] is char, side(char), side(opponent)))
+
+
+@dataclass
+class _Stats:
+    visits: dict[Plan, int] = field(default_factory=dict)
+    totals: dict[Plan, float] = field(default_factory=dict)
+
+    @property
+    def total_visits(self) -> int:
+        return sum(self.visits.values())
+
+    def best(self) -> Plan:
+        return max(self.visits, key=lambda k: (self.totals[k] / self.visits[k]
+                                               if self.visits[k] else -1.0))
+
+
+@dataclass
+class MCTSTactics(TacticsEngine):
+    """Search-based tactics: UCB1 over candidate plans with greedy rollouts."""
+    name: str = "mcts"
+    rollouts: int = DEFAULT_ROLLOUTS       # per decision (cap when *seconds* is set)
+    seconds: float | None = None           # per-decision time budget
+    horizon: int = 3                       # rounds simulated after the decision
+    exploration: float = 1.4
+    policy: str = "aggressive"             # rollout policy for both sides
+    max_spells: int = 4                    # spell swaps offered to a caster
+    cache_size: int = 20_000
+    _cache: dict[int, _Stats] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_name(cls, name: str) -> "MCTSTactics":
+        """'mcts', 'mcts:<rollouts>' or 'mcts:<seconds>s'."""
+        _, _, budget = name.partition(":")
+        if not budget:
+            return cls()
+        try:
+            if budget.endswith("s"):
+                return cls(name=name, rollouts=1_000_000, seconds=float(budget[:-1]))
+            return cls(name=name, rollouts=int(budget))
+        except ValueError:
+            raise ValueError(f"bad MCTS budget {budget!r}: use mcts:<rollouts> or mcts:<seconds>s") from None
+
+    def decide_turn(self, char: "Character", state: "CombatState") -> Plan:
+        return self.bind(char)(state)
+
+    def bind(self, char: "Character") -> Callable[["CombatState"], Plan]:
+        greedy = PriorityTactics(self.policy).bind(char)
+        defensive = PriorityTactics("defensive").bind(char)
+        loadout = Loadout.of(char)
+
+        def decide(state: "CombatState") -> Plan:
+            base = greedy(state)
+            candidates = self._candidates(char, state, base, defensive(state), loadout)
+            if len(candidates) == 1:
+                return base
+            return self._search(char, state, candidates)
+        return decide
+
+    # --- Candidates ---
+
+    def _candidates(
+        self, char: "Character", state: "CombatState", base: Plan,
+        defensive: Plan, loadout: Loadout,
+    ) -> list[Plan]:
+        plans = [base, defensive]
+        plans += [tuple(a for a in base if a is not held) for held in base if held.kind in HOLDABLE]
+
+        main = next((i for i, a in enumerate(base) if a.kind in MAIN_ACTIONS
+                     and not _is_bonus_spell(a)), None)
+        if main is not None and loadout.spells is not None:
+            swaps: list[TurnAction] = []
+            opponent = state.opponent_of(char)
+            seen: set[str] = set()
+            for option in loadout.spells.castable(opponent):
+                if len(seen) == self.max_spells:
+                    break
+                if option.spell not in seen:
+                    seen.add(option.spell)
+                    swaps.append(cast_action(option.spell, option.slot))
+            cantrip = _pick_cantrip_action(char)
+            if cantrip is not None:
+                swaps.append(cantrip)
+            in_melee = state.distance <= 5 and state.phase == CombatPhase.MELEE
+            if in_melee and loadout.melee:
+                swaps.append(loadout.melee_attack)
+            elif loadout.ranged:
+                swaps.append(loadout.ranged_attack)
+            plans += [base[:main] + (swap,) + base[main + 1:] for swap in swaps]
+        return list(dict.fromkeys(plans))
+
+    # --- Search ---
+
+    def _search(
+        self, char: "Character", state: "CombatState", candidates: list[Plan],
+    ) -> Plan:
+        key = position_key(char, state)
+        stats = self._cache.get(key)
+        if stats is None or not stats.visits.keys() >= set(candidates):
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            stats = self._cache[key] = _Stats()
+            for plan in candidates:
+                stats.visits[plan] = 0
+                stats.totals[plan] = 0.0
+
+        deadline = None if self.seconds is None else time.perf_counter() + self.seconds
+        n = stats.total_visits
+        snap, mine = snapshot(state), char is state.combatant_a
+        while n < self.rollouts and (deadline is None or time.perf_counter() < deadline):
+            k = self._select(stats, n)
+            stats.totals[k] += self._rollout(snap, mine, k)
+            stats.visits[k] += 1
+            n += 1
+        return stats.best()
+
+    def _select(self, stats: _Stats, n: int) -> Plan:
+        best_key, best_score = None, -1.0
+        log_n = math.log(max(n, 1))
+        for k, visits in stats.visits.items():
+            if visits == 0:
+                return k
+            score = stats.totals[k] / visits + self.exploration * math.sqrt(log_n / visits)
+            if score > best_score:
+                best_key, best_score = k, score
+        return best_key
+
+    def _rollout(self, snap: Snapshot, mine: bool, plan: Plan) -> float:
+        sim = snap.fork()
+        me = sim.combatant_a if mine else sim.combatant_b
+        them = sim.opponent_of(me)
+        policy = PriorityTactics(self.policy)
+        play_out(sim, me, plan, policy.bind(sim.combatant_a), policy.bind(sim.combatant_b),
+                 max_rounds=snap.round_number + self.horizon)
+        if not them.is_alive:
+            return 1.0
+        if not me.is_alive:
+            return 0.0
+        return 0.5 + 0.5 * (me.current_hp / me.max_hp - them.current_hp / them.max_hp)
+
+
+def _is_bonus_spell(action: TurnAction) -> bool:
+    spell = get_spell(action.extra.get("spell", "")) if action.kind == "cast_spell" else None
+    return bool(spell and spell.bonus_action)
@@ -0,0 +1,65 @@
+"""Feature-usage counters: a registry of predeclared metric slots.
+
+Every metric is declared here once and gets a fixed index.  Each combatant
+carries a flat ``array('I')`` with one slot per metric, and features bump it
+by index::
+
+    attacker.metrics[SMITES] += 1
+
+which is a single indexed store rather than a string-keyed dict update.
+Per-fight arrays are summed into per-build totals by run_matchup(), merged
+across chunks and workers like any other tally, and printed in the
+"Feature Usage" section of the results.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+NAMES: list[str] = []
+LABELS: dict[str, str] = {}
+
+
+def _metric(name: str, label: str) -> int:
+    NAMES.append(name)
+    LABELS[name] = label
+    return len(NAMES) - 1
+
+
+CRITS = _metric("crits", "Critical Hits")
+SMITES = _metric("smites", "Divine Smites")
+SUPERIORITY_DICE = _metric("superiority_dice", "Superiority Dice Spent")
+CONCENTRATION_KEPT = _metric("concentration_kept", "Concentration Saves Passed")
+CONCENTRATION_LOST = _metric("concentration_lost", "Concentration Saves Failed")
+SHIELD_CASTS = _metric("shield_casts", "Shield Casts")
+LUCKY_USES = _metric("lucky_uses", "Lucky Uses")
+RELENTLESS_ENDURANCE = _metric("relentless_endurance", "Relentless Endurance")
+STONES_ENDURANCE = _metric("stones_endurance_triggers", "Stone's Endurance")
+STONES_REDUCED = _metric("stones_endurance_reduced", "Stone's Endurance Dmg Reduced")
+
+SIZE = len(NAMES)
+_ZEROS = bytes(array("I").itemsize * SIZE)
+
+
+def new_counters() -> array:
+    """A zeroed per-combatant counter array."""
+    return array("I", _ZEROS)
+
+
+def accumulate(into: array, counters: array) -> None:
+    for i, value in enumerate(counters):
+        if value:
+            into[i] += value
+
+
+def to_dict(counters: array) -> dict[str, int]:
+    """Non-zero counters by name (the JSON/export form)."""
+    return {NAMES[i]: value for i, value in enumerate(counters) if value}
+
+
+def from_dict(data: dict[str, int]) -> array:
+    counters = new_counters()
+    for name, value in data.items():
+        if name in LABELS:
+            counters[NAMES.index(name)] = value
+    return counters
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import copy
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any
 
+from sim import metrics
+
 
 # ---------------------------------------------------------------------------
 # Enums
@@ -224,6 +227,7 @@ class Character:
     superiority_dice: int = 0             # Battle Master: 4 at level 3
     superiority_die_size: str = "1d8"
     maneuvers: list[str] = field(default_factory=list)  # e.g. ["precision", "trip", "riposte"]
+    maneuver_picks: frozenset[str] | None = None  # the tactic's subset for this fight (None: all)
     hunters_mark_active: bool = False
     hunters_mark_uses: int = 0            # Ranger: PB per long rest
     colossus_slayer_used: bool = False     # Hunter Ranger: once per turn
@@ -259,6 +263,8 @@ class Character:
     movement_remaining: int = 0
     vex_target: str | None = None  # name of creature with Vex advantage
     vow_of_enmity_active: bool = False  # Vengeance Paladin: advantage on all attacks this combat
+    metrics: array = field(default_factory=metrics.new_counters)  # feature usage (sim.metrics)
+    audit: array | None = None  # per-build decision audit, shared across fights (sim.audit)
 
     def __post_init__(self):
         if self.current_hp == 0:
@@ -483,6 +489,10 @@ class Character:
             return max(self.str_mod, self.dex_mod) + self.proficiency_bonus
         return self.str_mod + self.proficiency_bonus
 
+    def uses_maneuver(self, name: str) -> bool:
+        """Check if the character knows this maneuver and its tactic spends dice on it."""
+        return name in self.maneuvers and (self.maneuver_picks is None or name in self.maneuver_picks)
+
     def can_use_mastery(self, weapon: Weapon) -> bool:
         """Check if the character can use this weapon's mastery property."""
         return weapon.name.lower() in [m.lower() for m in self.weapon_masteries]
@@ -568,9 +578,9 @@ class Character:
                 stones_reduction = max(0, stones_reduction)
                 res.spend()
                 self.reaction_used = True
+                self.metrics[metrics.STONES_ENDURANCE] += 1
+                self.metrics[metrics.STONES_REDUCED] += min(stones_reduction, raw_total)
                 if state:
-                    state.special_triggers["stones_endurance_triggers"] = state.special_triggers.get("stones_endurance_triggers", 0) + 1
-                    state.special_triggers["stones_endurance_reduced"] = state.special_triggers.get("stones_endurance_reduced", 0) + min(stones_reduction, raw_total)
                     state.log(f"  {self.name} uses Stone's Endurance, reducing {raw_total} by {stones_reduction}")
 
         # Distribute Stone's reduction proportionally across damage types,
@@ -642,8 +652,8 @@ class Character:
             if res.available:
                 res.spend()
                 self.current_hp = 1
+                self.metrics[metrics.RELENTLESS_ENDURANCE] += 1
                 if state:
-                    state.special_triggers["relentless_endurance"] = state.special_triggers.get("relentless_endurance", 0) + 1
                     state.log(f"  {self.name} uses Relentless Endurance! Drops to 1 HP instead of 0!")
 
         if total > 0:
@@ -677,6 +687,7 @@ class Character:
             from sim.dice import d20 as _d20
             con_save = _d20() + self.saving_throw_total("con")
             if con_save < dc:
+                self.metrics[metrics.CONCENTRATION_LOST] += 1
                 state.log(f"  {self.name} loses concentration on {self.concentration_effect}! (save {con_save} vs DC {dc})")
                 self.break_concentration()
                 if spell_name == "hypnotic_pattern":
@@ -691,6 +702,7 @@ class Character:
                             target.conditions.discard(Condition.INCAPACITATED)
                             state.log(f"STATUS   {target.name}: Hypnotic Pattern ends")
             else:
+                self.metrics[metrics.CONCENTRATION_KEPT] += 1
                 state.log(f"  {self.name} maintains concentration (save {con_save} vs DC {dc})")
         return actual_damage
 
@@ -747,7 +759,6 @@ class CombatState:
     turn_order: list[Character] = field(default_factory=list)
     combat_log: list[str] = field(default_factory=list)
     verbose: bool = False
-    special_triggers: dict[str, int] = field(default_factory=dict)
     phase: CombatPhase = field(default_factory=lambda: CombatPhase.RANGED)
     starting_distance: int = 60  # captured once at combat start for range checks
 
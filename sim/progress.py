@@ -0,0 +1,134 @@
+"""Live progress for long ladder runs: matchups done, throughput, ETA, leaders.
+
+Workers hand back whole chunk tallies, never single fights, so the only cost
+on the simulation side is one locked dict update per chunk.  A daemon thread
+wakes every *interval* seconds and prints a status line to stderr.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from sim.ladder import ChunkResult, Ladder
+
+
+def _fmt_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Progress:
+    """Thread-safe accumulator of chunk results for one ladder run."""
+
+    def __init__(self, ladder: "Ladder", names: dict[str, str] | None = None):
+        self._lock = threading.Lock()
+        self.names = names or {}
+        self.total_chunks = ladder.total_chunks
+        self.total_matchups = len(ladder.matchups)
+        self.chunks_per_matchup = len(range(0, ladder.n, ladder.chunk_size))
+        self.remaining_fights = sum(t.n for t in ladder.pending())
+        self.chunks_done = ladder.done_chunks
+        self.fights = 0
+        self.start = time.monotonic()
+        # worker pid -> [fights, busy seconds]
+        self.workers: dict[int, list[float]] = {}
+        # (a, b) -> [chunks, fights, wins_a, wins_b], seeded with resumed chunks
+        self._matchups: dict[tuple[str, str], list[int]] = {}
+        for m in ladder.matchups:
+            t = ladder.tally(*m)
+            self._matchups[m] = [len(ladder.chunks[m]), t.n, t.wins_a, t.wins_b]
+
+    def record(self, result: "ChunkResult") -> None:
+        task, tally = result.task, result.tally
+        with self._lock:
+            self.chunks_done += 1
+            self.fights += tally.n
+            w = self.workers.setdefault(result.worker, [0, 0.0])
+            w[0] += tally.n
+            w[1] += result.seconds
+            m = self._matchups[(task.a, task.b)]
+            m[0] += 1
+            m[1] += tally.n
+            m[2] += tally.wins_a
+            m[3] += tally.wins_b
+
+    def snapshot(self) -> dict:
+        """Consistent view of the counters (safe to call from any thread)."""
+        with self._lock:
+            elapsed = time.monotonic() - self.start
+            rate = self.fights / elapsed if elapsed > 0 else 0.0
+            remaining = max(0, self.remaining_fights - self.fights)
+            win_rates: dict[str, list[float]] = {}
+            for (a, b), (_, n, wa, wb) in self._matchups.items():
+                if n:
+                    win_rates.setdefault(a, []).append(wa / n * 100)
+                    win_rates.setdefault(b, []).append(wb / n * 100)
+            leaders = sorted(
+                ((name, sum(wr) / len(wr)) for name, wr in win_rates.items()),
+                key=lambda x: x[1], reverse=True,
+            )
+            return {
+                "matchups_done": sum(
+                    1 for c, *_ in self._matchups.values() if c == self.chunks_per_matchup
+                ),
+                "matchups_total": self.total_matchups,
+                "chunks_done": self.chunks_done,
+                "chunks_total": self.total_chunks,
+                "fights": self.fights,
+                "elapsed": elapsed,
+                "rate": rate,
+                "eta": remaining / rate if rate > 0 else None,
+                "worker_rates": {
+                    pid: (f / s if s > 0 else 0.0) for pid, (f, s) in self.workers.items()
+                },
+                "leaders": leaders,
+            }
+
+    def format(self, top: int = 3) -> str:
+        s = self.snapshot()
+        eta = _fmt_duration(s["eta"]) if s["eta"] is not None else "?"
+        line = (
+            f"  [{s['matchups_done']}/{s['matchups_total']} matchups "
+            f"{s['chunks_done'] / max(1, s['chunks_total']):.0%}] "
+            f"{s['rate']:,.0f} fights/s, ETA {eta}"
+        )
+        if len(s["worker_rates"]) > 1:
+            rates = sorted(s["worker_rates"].values(), reverse=True)
+            line += " | per worker " + " ".join(f"{r:,.0f}" for r in rates)
+        if s["leaders"]:
+            leaders = " · ".join(
+                f"{self.names.get(name, name)} {wr:.1f}%" for name, wr in s["leaders"][:top]
+            )
+            line += f"\n      leaders: {leaders}"
+        return line
+
+
+class ProgressReporter:
+    """Prints Progress.format() every *interval* seconds from a daemon thread."""
+
+    def __init__(self, progress: Progress, interval: float = 2.0, stream: TextIO | None = None):
+        self.progress = progress
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            print(self.progress.format(), file=self.stream, flush=True)
+
+    def __enter__(self) -> "ProgressReporter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,278 @@
+"""Sparse ladder ranking: Bradley–Terry strengths with active matchup selection.
+
+A full round-robin costs O(B²) matchups, and most of them (top Berserker vs
+bottom Bard) tell us nothing new about the ordering.  Instead we fit a
+Bradley–Terry strength per build from the fights played so far and keep
+spending fights on the pair whose result would move the ordering most —
+close ratings with high uncertainty — until every adjacent pair in the
+ordering is separated at the requested confidence.
+
+The simulator itself is injected as a ``play(a, b, n, seed)`` callable so the
+selection logic can be tested against a synthetic oracle.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Callable
+
+# play(a, b, n, seed) -> (wins_a, wins_b, draws)
+PlayFn = Callable[[str, str, int, int], tuple[int, int, int]]
+
+
+@dataclass
+class PairTally:
+    """Accumulated outcomes for one unordered pair (a is the first name)."""
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+
+    @property
+    def n(self) -> int:
+        return self.wins_a + self.wins_b + self.draws
+
+    @property
+    def score_a(self) -> float:
+        """Points for a, with draws counting half."""
+        return self.wins_a + 0.5 * self.draws
+
+
+@dataclass
+class BTResult:
+    """Outcome of a Bradley–Terry ranking run."""
+    strengths: dict[str, float]          # log-strength θ per build (mean 0)
+    std_errors: dict[str, float]
+    tallies: dict[tuple[str, str], PairTally]
+    fights: int
+    steps: int
+    converged: bool
+    ordering: list[str] = field(default_factory=list)
+
+    def expected_win_rate(self, name: str) -> float:
+        """Predicted average win % against every other build in the field."""
+        others = [o for o in self.strengths if o != name]
+        if not others:
+            return 0.0
+        theta = self.strengths[name]
+        return 100.0 * sum(_logistic(theta - self.strengths[o]) for o in others) / len(others)
+
+
+# ---------------------------------------------------------------------------
+# Model fitting
+# ---------------------------------------------------------------------------
+
+def _logistic(x: float) -> float:
+    if x >= 0:
+        return 1.0 / (1.0 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1.0 + z)
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def fit_bradley_terry(
+    names: list[str],
+    tallies: dict[tuple[str, str], PairTally],
+    *,
+    prior_games: float = 1.0,
+    iterations: int = 200,
+    tol: float = 1e-9,
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Fit Bradley–Terry log-strengths with the MM algorithm (Hunter 2004).
+
+    Each build also plays *prior_games* virtual games (half won, half lost)
+    against a fixed average opponent, which keeps undefeated and winless
+    builds finite and the problem well-posed before the graph is connected.
+
+    Returns (strengths, std_errors), both keyed by build name.  Strengths are
+    natural-log scale and centred on zero; standard errors come from the
+    diagonal of the Fisher information.
+    """
+    idx = {name: i for i, name in enumerate(names)}
+    k = len(names)
+    wins = [prior_games / 2.0] * k
+    pairs: list[tuple[int, int, int]] = []
+    for (a, b), t in tallies.items():
+        if t.n == 0:
+            continue
+        i, j = idx[a], idx[b]
+        wins[i] += t.score_a
+        wins[j] += t.n - t.score_a
+        pairs.append((i, j, t.n))
+
+    p = [1.0] * k
+    for _ in range(iterations):
+        # The virtual opponent has strength 1 (θ = 0).
+        denom = [prior_games / (p[i] + 1.0) for i in range(k)]
+        for i, j, n_ij in pairs:
+            s = n_ij / (p[i] + p[j])
+            denom[i] += s
+            denom[j] += s
+        new_p = [wins[i] / denom[i] for i in range(k)]
+        delta = max(abs(math.log(new_p[i] / p[i])) for i in range(k))
+        p = new_p
+        if delta < tol:
+            break
+
+    theta = [math.log(v) for v in p]
+    mean = sum(theta) / k if k else 0.0
+    theta = [t - mean for t in theta]
+
+    info = [0.0] * k
+    for i in range(k):
+        q = _logistic(theta[i] + mean)   # vs the virtual opponent at θ=0 (pre-centring)
+        info[i] += prior_games * q * (1.0 - q)
+    for i, j, n_ij in pairs:
+        q = _logistic(theta[i] - theta[j])
+        w = n_ij * q * (1.0 - q)
+        info[i] += w
+        info[j] += w
+
+    strengths = {names[i]: theta[i] for i in range(k)}
+    std_errors = {names[i]: 1.0 / math.sqrt(info[i]) if info[i] > 0 else float("inf")
+                  for i in range(k)}
+    return strengths, std_errors
+
+
+# ---------------------------------------------------------------------------
+# Active selection
+# ---------------------------------------------------------------------------
+
+def _pair_key(a: str, b: str) -> tuple[str, str]:
+    return (a, b) if a < b else (b, a)
+
+
+def information_gain(
+    theta_a: float, theta_b: float, se_a: float, se_b: float, batch: int,
+) -> float:
+    """Expected entropy reduction (nats) on θa−θb from *batch* more fights.
+
+    The difference has variance σ² = σa² + σb²; a batch adds Fisher
+    information batch·p(1−p), so the gain is ½·log(1 + σ²·batch·p(1−p)).
+    Close ratings (p≈½) and high uncertainty both push it up.
+    """
+    p = _logistic(theta_a - theta_b)
+    var = se_a * se_a + se_b * se_b
+    return 0.5 * math.log1p(var * batch * p * (1.0 - p))
+
+
+def _logit(p: float) -> float:
+    return math.log(p / (1.0 - p))
+
+
+def ordering_confidence(
+    ordering: list[str],
+    strengths: dict[str, float],
+    std_errors: dict[str, float],
+    tie_margin: float = 0.0,
+) -> float:
+    """Lowest confidence, over adjacent pairs, that the pair is resolved.
+
+    A pair is resolved when it is correctly ordered with high probability.
+    With a *tie_margin* (in win-probability points, e.g. 0.03 for 53/47) a
+    pair whose difference and standard error both sit inside the margin
+    counts as a settled coin flip — no finite budget can order it.
+    """
+    margin = _logit(0.5 + tie_margin) if tie_margin > 0 else 0.0
+    worst = 1.0
+    for hi, lo in zip(ordering, ordering[1:]):
+        diff = strengths[hi] - strengths[lo]
+        sd = math.hypot(std_errors[hi], std_errors[lo])
+        if margin and abs(diff) <= margin and sd <= margin:
+            continue
+        worst = min(worst, _normal_cdf(diff / sd) if sd > 0 else 1.0)
+    return worst
+
+
+def rank_bradley_terry(
+    names: list[str],
+    play: PlayFn,
+    *,
+    batch: int = 100,
+    confidence: float = 0.95,
+    tie_margin: float = 0.03,
+    max_fights: int | None = None,
+    seed: int | None = None,
+    on_step: Callable[[BTResult], None] | None = None,
+) -> BTResult:
+    """Rank *names* with as few simulated fights as the ordering needs.
+
+    Every build first plays two neighbours on a shuffled ring so the
+    comparison graph is connected.  After that each step refits the model and
+    spends one *batch* on the pair with the highest expected information
+    gain, weighted by how ambiguous the pair's order still is.  The loop stops
+    once every adjacent pair in the current ordering is correctly ordered
+    with probability ≥ *confidence* (or is a settled tie within
+    *tie_margin*), or when *max_fights* (default: the cost of a full
+    round-robin at *batch* per pair) runs out.
+    """
+    if len(names) < 2:
+        raise ValueError("Need at least 2 builds to rank.")
+    rng = random.Random(seed)
+    k = len(names)
+    if max_fights is None:
+        max_fights = batch * k * (k - 1) // 2
+
+    tallies: dict[tuple[str, str], PairTally] = {}
+    fights = 0
+    steps = 0
+
+    def _play(a: str, b: str) -> None:
+        nonlocal fights, steps
+        key = _pair_key(a, b)
+        first, second = key
+        wa, wb, dr = play(first, second, batch, rng.getrandbits(31))
+        t = tallies.setdefault(key, PairTally())
+        t.wins_a += wa
+        t.wins_b += wb
+        t.draws += dr
+        fights += wa + wb + dr
+        steps += 1
+
+    ring = list(names)
+    rng.shuffle(ring)
+    seeded: set[tuple[str, str]] = set()
+    for offset in (1, 2):
+        for i in range(k):
+            key = _pair_key(ring[i], ring[(i + offset) % k])
+            if key[0] != key[1] and key not in seeded and fights + batch <= max_fights:
+                seeded.add(key)
+                _play(*key)
+
+    def _snapshot(converged: bool) -> BTResult:
+        strengths, ses = fit_bradley_terry(names, tallies)
+        ordering = sorted(names, key=lambda nm: strengths[nm], reverse=True)
+        return BTResult(
+            strengths=strengths, std_errors=ses, tallies=tallies,
+            fights=fights, steps=steps, converged=converged, ordering=ordering,
+        )
+
+    while True:
+        result = _snapshot(False)
+        conf = ordering_confidence(result.ordering, result.strengths, result.std_errors, tie_margin)
+        if conf >= confidence:
+            result.converged = True
+            break
+        if fights + batch > max_fights:
+            break
+        if on_step is not None:
+            on_step(result)
+
+        best_gain = -1.0
+        best_pair: tuple[str, str] | None = None
+        s, se = result.strengths, result.std_errors
+        for i, a in enumerate(names):
+            for b in names[i + 1:]:
+                sd = math.hypot(se[a], se[b])
+                ambiguity = 2.0 * _normal_cdf(-abs(s[a] - s[b]) / sd)
+                gain = information_gain(s[a], s[b], se[a], se[b], batch) * ambiguity
+                if gain > best_gain:
+                    best_gain, best_pair = gain, (a, b)
+        assert best_pair is not None
+        _play(*best_pair)
+
+    return result
@@ -0,0 +1,107 @@
+"""Dice tapes: record one fight of a seeded run and replay it with a full log.
+
+A seeded run_matchup() is a deterministic sequence of fights, and a ladder
+chunk is just such a run with its own seed (see sim.ladder.chunk_seed), so
+any single fight is addressed by (builds, tactics, seed, fight index).
+record_fight() fast-forwards through the earlier fights, captures the dice
+draws of the requested one into a tape, and replay() re-runs that fight from
+the tape with verbose logging on — even if the original run was silent.
+
+Tape files are a magic line, a one-line JSON header and the raw draws as
+little-endian uint16 (two bytes per die, typically a few hundred bytes per
+fight).
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sim.combat import run_combat
+from sim.dice import DiceContext, TapeError, recording, replaying, using
+from sim.tactics import load_tactics
+
+if TYPE_CHECKING:
+    from sim.models import Character, CombatState
+
+MAGIC = b"DNDTAPE1\n"
+
+
+@dataclass
+class FightTape:
+    """Everything needed to re-run one fight, plus its recorded outcome."""
+    build_a: str
+    build_b: str
+    tactic_a: str = "aggressive"
+    tactic_b: str = "aggressive"
+    seed: int | None = None
+    fight: int = 0
+    rounds: int = 0
+    hp_a: int = 0
+    hp_b: int = 0
+    draws: array = field(default_factory=lambda: array("H"))
+
+    def save(self, path: str | Path) -> None:
+        header = {k: v for k, v in asdict(self).items() if k != "draws"}
+        draws = self.draws
+        if sys.byteorder != "little":
+            draws = array("H", draws)
+            draws.byteswap()
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(draws.tobytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FightTape":
+        with open(path, "rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{path}: not a dice tape")
+            header = json.loads(f.readline())
+            draws = array("H", f.read())
+        if sys.byteorder != "little":
+            draws.byteswap()
+        return cls(**header, draws=draws)
+
+
+def record_fight(
+    template_a: "Character",
+    template_b: "Character",
+    build_a: str,
+    build_b: str,
+    *,
+    seed: int,
+    fight: int,
+    tactic_a: str = "aggressive",
+    tactic_b: str = "aggressive",
+) -> FightTape:
+    """Tape fight number *fight* of run_matchup(..., seed=seed)."""
+    tactics_a = load_tactics(tactic_a)
+    tactics_b = load_tactics(tactic_b)
+    with using(DiceContext(seed)):
+        for _ in range(fight):
+            run_combat(template_a.deep_copy(), template_b.deep_copy(), tactics_a, tactics_b)
+        a, b = template_a.deep_copy(), template_b.deep_copy()
+        with recording() as draws:
+            state = run_combat(a, b, tactics_a, tactics_b)
+    return FightTape(build_a, build_b, tactic_a, tactic_b, seed, fight,
+                     state.round_number, a.current_hp, b.current_hp, draws)
+
+
+def replay(tape: FightTape, template_a: "Character", template_b: "Character") -> "CombatState":
+    """Re-run the taped fight with logging on; raises TapeError if it diverges."""
+    a, b = template_a.deep_copy(), template_b.deep_copy()
+    with replaying(tape.draws):
+        state = run_combat(a, b, load_tactics(tape.tactic_a), load_tactics(tape.tactic_b),
+                           verbose=True)
+    outcome = (state.round_number, a.current_hp, b.current_hp)
+    if outcome != (tape.rounds, tape.hp_a, tape.hp_b):
+        raise TapeError(
+            f"replay ended {outcome} but the tape recorded "
+            f"{(tape.rounds, tape.hp_a, tape.hp_b)} (rounds, hp_a, hp_b)"
+        )
+    return state
@@ -0,0 +1,299 @@
+"""Rule-file tactics: tactics/priority/*.yaml compiled into predicate closures.
+
+A rule file lists condition → action rules::
+
+    name: cautious
+    priority:
+    - condition: hp < 50% and has second wind
+      action: second_wind
+    - condition: in melee
+      action: melee_attack
+
+Each turn the rules are checked top-down and every rule whose condition
+holds contributes its action, in file order — the same shape as the
+hand-written built-ins, whose turn plans the engine executes in order,
+skipping what the action economy no longer allows.
+
+Conditions are parsed once, when the file is loaded, into plain closures
+over (character, state), so a custom tactic costs no more per turn than a
+built-in one.  The grammar is deliberately small::
+
+    condition := clause ("or" clause)*
+    clause    := term ("and" term)*
+    term      := "not" term | atom
+    atom      := "in melee" | "raging" | "concentrating" | "always"
+               | ["enemy"] "hp" OP N "%"     (OP: < <= > >= ==)
+               | "round" OP N
+               | ["has"] "ranged weapon" | ["has"] "spell slot"
+               | ["has"] <thing> "uses"      (resource <thing> has uses left)
+               | ["has"] <thing>             (feature, trait or resource; if it
+                                              has a resource, uses must be left)
+
+Multi-word names map to ids with underscores ("second wind" → second_wind).
+A <thing> must be a feature, trait or resource id some build in data/builds
+has, so a misspelt name fails at load time instead of never firing.
+"""
+
+from __future__ import annotations
+
+import functools
+import operator
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import yaml
+
+from sim import audit, loader
+from sim.models import CombatPhase
+from sim.tactics import Plan, TacticsEngine, TurnAction, _pick_melee_weapon, turn_action
+
+if TYPE_CHECKING:
+    from sim.models import Character, CombatState
+
+Predicate = Callable[["Character", "CombatState"], bool]
+ActionFactory = Callable[["Character"], "TurnAction | None"]
+
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+        "==": operator.eq}
+_HP_RE = re.compile(r"^(enemy )?hp\s*(<=|>=|==|<|>)\s*(\d+)\s*%$")
+_ROUND_RE = re.compile(r"^round\s*(<=|>=|==|<|>)\s*(\d+)$")
+_NAME_RE = re.compile(r"^[a-z][a-z0-9' ]*$")
+
+
+# ---------------------------------------------------------------------------
+# Conditions
+# ---------------------------------------------------------------------------
+
+def _in_melee(char: "Character", state: "CombatState") -> bool:
+    return state.distance <= 5 and state.phase == CombatPhase.MELEE
+
+
+def _raging(char: "Character", state: "CombatState") -> bool:
+    return char.is_raging
+
+
+def _concentrating(char: "Character", state: "CombatState") -> bool:
+    return char.is_concentrating()
+
+
+def _always(char: "Character", state: "CombatState") -> bool:
+    return True
+
+
+def _has_ranged_weapon(char: "Character", state: "CombatState") -> bool:
+    return char.best_ranged_weapon() is not None
+
+
+def _has_spell_slot(char: "Character", state: "CombatState") -> bool:
+    return char.highest_available_spell_slot() is not None
+
+
+_STATES: dict[str, Predicate] = {
+    "in melee": _in_melee,
+    "raging": _raging,
+    "concentrating": _concentrating,
+    "always": _always,
+    "ranged weapon": _has_ranged_weapon,
+    "spell slot": _has_spell_slot,
+    "spell slots": _has_spell_slot,
+}
+
+
+def _ident(words: str) -> str:
+    return words.replace("'", "").replace(" ", "_")
+
+
+@functools.lru_cache(maxsize=None)
+def known_ids() -> tuple[frozenset[str], frozenset[str]]:
+    """(feature/trait/resource ids, resource ids) of every build in data/builds."""
+    ids: set[str] = set()
+    resources: set[str] = set()
+    for path in sorted((loader._DATA_DIR / "builds").glob("*.yaml")):
+        char = loader.load_build(path)
+        ids.update(char.features, char.species_traits)
+        resources.update(char.resources)
+    return frozenset(ids | resources), frozenset(resources)
+
+
+def _has_uses(key: str) -> Predicate:
+    def test(char: "Character", state: "CombatState") -> bool:
+        res = char.resources.get(key)
+        return res is not None and res.available
+    return test
+
+
+def _has(key: str) -> Predicate:
+    def test(char: "Character", state: "CombatState") -> bool:
+        res = char.resources.get(key)
+        if key in char.features or key in char.species_traits:
+            return res is None or res.available
+        return res is not None and res.available
+    return test
+
+
+def _hp(op: Callable[[int, int], bool], percent: int, enemy: bool) -> Predicate:
+    # Integer form of current/max <op> percent/100, exact for every operator.
+    if enemy:
+        def test(char: "Character", state: "CombatState") -> bool:
+            other = state.opponent_of(char)
+            return op(other.current_hp * 100, percent * other.max_hp)
+    else:
+        def test(char: "Character", state: "CombatState") -> bool:
+            return op(char.current_hp * 100, percent * char.max_hp)
+    return test
+
+
+def _round(op: Callable[[int, int], bool], n: int) -> Predicate:
+    def test(char: "Character", state: "CombatState") -> bool:
+        return op(state.round_number, n)
+    return test
+
+
+def _atom(text: str) -> Predicate:
+    if m := _HP_RE.match(text):
+        return _hp(_OPS[m.group(2)], int(m.group(3)), enemy=bool(m.group(1)))
+    if m := _ROUND_RE.match(text):
+        return _round(_OPS[m.group(1)], int(m.group(2)))
+    if text.startswith("has "):
+        text = text[4:].strip()
+    if text in _STATES:
+        return _STATES[text]
+    if not _NAME_RE.match(text):
+        raise ValueError(f"cannot parse condition {text!r}")
+    ids, resources = known_ids()
+    if text.endswith(" uses"):
+        key = _ident(text[:-5].strip())
+        if key not in resources:
+            raise ValueError(f"unknown resource {text[:-5].strip()!r}")
+        return _has_uses(key)
+    if _ident(text) not in ids:
+        raise ValueError(f"unknown feature, trait or resource {text!r}")
+    return _has(_ident(text))
+
+
+def _negate(test: Predicate) -> Predicate:
+    def negated(char: "Character", state: "CombatState") -> bool:
+        return not test(char, state)
+    return negated
+
+
+def _both(first: Predicate, second: Predicate) -> Predicate:
+    def both(char: "Character", state: "CombatState") -> bool:
+        return first(char, state) and second(char, state)
+    return both
+
+
+def _either(first: Predicate, second: Predicate) -> Predicate:
+    def either(char: "Character", state: "CombatState") -> bool:
+        return first(char, state) or second(char, state)
+    return either
+
+
+def _term(text: str) -> Predicate:
+    negate = False
+    while text.startswith("not "):
+        negate = not negate
+        text = text[4:].strip()
+    test = _atom(text)
+    return _negate(test) if negate else test
+
+
+def compile_condition(text: str | None) -> Predicate:
+    """Parse a rule condition into a closure over (character, state)."""
+    text = " ".join(str(text or "always").lower().split())
+    result: Predicate | None = None
+    for clause in text.split(" or "):
+        terms = [_term(t.strip()) for t in clause.split(" and ")]
+        test = terms[0]
+        for other in terms[1:]:
+            test = _both(test, other)
+        result = test if result is None else _either(result, test)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Actions
+# ---------------------------------------------------------------------------
+
+def _ranged_attack(char: "Character") -> TurnAction | None:
+    weapon = char.best_ranged_weapon()
+    return turn_action("ranged_attack", weapon.name) if weapon else None
+
+
+def _melee_attack(char: "Character") -> TurnAction:
+    weapon = _pick_melee_weapon(char)
+    return turn_action("attack", weapon.name if weapon else None)
+
+
+def _simple(kind: str) -> ActionFactory:
+    action = turn_action(kind)
+
+    def make(char: "Character") -> TurnAction:
+        return action
+    return make
+
+
+# Rule-file action names that differ from the engine's action kinds; any
+# other engine kind is passed through as itself (e.g. hunters_mark).
+_ACTIONS: dict[str, ActionFactory] = {
+    "ranged_attack": _ranged_attack,
+    "melee_attack": _melee_attack,
+    "reckless_attack": _simple("reckless"),
+    "move_toward_enemy": _simple("move"),
+    "flurry_of_blows": _simple("flurry"),
+}
+
+
+def compile_action(name: str) -> ActionFactory:
+    name = str(name).strip()
+    if not name:
+        raise ValueError("empty action")
+    if name in _ACTIONS:
+        return _ACTIONS[name]
+    if name not in _ENGINE_KINDS:
+        raise ValueError(f"unknown action {name!r}")
+    return _simple(name)
+
+
+# Kinds combat knows how to carry out (see combat._do_action).
+_ENGINE_KINDS = frozenset(audit.KINDS) - {"other"}
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RuleTactics(TacticsEngine):
+    """Tactics driven by a compiled rule list (see module docstring)."""
+    name: str
+    rules: list[tuple[Predicate, ActionFactory]] = field(default_factory=list)
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, raw: dict, source: str = "<rules>") -> "RuleTactics":
+        compiled = []
+        for i, rule in enumerate(raw.get("priority") or []):
+            try:
+                compiled.append((compile_condition(rule.get("condition")),
+                                 compile_action(rule["action"])))
+            except (KeyError, ValueError, AttributeError) as e:
+                raise ValueError(f"{source}: rule {i + 1}: {e}") from None
+        return cls(name=raw.get("name") or Path(source).stem, rules=compiled,
+                   description=raw.get("description") or "")
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RuleTactics":
+        with open(path) as f:
+            return cls.from_dict(yaml.safe_load(f) or {}, str(path))
+
+    def decide_turn(self, char: "Character", state: "CombatState") -> Plan:
+        actions: list[TurnAction] = []
+        for test, make in self.rules:
+            if test(char, state):
+                action = make(char)
+                if action is not None:
+                    actions.append(action)
+        return tuple(actions)
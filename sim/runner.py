@@ -8,12 +8,18 @@ import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from sim import audit as action_audit
+from sim import metrics
 from sim.combat import run_combat
+from sim.dice import DiceContext, using
 from sim.loader import load_build
+from sim.sketch import fight_sketches, merge_sketches
 from sim.tactics import load_tactics
 
 if TYPE_CHECKING:
+    from sim.fightlog import FightColumns
     from sim.models import Character, Weapon
+    from sim.tactics import TacticsEngine
 
 
 # ---------------------------------------------------------------------------
@@ -242,11 +248,54 @@ def run_simulations(
     tactic1: str = "aggressive",
     tactic2: str = "aggressive",
     verbose: bool = False,
+    seed: int | None = None,
+    workers: int = 1,
+    backend: str = "processes",
+    audit: bool = False,
 ) -> dict:
-    """Run N combats and return summary statistics."""
+    """Run N combats and return summary statistics.
 
+    With *workers* > 1 the combats run in seeded chunks on a pool of
+    processes or threads (see run_matchup_parallel).
+    """
     template_a = load_build(build1_path)
     template_b = load_build(build2_path)
+    if workers > 1:
+        return run_matchup_parallel(
+            template_a, template_b, n,
+            tactic1=tactic1, tactic2=tactic2, verbose=verbose, seed=seed,
+            workers=workers, backend=backend, audit=audit,
+        )
+    return run_matchup(
+        template_a, template_b, n,
+        tactic1=tactic1, tactic2=tactic2, verbose=verbose, seed=seed, audit=audit,
+    )
+
+
+def run_matchup(
+    template_a: "Character",
+    template_b: "Character",
+    n: int = 10000,
+    tactic1: "str | TacticsEngine" = "aggressive",
+    tactic2: "str | TacticsEngine" = "aggressive",
+    verbose: bool = False,
+    seed: int | None = None,
+    fights: "FightColumns | None" = None,
+    audit: bool = False,
+) -> dict:
+    """Run N combats between two already-loaded templates.
+
+    Templates are never mutated — each combat works on a deep copy.  When
+    *seed* is given the combats draw from their own seeded DiceContext, so
+    the same seed reproduces the same tallies even with other runs going on
+    in other threads.  Passing *fights* also records one row per combat into
+    those column buffers (see sim.fightlog).  With *audit* each side's
+    emitted actions are counted by outcome under ``"audit"`` (see sim.audit).
+    """
+    if seed is not None:
+        with using(DiceContext(seed)):
+            return run_matchup(template_a, template_b, n, tactic1, tactic2, verbose,
+                               fights=fights, audit=audit)
     tactics_a = load_tactics(tactic1)
     tactics_b = load_tactics(tactic2)
 
@@ -254,16 +303,24 @@ def run_simulations(
     stats_b = CombatStats(name=template_b.name)
 
     total_rounds = 0
+    total_rounds_sq = 0
     draws = 0
-    special_triggers_totals: dict[str, int] = {}
+    metrics_a = metrics.new_counters()
+    metrics_b = metrics.new_counters()
+    audit_a = action_audit.new_counters() if audit else None
+    audit_b = action_audit.new_counters() if audit else None
+    sketches = fight_sketches()
+    rounds_hist = sketches["rounds"]
 
     for i in range(n):
         a = template_a.deep_copy()
         b = template_b.deep_copy()
+        a.audit, b.audit = audit_a, audit_b
 
         state = run_combat(a, b, tactics_a, tactics_b, verbose=verbose and i == 0)
 
         total_rounds += state.round_number
+        total_rounds_sq += state.round_number ** 2
 
         # Damage dealt = opponent's lost HP
         a_damage_dealt = template_b.max_hp - b.current_hp
@@ -271,19 +328,26 @@ def run_simulations(
 
         stats_a.total_damage_dealt += a_damage_dealt
         stats_b.total_damage_dealt += b_damage_dealt
+        rounds_hist.add(state.round_number)
+        sketches["damage_a"].add(a_damage_dealt)
+        sketches["damage_b"].add(b_damage_dealt)
         stats_a.total_rounds += state.round_number
         stats_b.total_rounds += state.round_number
 
-        # Aggregate special triggers
-        for key, val in state.special_triggers.items():
-            special_triggers_totals[key] = special_triggers_totals.get(key, 0) + val
+        if fights is not None:
+            fights.append(a, b, state, template_a.max_hp, template_b.max_hp)
+
+        metrics.accumulate(metrics_a, a.metrics)
+        metrics.accumulate(metrics_b, b.metrics)
 
         if a.is_alive and not b.is_alive:
             stats_a.wins += 1
             stats_a.wins_hp_remaining += a.current_hp
+            sketches["hp_left_a"].add(a.current_hp)
         elif b.is_alive and not a.is_alive:
             stats_b.wins += 1
             stats_b.wins_hp_remaining += b.current_hp
+            sketches["hp_left_b"].add(b.current_hp)
         else:
             draws += 1
 
@@ -308,6 +372,10 @@ def run_simulations(
             "win_rate": stats_a.wins / n * 100,
             "avg_dpr": stats_a.total_damage_dealt / total_rounds if total_rounds else 0,
             "avg_hp_remaining_on_win": stats_a.avg_hp_remaining_on_win,
+            "total_damage_dealt": stats_a.total_damage_dealt,
+            "wins_hp_remaining": stats_a.wins_hp_remaining,
+            "metrics": metrics_a,
+            "audit": audit_a,
         },
         "combatant_b": {
             "name": template_b.name,
@@ -318,15 +386,105 @@ def run_simulations(
             "win_rate": stats_b.wins / n * 100,
             "avg_dpr": stats_b.total_damage_dealt / total_rounds if total_rounds else 0,
             "avg_hp_remaining_on_win": stats_b.avg_hp_remaining_on_win,
+            "total_damage_dealt": stats_b.total_damage_dealt,
+            "wins_hp_remaining": stats_b.wins_hp_remaining,
+            "metrics": metrics_b,
+            "audit": audit_b,
         },
         "draws": draws,
+        "total_rounds": total_rounds,
+        "total_rounds_sq": total_rounds_sq,
         "avg_rounds": avg_rounds,
         "avg_ttk": avg_rounds,
-        "special_triggers": special_triggers_totals,
+        "sketches": sketches,
     }
     return results
 
 
+def merge_results(parts: list[dict]) -> dict:
+    """Combine run_matchup() results over disjoint fights of the same matchup."""
+    first = parts[0]
+    n = sum(p["n"] for p in parts)
+    total_rounds = sum(p["total_rounds"] for p in parts)
+    sketches: dict = {}
+    for p in parts:
+        merge_sketches(sketches, p["sketches"])
+
+    def side(key: str) -> dict:
+        wins = sum(p[key]["wins"] for p in parts)
+        damage = sum(p[key]["total_damage_dealt"] for p in parts)
+        hp_remaining = sum(p[key]["wins_hp_remaining"] for p in parts)
+        counters = metrics.new_counters()
+        for p in parts:
+            metrics.accumulate(counters, p[key]["metrics"])
+        audited = None
+        if first[key].get("audit") is not None:
+            audited = action_audit.new_counters()
+            for p in parts:
+                action_audit.accumulate(audited, p[key]["audit"])
+        return {
+            **first[key],
+            "wins": wins,
+            "win_rate": wins / n * 100 if n else 0.0,
+            "avg_dpr": damage / total_rounds if total_rounds else 0,
+            "avg_hp_remaining_on_win": hp_remaining / max(1, wins),
+            "total_damage_dealt": damage,
+            "wins_hp_remaining": hp_remaining,
+            "metrics": counters,
+            "audit": audited,
+        }
+
+    avg_rounds = total_rounds / n if n else 0
+    return {
+        **first,
+        "n": n,
+        "combatant_a": side("combatant_a"),
+        "combatant_b": side("combatant_b"),
+        "draws": sum(p["draws"] for p in parts),
+        "total_rounds": total_rounds,
+        "total_rounds_sq": sum(p["total_rounds_sq"] for p in parts),
+        "avg_rounds": avg_rounds,
+        "avg_ttk": avg_rounds,
+        "sketches": sketches,
+    }
+
+
+def run_matchup_parallel(
+    template_a: "Character",
+    template_b: "Character",
+    n: int = 10000,
+    tactic1: str = "aggressive",
+    tactic2: str = "aggressive",
+    verbose: bool = False,
+    seed: int | None = None,
+    *,
+    workers: int = 2,
+    backend: str = "processes",
+    chunk_size: int | None = None,
+    audit: bool = False,
+) -> dict:
+    """run_matchup() split into seeded chunks on a pool of *workers*.
+
+    Chunks are seeded like ladder chunks (sim.ladder.chunk_seed), so a seeded
+    run gives the same result for any worker count and either backend — but
+    not the same as a serial run_matchup(), which draws one single stream.
+    """
+    from sim.ladder import DEFAULT_CHUNK_SIZE, chunk_seed, make_executor
+
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    if len(sizes) <= 1:
+        return run_matchup(template_a, template_b, n, tactic1, tactic2, verbose, seed, audit=audit)
+    with make_executor(workers, backend) as pool:
+        futures = [
+            pool.submit(run_matchup, template_a, template_b, size, tactic1, tactic2,
+                        verbose and i == 0,
+                        chunk_seed(seed, template_a.name, template_b.name, i), audit=audit)
+            for i, size in enumerate(sizes)
+        ]
+        return merge_results([f.result() for f in futures])
+
+
 def print_results(results: dict) -> None:
     n = results["n"]
     a = results["combatant_a"]
@@ -365,18 +523,32 @@ def print_results(results: dict) -> None:
     print(f"  Avg Rounds per Combat: {results['avg_rounds']:.1f}")
     print(f"  Avg Turns to Kill: {results['avg_ttk']:.1f}")
 
-    # Special triggers
-    triggers = results.get("special_triggers", {})
-    if triggers:
+    sketches = results.get("sketches")
+    if sketches:
+        def _pct(key: str) -> str:
+            p = sketches[key].percentiles()
+            return f"{p['p10']}/{p['p50']}/{p['p90']}" if sketches[key].n else "—"
+        print()
+        print(f"  {'p10/p50/p90':22s} {'A':>19s}  {'B':>19s}")
+        print(f"  {'Rounds per Fight':22s} {_pct('rounds'):>19s}  {_pct('rounds'):>19s}")
+        print(f"  {'Damage per Fight':22s} {_pct('damage_a'):>19s}  {_pct('damage_b'):>19s}")
+        print(f"  {'HP Left on Win':22s} {_pct('hp_left_a'):>19s}  {_pct('hp_left_b'):>19s}")
+
+    # Feature usage, per fight
+    used = [i for i in range(metrics.SIZE) if a["metrics"][i] or b["metrics"][i]]
+    if used:
         print()
-        print("  Species Features:")
-        if "relentless_endurance" in triggers:
-            count = triggers["relentless_endurance"]
-            print(f"    Relentless Endurance: {count:,} triggers ({count/n*100:.1f}% of fights)")
-        if "stones_endurance_triggers" in triggers:
-            count = triggers["stones_endurance_triggers"]
-            reduced = triggers.get("stones_endurance_reduced", 0)
-            print(f"    Stone's Endurance: {count:,} triggers ({count/n*100:.1f}% of fights), {reduced/n:.1f} avg damage reduced/fight")
+        print(f"  {'Feature Usage / Fight':22s} {'A':>19s}  {'B':>19s}")
+        for i in used:
+            label = metrics.LABELS[metrics.NAMES[i]]
+            print(f"  {label:30s} {a['metrics'][i] / n:>11.2f}  {b['metrics'][i] / n:>19.2f}")
+
+    # Decision audit, when the run was audited
+    for side in (a, b):
+        if side.get("audit") is not None:
+            print()
+            print(f"  Decision Audit — {side['name']}")
+            print("\n".join(action_audit.format_table(side["audit"], n)))
 
     print("=" * 64)
 
@@ -389,13 +561,18 @@ def main():
     parser.add_argument("--tactic1", default="aggressive", help="Tactics for build 1")
     parser.add_argument("--tactic2", default="aggressive", help="Tactics for build 2")
     parser.add_argument("-v", "--verbose", action="store_true", help="Show first combat log")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel workers (default: 1)")
+    parser.add_argument("--backend", choices=("processes", "threads"), default="processes",
+                        help="Run --workers as processes or threads (default: processes)")
     args = parser.parse_args()
 
     start = time.time()
     results = run_simulations(
         args.build1, args.build2, args.n,
         tactic1=args.tactic1, tactic2=args.tactic2,
-        verbose=args.verbose,
+        verbose=args.verbose, seed=args.seed,
+        workers=args.workers, backend=args.backend,
     )
     elapsed = time.time() - start
 
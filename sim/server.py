@@ -0,0 +1,120 @@
+"""``dnd-sim serve``: JSON query API over localhost HTTP or a Unix socket.
+
+Endpoints (request bodies and responses are JSON):
+
+  POST /matchup  {"a": build, "b": build, "n": 3000, "seed": 0}
+  POST /rank     {"builds": [...]} or {"tags": [...]}, "n", "seed"
+  POST /dps      {"builds"|"tags", "ac": [14, 16, 18], "n": 5000, "burst": false, "seed"}
+  POST /reload   drop templates and cached results after editing data/
+  GET  /health   session counters
+
+All work goes through one SimSession, so builds are parsed once, results
+are cached, and identical concurrent requests share a single simulation.
+Omitting "seed" uses seed 0: answers are deterministic and cacheable.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sim.session import DEFAULT_SEED, SimSession, UnknownBuild
+
+
+class BadRequest(ValueError):
+    """Malformed query body."""
+
+
+def _builds(session: SimSession, body: dict) -> list[str]:
+    builds = session.resolve(body.get("builds"), body.get("tags"))
+    if not builds:
+        raise BadRequest("no builds selected (give 'builds' or 'tags')")
+    return builds
+
+
+def handle_query(session: SimSession, endpoint: str, body: dict) -> dict:
+    """Dispatch one query to the session (transport independent)."""
+    seed = int(body.get("seed", DEFAULT_SEED))
+    if endpoint == "matchup":
+        if "a" not in body or "b" not in body:
+            raise BadRequest("matchup needs 'a' and 'b'")
+        return session.matchup(body["a"], body["b"], int(body.get("n", 3000)), seed)
+    if endpoint == "rank":
+        builds = _builds(session, body)
+        if len(builds) < 2:
+            raise BadRequest("rank needs at least 2 builds")
+        return session.rank(builds, int(body.get("n", 3000)), seed)
+    if endpoint == "dps":
+        acs = [int(ac) for ac in body.get("ac", [14, 16, 18])]
+        return session.dps(_builds(session, body), acs, int(body.get("n", 5000)),
+                           bool(body.get("burst", False)), seed)
+    if endpoint == "reload":
+        session.reload()
+        return {"reloaded": True}
+    raise LookupError(endpoint)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "dnd-sim"
+    session: SimSession  # set on the subclass built by make_server()
+
+    def _reply(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._reply(200, {"ok": True, **self.session.stats()})
+        else:
+            self._reply(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise BadRequest("body must be a JSON object")
+            self._reply(200, handle_query(self.session, self.path.strip("/"), body))
+        except UnknownBuild as e:
+            self._reply(404, {"error": f"unknown build {e.args[0]}"})
+        except LookupError:
+            self._reply(404, {"error": f"unknown endpoint {self.path}"})
+        except (BadRequest, ValueError, TypeError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            # A broken pool or a failed worker: answer rather than drop the socket.
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    quiet = False
+
+
+def make_server(session: SimSession, *, host: str = "127.0.0.1", port: int = 8765,
+                socket_path: str | None = None, quiet: bool = False):
+    """HTTP server bound to a Unix socket (if given) or host:port."""
+    handler = type("Handler", (_Handler,), {"session": session})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixHTTPServer(socket_path, handler)
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+    server.quiet = quiet
+    return server
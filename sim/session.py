@@ -0,0 +1,257 @@
+"""Warm simulation session shared by long-lived front ends (serve, batch).
+
+A session keeps compiled build templates and a results cache in memory and
+runs work on a process pool.  Work is split into the same seeded chunks the
+ladder uses, so every unit is deterministic and safe to cache: two requests
+that need the same chunk — concurrently or an hour apart — share one
+simulation.  Identical requests already in flight are coalesced onto the
+same future instead of being simulated twice.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from sim import loader
+from sim.dice import DiceContext, using
+from sim.ladder import DEFAULT_CHUNK_SIZE, ChunkTask, Ladder, MatchupTally, run_chunk
+from sim.sketch import summarize
+from sim.spells import reload_spell_registry
+
+if TYPE_CHECKING:
+    from sim.models import Character
+
+BUILDS_DIR = loader._DATA_DIR / "builds"
+DEFAULT_SEED = 0
+
+
+class UnknownBuild(KeyError):
+    """Raised for a build name with no YAML under data/builds."""
+
+
+# ---------------------------------------------------------------------------
+# Pool tasks (module level so they pickle)
+# ---------------------------------------------------------------------------
+
+def _chunk_task(template_a: "Character", template_b: "Character", task: ChunkTask) -> MatchupTally:
+    return run_chunk(template_a, template_b, task)
+
+
+def _dps_task(template: "Character", ac: int, n: int, burst: bool, seed: int) -> float:
+    from sim.dps import simulate_dpr
+    with using(DiceContext(seed)):
+        return simulate_dpr(template, ac, n=n, use_surge=burst)
+
+
+def tally_dict(a: str, b: str, tally: MatchupTally) -> dict:
+    """JSON-ready view of a matchup tally."""
+    return {
+        "a": a,
+        "b": b,
+        **tally.to_dict(),
+        "win_rate_a": tally.win_rate_a,
+        "win_rate_b": tally.win_rate_b,
+        "avg_rounds": tally.avg_rounds,
+        "percentiles": summarize(tally.sketches),
+    }
+
+
+class SimSession:
+    """Compiled templates + results cache + worker pool behind one lock."""
+
+    def __init__(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 executor: Executor | None = None):
+        self.chunk_size = chunk_size
+        # A pool we create is ours to replace on reload(): its worker
+        # processes hold their own copies of the spell and data caches.
+        self._workers = max(1, workers)
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=self._workers)
+        self._generation = 0     # bumped by reload(); part of every cache key
+        self._lock = threading.Lock()
+        self._templates: dict[str, "Character"] = {}
+        self._cache: dict[tuple, Any] = {}
+        self._inflight: dict[tuple, Future] = {}
+        self.simulated = 0       # units actually run on the pool
+        self.coalesced = 0       # requests that joined an in-flight unit
+        self.cache_hits = 0
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "SimSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Templates ---
+
+    def template(self, name: str) -> "Character":
+        with self._lock:
+            return self._template(name)
+
+    def _template(self, name: str) -> "Character":
+        # Caller holds the lock, so the template belongs to the current generation.
+        if name not in self._templates:
+            path = BUILDS_DIR / f"{name}.yaml"
+            if not path.exists():
+                raise UnknownBuild(name)
+            self._templates[name] = loader.load_build(str(path))
+        return self._templates[name]
+
+    def resolve(self, builds: list[str] | None = None, tags: list[str] | None = None) -> list[str]:
+        """Explicit build names, or every build carrying all *tags*."""
+        if builds:
+            for name in builds:
+                if not (BUILDS_DIR / f"{name}.yaml").exists():
+                    raise UnknownBuild(name)
+            return list(builds)
+        names = []
+        for path in sorted(BUILDS_DIR.glob("*.yaml")):
+            raw = loader._load_yaml(path) or {}
+            if all(t in raw.get("tags", []) for t in tags or []):
+                names.append(path.stem)
+        return names
+
+    def reload(self) -> None:
+        """Forget templates, data caches and results (after data/ edits).
+
+        Work already in flight still completes for whoever is waiting on it,
+        but its results are not cached and new requests do not join it.
+        Worker processes are replaced so they load the new data too.
+        """
+        with self._lock:
+            self._generation += 1
+            self._templates.clear()
+            self._cache.clear()
+            self._inflight.clear()
+            loader._cache.clear()
+            reload_spell_registry()
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "cached": len(self._cache),
+                "inflight": len(self._inflight),
+                "simulated": self.simulated,
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+            }
+
+    # --- Cached, coalesced submission ---
+
+    def _submit(self, key: tuple, fn: Callable, builds: tuple[str, ...], *args) -> Future:
+        """fn(*templates of *builds*, *args) on the pool, cached under *key*.
+
+        The templates are resolved under the same lock as the generation,
+        so a reload() cannot slip between loading them and caching the result.
+        """
+        with self._lock:
+            key = (self._generation, *key)
+            if key in self._cache:
+                self.cache_hits += 1
+                done: Future = Future()
+                done.set_result(self._cache[key])
+                return done
+            if key in self._inflight:
+                self.coalesced += 1
+                return self._inflight[key]
+            templates = [self._template(name) for name in builds]
+            future = self._executor.submit(fn, *templates, *args)
+            self._inflight[key] = future
+            self.simulated += 1
+
+        def _settle(f: Future) -> None:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if key[0] == self._generation and not f.cancelled() and f.exception() is None:
+                    self._cache[key] = f.result()
+
+        future.add_done_callback(_settle)
+        return future
+
+    def submit_chunk(self, task: ChunkTask) -> Future:
+        return self._submit(("chunk", task), _chunk_task, (task.a, task.b), task)
+
+    def submit_dps(self, name: str, ac: int, n: int, burst: bool, seed: int) -> Future:
+        return self._submit(("dps", name, ac, n, burst, seed), _dps_task, (name,), ac, n, burst, seed)
+
+    # --- Queries ---
+    #
+    # Each start_*() submits all of its units immediately and returns a
+    # callable that waits for them, so a caller juggling several queries
+    # (see sim.batch) can put every fight on the pool before blocking on any.
+
+    def start_ladder(self, builds: list[str], n: int,
+                     seed: int = DEFAULT_SEED) -> Callable[[], Ladder]:
+        ladder = Ladder(builds, n, seed=seed, chunk_size=self.chunk_size)
+        futures = [(task, self.submit_chunk(task)) for task in ladder.pending()]
+
+        def collect() -> Ladder:
+            for task, future in futures:
+                ladder.record(task, future.result())
+            return ladder
+        return collect
+
+    def start_matchup(self, a: str, b: str, n: int,
+                      seed: int = DEFAULT_SEED) -> Callable[[], dict]:
+        collect = self.start_ladder([a, b], n, seed)
+        return lambda: tally_dict(a, b, collect().tally(a, b))
+
+    def start_rank(self, builds: list[str], n: int,
+                   seed: int = DEFAULT_SEED) -> Callable[[], dict]:
+        collect = self.start_ladder(builds, n, seed)
+
+        def result() -> dict:
+            ladder = collect()
+            return {
+                "n": n,
+                "seed": seed,
+                "ranking": [
+                    {"rank": i, "build": name, "name": self.template(name).name,
+                     "avg_win_rate": wr}
+                    for i, (name, wr) in enumerate(ladder.ranking(), 1)
+                ],
+                "matchups": [tally_dict(a, b, ladder.tally(a, b)) for a, b in ladder.matchups],
+            }
+        return result
+
+    def start_dps(self, builds: list[str], acs: list[int], n: int, burst: bool = False,
+                  seed: int = DEFAULT_SEED) -> Callable[[], dict]:
+        futures = {
+            (name, ac): self.submit_dps(name, ac, n, burst, seed)
+            for name in builds for ac in acs
+        }
+
+        def result() -> dict:
+            return {
+                "n": n,
+                "burst": burst,
+                "rows": [
+                    {"build": name, "name": self.template(name).name,
+                     "dpr": {str(ac): futures[(name, ac)].result() for ac in acs}}
+                    for name in builds
+                ],
+            }
+        return result
+
+    def ladder(self, builds: list[str], n: int, seed: int = DEFAULT_SEED) -> Ladder:
+        """Completed round-robin ladder over *builds*, served from cache where possible."""
+        return self.start_ladder(builds, n, seed)()
+
+    def matchup(self, a: str, b: str, n: int, seed: int = DEFAULT_SEED) -> dict:
+        return self.start_matchup(a, b, n, seed)()
+
+    def rank(self, builds: list[str], n: int, seed: int = DEFAULT_SEED) -> dict:
+        return self.start_rank(builds, n, seed)()
+
+    def dps(self, builds: list[str], acs: list[int], n: int, burst: bool = False,
+            seed: int = DEFAULT_SEED) -> dict:
+        return self.start_dps(builds, acs, n, burst, seed)()
@@ -0,0 +1,140 @@
+"""Mergeable fixed-bin histograms for bounded integer fight statistics.
+
+Rounds, damage dealt per fight and HP left are small non-negative integers,
+so one counter per value gives *exact* quantiles — simpler and more precise
+than a t-digest for this data.  Bins are allocated up to the largest value
+seen (typically a few dozen rounds and a hundred-odd damage, i.e. well under
+a KB per histogram).  Values above ``max_value`` land in a single overflow
+bin and are reported as ``max_value + 1``.
+Histograms merge by adding counts, so chunk results from any number of
+workers combine into the same answer a single process would give.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+
+# Overflow bounds: generous for L1–20 one-on-one fights.
+MAX_ROUNDS = 100
+MAX_DAMAGE = 1000
+MAX_HP = 1000
+
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+class Histogram:
+    """Counts per integer value in [0, max_value], plus one overflow bin."""
+
+    __slots__ = ("max_value", "counts", "n")
+
+    def __init__(self, max_value: int):
+        self.max_value = max_value
+        self.counts = array("I")
+        self.n = 0
+
+    def _grow(self, value: int) -> None:
+        self.counts.extend(array("I", bytes(4 * (value + 1 - len(self.counts)))))
+
+    def add(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        elif value > self.max_value:
+            value = self.max_value + 1
+        if value >= len(self.counts):
+            self._grow(value)
+        self.counts[value] += 1
+        self.n += 1
+
+    def merge(self, other: "Histogram") -> None:
+        if other.max_value != self.max_value:
+            raise ValueError("cannot merge histograms with different bounds")
+        if len(other.counts) > len(self.counts):
+            self._grow(len(other.counts) - 1)
+        counts = self.counts
+        for value, count in enumerate(other.counts):
+            if count:
+                counts[value] += count
+        self.n += other.n
+
+    def quantile(self, q: float) -> int:
+        """Nearest-rank quantile: the smallest value covering ≥ q of the samples."""
+        if not self.n:
+            return 0
+        target = max(1, math.ceil(q * self.n - 1e-9))   # at least one sample
+        seen = 0
+        for value, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return value
+        return self.max_value + 1
+
+    def percentiles(self, qs: tuple[float, ...] = QUANTILES) -> dict[str, int]:
+        return {f"p{round(q * 100)}": self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> float:
+        if not self.n:
+            return 0.0
+        return sum(v * c for v, c in enumerate(self.counts)) / self.n
+
+    # --- Serialisation: sparse [value, count] pairs ---
+
+    def to_dict(self) -> dict:
+        return {
+            "max": self.max_value,
+            "counts": [[v, c] for v, c in enumerate(self.counts) if c],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        h = cls(data["max"])
+        if data["counts"]:
+            h._grow(data["counts"][-1][0])
+        for value, count in data["counts"]:
+            h.counts[value] += count
+            h.n += count
+        return h
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Histogram) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Histogram(n={self.n}, {self.percentiles()})"
+
+
+def fight_sketches() -> dict[str, Histogram]:
+    """The per-matchup distributions collected by run_matchup()."""
+    return {
+        "rounds": Histogram(MAX_ROUNDS),
+        "damage_a": Histogram(MAX_DAMAGE),      # damage A dealt per fight
+        "damage_b": Histogram(MAX_DAMAGE),
+        "hp_left_a": Histogram(MAX_HP),         # A's HP remaining, in fights A won
+        "hp_left_b": Histogram(MAX_HP),
+    }
+
+
+# Keys that swap when a matchup is viewed from the other side.
+SIDE_SWAP = {"damage_a": "damage_b", "damage_b": "damage_a",
+             "hp_left_a": "hp_left_b", "hp_left_b": "hp_left_a"}
+
+
+def merge_sketches(into: dict[str, Histogram], other: dict[str, Histogram]) -> None:
+    for key, h in other.items():
+        if key in into:
+            into[key].merge(h)
+        else:
+            into[key] = Histogram.from_dict(h.to_dict())
+
+
+def sketches_to_dict(sketches: dict[str, Histogram]) -> dict:
+    return {key: h.to_dict() for key, h in sketches.items()}
+
+
+def sketches_from_dict(data: dict) -> dict[str, Histogram]:
+    return {key: Histogram.from_dict(h) for key, h in data.items()}
+
+
+def summarize(sketches: dict[str, Histogram]) -> dict[str, dict[str, int]]:
+    """{"rounds": {"p10": .., "p50": .., "p90": ..}, ...} for export."""
+    return {key: h.percentiles() for key, h in sketches.items()}
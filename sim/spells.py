@@ -104,5 +104,15 @@ def cantrip_die_count(spell: SpellData, caster_level: int) -> int:
     return 1
 
 
+def reload_spell_registry(data_dir: Path | None = None) -> None:
+    """Re-read the spell YAML and swap the registry in one assignment.
+
+    Lookups go through get_spell(), so fights running in other threads see
+    either the old registry or the new one — never a half-filled dict.
+    """
+    global SPELL_REGISTRY
+    SPELL_REGISTRY = load_spell_registry(data_dir or DATA_DIR)
+
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 SPELL_REGISTRY = load_spell_registry(DATA_DIR)
@@ -0,0 +1,221 @@
+"""Expected-value spell tables: which spell, at which slot, against this target.
+
+For every levelled spell a caster knows, at every slot level it has that
+the spell can use, the table holds the cast's expected value against one
+target: average damage weighted by the chance to hit or to fail the save
+(Evasion included), and for control effects an HP-equivalent share of the
+target's max HP.  Almost everything it depends on — the caster's attack
+bonus and save DC, the target's save bonuses and max HP — is fixed for a
+fight; the target's AC is not (Shield, Bladesong and other effects raise
+it mid-fight), so a table is kept per target and AC, sorted best-first.
+Choosing a spell each turn is a walk down it to the first option whose
+slot is free and whose conditions (concentration, a target already
+disabled, Power Word thresholds) still hold.
+
+Cantrips, healing, bonus-action and aura spells are not in the table; the
+tactics pick those explicitly.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator
+
+from sim.actions import _normalize_save_ability
+from sim.dice import _calc_flat_mod, parse_dice
+from sim.models import Condition, DamageType
+from sim.spells import SpellData, get_spell
+
+if TYPE_CHECKING:
+    from sim.models import Character
+
+# HP-equivalent of a landed control effect, as a fraction of the target's
+# max HP — roughly what the caster's side gains while the effect lasts.
+CONTROL_VALUE = {
+    "paralyze": 0.6,          # every hit in melee crits until the save
+    "stun_no_save": 0.6,
+    "banishment": 0.4,
+    "polymorph": 0.4,
+    "incapacitated": 0.3,     # Hypnotic Pattern: the first hit ends it
+    "pain": 0.3,
+    "greater_invisibility": 0.25,
+}
+EXTRA_TURNS = 3.5             # Time Stop: 1d4 + 1 turns
+
+# Effects that land on the target; pointless against one already disabled.
+_DISABLING = frozenset({"paralyze", "stun_no_save", "banishment", "polymorph", "incapacitated"})
+_DISABLED = (Condition.INCAPACITATED, Condition.PARALYZED, Condition.STUNNED,
+             Condition.BANISHED, Condition.POLYMORPHED)
+_PAIN_HP_THRESHOLD = 100      # matches combat._apply_spell_effect
+
+
+@dataclass(frozen=True)
+class SpellOption:
+    """One row of a spell table: cast *spell* from a *slot* slot for *value*."""
+    value: float
+    spell: str
+    slot: int
+    concentration: bool = False
+    disabling: bool = False      # skip while the target is already disabled
+    self_buff: Condition | None = None    # condition the cast gives the caster
+    max_target_hp: int = 0       # only castable on a target at or below this HP
+
+
+def average(expr: str) -> float:
+    """Mean of a dice expression such as '8d6' or '7d8+30'."""
+    return sum(n * (sides + 1) / 2 for n, sides in parse_dice(expr)) + _calc_flat_mod(expr)
+
+
+def _chance(needed: int) -> float:
+    """P(d20 >= needed)."""
+    return min(1.0, max(0.0, (21 - needed) / 20))
+
+
+@lru_cache(maxsize=1024)
+def _upcast_average(dice: str, upcast: str, extra_levels: int) -> tuple[float, bool]:
+    """Mean of *dice* cast *extra_levels* above its level, and whether upcasting adds dice."""
+    from sim.combat import _add_upcast_dice   # sim.combat imports the tactics
+
+    if not upcast:
+        return average(dice), False
+    return average(_add_upcast_dice(dice, upcast, extra_levels)), \
+        _add_upcast_dice(dice, upcast, 1) != dice
+
+
+def _scales(spell: SpellData) -> bool:
+    """Whether casting *spell* from a higher slot does more."""
+    if spell.attack_type == "none" and spell.damage_dice:
+        return True                             # one more dart per level
+    if spell.name == "scorching_ray":
+        return True                             # one more ray per level
+    return _upcast_average(spell.damage_dice, spell.upcast_dice, 0)[1]
+
+
+def _damage_value(caster: Character, target: Character, spell: SpellData, slot: int) -> float:
+    extra = slot - spell.level
+    hit = _upcast_average(spell.damage_dice, spell.upcast_dice, extra)[0]
+    if spell.damage_type == DamageType.FIRE and "soul_of_the_forge" in target.features:
+        hit /= 2
+
+    if spell.attack_type == "none":
+        return hit * (spell.extra_attacks + extra)
+    if spell.attack_type == "spell_attack":
+        rays = spell.extra_attacks + (extra if spell.name == "scorching_ray" else 0)
+        return hit * rays * _chance(target.effective_ac - caster.spell_attack_bonus)
+    if spell.attack_type == "save":
+        ability = _normalize_save_ability(spell.save_ability)
+        saves = _chance(caster.spell_save_dc - target.saving_throw_total(ability))
+        if "evasion" in target.features and ability == "dex":
+            return hit * (1 - saves) / 2
+        return hit * ((1 - saves) + (saves / 2 if spell.half_on_save else 0))
+    return 0.0
+
+
+def _fails(caster: Character, target: Character, spell: SpellData) -> float:
+    if spell.attack_type != "save":
+        return 1.0
+    ability = _normalize_save_ability(spell.save_ability)
+    return 1 - _chance(caster.spell_save_dc - target.saving_throw_total(ability))
+
+
+def _option(caster: Character, target: Character, spell: SpellData, slot: int) -> SpellOption:
+    value = _damage_value(caster, target, spell, slot) if spell.damage_dice else 0.0
+    effect = spell.effect
+    if spell.name == "hypnotic_pattern":
+        effect = "incapacitated"
+    if effect == "harm":
+        # Harm drops the target to a fraction of its max HP on a failed save.
+        value = max(value, _fails(caster, target, spell)
+                    * (1 - spell.hp_percentage_cap) * target.max_hp)
+    elif effect in CONTROL_VALUE:
+        value += _fails(caster, target, spell) * CONTROL_VALUE[effect] * target.max_hp
+
+    threshold = spell.instant_kill_threshold or (_PAIN_HP_THRESHOLD if effect == "pain" else 0)
+    if spell.instant_kill_threshold:
+        value = float(target.max_hp)            # only offered once it kills outright
+    return SpellOption(
+        value=value,
+        spell=spell.name,
+        slot=slot,
+        concentration=spell.concentration,
+        disabling=effect in _DISABLING,
+        self_buff=Condition.GREATER_INVISIBLE if effect == "greater_invisibility" else None,
+        max_target_hp=threshold,
+    )
+
+
+def build_table(caster: Character, target: Character) -> tuple[SpellOption, ...]:
+    """Every levelled spell *caster* can cast at *target*, best expected value first."""
+    slots = sorted(caster.spell_slots)
+    spells = [s for s in map(get_spell, caster.spells_known)
+              if s is not None and s.level > 0 and not (s.aura or s.bonus_action)
+              and s.attack_type not in ("heal", "attack_roll", "melee_spell_attack")
+              and s.name != "call_lightning"]
+
+    options: list[SpellOption] = []
+    deferred: list[SpellData] = []
+    for spell in spells:
+        if spell.effect in ("extra_turns", "wish"):
+            deferred.append(spell)
+            continue
+        levels = [s for s in slots if s >= spell.level] if _scales(spell) else \
+            [spell.level] if spell.level in slots else []
+        options.extend(_option(caster, target, spell, slot) for slot in levels)
+
+    # Time Stop and Wish are worth what the caster would do with them.
+    for spell in deferred:
+        if spell.level not in slots:
+            continue
+        if spell.effect == "extra_turns":
+            best = max((o.value for o in options), default=0.0)
+            options.append(SpellOption(EXTRA_TURNS * best, spell.name, spell.level))
+        else:
+            replicated = [_damage_value(caster, target, s, spell.replicate_slot) for s in spells
+                          if s.damage_dice and s.level <= spell.replicate_slot]
+            options.append(SpellOption(max(replicated, default=0.0), spell.name, spell.level))
+
+    options = [o for o in options if o.value > 0]
+    options.sort(key=lambda o: (-o.value, o.slot))
+    return tuple(options)
+
+
+class SpellTable:
+    """A caster's spell table, built against its opponent's current AC on first use."""
+
+    def __init__(self, caster: Character):
+        self.caster = caster
+        self._target: Character | None = None
+        self._tables: dict[int, tuple[SpellOption, ...]] = {}   # effective AC -> table
+
+    def options(self, target: Character) -> tuple[SpellOption, ...]:
+        if target is not self._target:
+            self._tables.clear()
+            self._target = target
+        ac = target.effective_ac
+        if ac not in self._tables:
+            self._tables[ac] = build_table(self.caster, target)
+        return self._tables[ac]
+
+    def castable(self, target: Character) -> Iterator[SpellOption]:
+        """The options castable at *target* right now, best first."""
+        caster = self.caster
+        disabled = any(c in target.conditions for c in _DISABLED)
+        for option in self.options(target):
+            if not caster.has_spell_slot(option.slot):
+                continue
+            if option.concentration and caster.is_concentrating():
+                continue
+            if option.disabling and disabled:
+                continue
+            if option.self_buff in caster.conditions:
+                continue
+            if option.max_target_hp and target.current_hp > option.max_target_hp:
+                continue
+            yield option
+
+    def best(self, target: Character | None) -> SpellOption | None:
+        """The highest-value option castable right now, or None."""
+        if target is None:
+            return None
+        return next(self.castable(target), None)
@@ -0,0 +1,311 @@
+"""Results warehouse: ladder runs recorded in an embedded SQLite database.
+
+Each run stores its parameters, the engine version (package version plus a
+hash of the simulator source and rules data) and a hash of every build YAML,
+together with per-matchup tallies and rounds moments.  Matchups are stored
+from both sides — one row with A as ``build`` and one with B — so a query
+like "every Fire Goliath vs every caster at L5, latest engine" is a single
+indexed lookup:
+
+    query(conn, build=Selector(tags=["fire", "goliath"]),
+          opponent=Selector(role="caster"), level=5)
+
+Rows from several runs with the same engine and the same build hashes are
+samples of the same matchup and are pooled; a result recorded against an
+older version of a build YAML is superseded by the newest one.  Seeded
+runs are not independent samples: a matchup's fights come from chunk seeds
+fixed by (seed, chunk size, chunk index), so two runs with the same seed
+and chunk size replay the same chunks from index 0 up.  Each row records
+its seed and chunk size, and of the rows sharing both only the one with
+the most fights is counted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import yaml
+
+import sim
+from sim.ladder import MatchupTally
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_BUILDS_DIR = _PROJECT_ROOT / "data" / "builds"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY,
+    created_at      REAL NOT NULL,
+    kind            TEXT NOT NULL,
+    engine_version  TEXT NOT NULL,
+    params          TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS builds (
+    hash            TEXT PRIMARY KEY,
+    name            TEXT NOT NULL,
+    class           TEXT,
+    subclass        TEXT,
+    species         TEXT,
+    ancestry        TEXT,
+    level           INTEGER,
+    role            TEXT,
+    tactic          TEXT,
+    source          TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS build_tags (
+    hash            TEXT NOT NULL REFERENCES builds(hash),
+    tag             TEXT NOT NULL,
+    PRIMARY KEY (hash, tag)
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    run_id          INTEGER NOT NULL REFERENCES runs(id),
+    build           TEXT NOT NULL,
+    opponent        TEXT NOT NULL,
+    build_hash      TEXT NOT NULL,
+    opponent_hash   TEXT NOT NULL,
+    level           INTEGER,
+    tactic          TEXT,
+    opponent_tactic TEXT,
+    seed            INTEGER,
+    chunk_size      INTEGER,
+    n               INTEGER NOT NULL,
+    wins            INTEGER NOT NULL,
+    losses          INTEGER NOT NULL,
+    draws           INTEGER NOT NULL,
+    total_rounds    INTEGER NOT NULL,
+    total_rounds_sq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_matchups_lookup
+    ON matchups (build, opponent, level, tactic, opponent_tactic);
+CREATE INDEX IF NOT EXISTS ix_matchups_opponent ON matchups (opponent, level);
+CREATE INDEX IF NOT EXISTS ix_matchups_run ON matchups (run_id);
+CREATE INDEX IF NOT EXISTS ix_build_tags_tag ON build_tags (tag, hash);
+CREATE INDEX IF NOT EXISTS ix_builds_name ON builds (name);
+"""
+
+
+def engine_version() -> str:
+    """Package version + hash of everything besides builds that shapes results."""
+    h = hashlib.sha1()
+    paths = sorted((_PROJECT_ROOT / "sim").glob("*.py"))
+    paths += sorted(
+        p for p in (_PROJECT_ROOT / "data").rglob("*.yaml")
+        if p.relative_to(_PROJECT_ROOT / "data").parts[0] not in ("builds", "reference")
+    )
+    paths += sorted((_PROJECT_ROOT / "tactics").rglob("*.yaml"))
+    for p in paths:
+        h.update(str(p.relative_to(_PROJECT_ROOT)).encode())
+        h.update(p.read_bytes())
+    return f"{sim.__version__}+{h.hexdigest()[:10]}"
+
+
+def build_hash(source: bytes) -> str:
+    return hashlib.sha1(source).hexdigest()[:12]
+
+
+def connect(path: str | Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    # Databases created before rows recorded their sample key.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(matchups)")}
+    for column in ("seed", "chunk_size"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE matchups ADD COLUMN {column} INTEGER")
+    return conn
+
+
+def _record_build(conn: sqlite3.Connection, name: str) -> tuple[str, dict]:
+    source = (_BUILDS_DIR / f"{name}.yaml").read_bytes()
+    digest = build_hash(source)
+    raw = yaml.safe_load(source) or {}
+    caster = bool(raw.get("spells_known") or raw.get("spellcasting_ability"))
+    conn.execute(
+        "INSERT OR IGNORE INTO builds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (digest, name, raw.get("class"), raw.get("subclass"), raw.get("species"),
+         raw.get("giant_ancestry"), raw.get("level"), "caster" if caster else "martial",
+         raw.get("tactic", "aggressive"), source.decode()),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO build_tags VALUES (?, ?)",
+        [(digest, tag) for tag in raw.get("tags", [])],
+    )
+    return digest, raw
+
+
+def record_run(
+    conn: sqlite3.Connection,
+    kind: str,
+    params: dict,
+    matchups: Iterable[tuple[str, str, MatchupTally]],
+    *,
+    tactic: str = "aggressive",
+    seed: int | None = None,
+    chunk_size: int | None = None,
+) -> int:
+    """Store one run's matchup tallies; returns the new run id.
+
+    *tactic* is the tactic every build played (ladders use one for all).
+    *seed* and *chunk_size* identify a seeded run's chunks, so that
+    query() does not count the same fights twice; leave *seed* None for
+    an unseeded run.
+    """
+    matchups = list(matchups)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO runs (created_at, kind, engine_version, params) VALUES (?, ?, ?, ?)",
+            (time.time(), kind, engine_version(), json.dumps(params, sort_keys=True, default=str)),
+        )
+        run_id = cur.lastrowid
+        builds = {}
+        for a, b, _ in matchups:
+            for name in (a, b):
+                if name not in builds:
+                    builds[name] = _record_build(conn, name)
+        rows = []
+        for a, b, t in matchups:
+            for me, them, tally in ((a, b, t), (b, a, t.flipped())):
+                my_hash, my_raw = builds[me]
+                their_hash, their_raw = builds[them]
+                rows.append((
+                    run_id, me, them, my_hash, their_hash, my_raw.get("level"),
+                    tactic, tactic, seed, chunk_size if seed is not None else None,
+                    tally.n, tally.wins_a, tally.wins_b, tally.draws,
+                    tally.total_rounds, tally.total_rounds_sq,
+                ))
+        conn.executemany(
+            "INSERT INTO matchups (run_id, build, opponent, build_hash, opponent_hash, level, "
+            "tactic, opponent_tactic, seed, chunk_size, n, wins, losses, draws, "
+            "total_rounds, total_rounds_sq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return run_id
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Selector:
+    """Which builds a side of the query covers (all given fields must match)."""
+    names: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    cls: str | None = None
+    species: str | None = None
+    role: str | None = None          # "caster" or "martial"
+
+    def sql(self, hash_col: str) -> tuple[str, list]:
+        clauses, args = [], []
+        if self.names:
+            clauses.append(f"b.name IN ({', '.join('?' * len(self.names))})")
+            args += self.names
+        for col, value in (("class", self.cls), ("species", self.species), ("role", self.role)):
+            if value is not None:
+                clauses.append(f"b.{col} = ?")
+                args.append(value)
+        for tag in self.tags:
+            clauses.append("EXISTS (SELECT 1 FROM build_tags t WHERE t.hash = b.hash AND t.tag = ?)")
+            args.append(tag)
+        if not clauses:
+            return "", []
+        where = " AND ".join(clauses)
+        return f" AND {hash_col} IN (SELECT b.hash FROM builds b WHERE {where})", args
+
+
+@dataclass
+class MatchupRow:
+    build: str
+    opponent: str
+    n: int
+    wins: int
+    losses: int
+    draws: int
+    total_rounds: int
+    total_rounds_sq: int
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.n * 100 if self.n else 0.0
+
+    @property
+    def avg_rounds(self) -> float:
+        return self.total_rounds / self.n if self.n else 0.0
+
+
+def latest_engine(conn: sqlite3.Connection) -> str | None:
+    row = conn.execute("SELECT engine_version FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def query(
+    conn: sqlite3.Connection,
+    build: Selector | None = None,
+    opponent: Selector | None = None,
+    level: int | None = None,
+    tactic: str | None = None,
+    engine: str | None = "latest",
+) -> list[MatchupRow]:
+    """Pooled stored results for every (build, opponent) pair matching the filters.
+
+    Rows of seeded runs that share a seed and chunk size hold the same
+    fights; only the largest of them is pooled.
+
+    *engine* is "latest" (engine of the newest run), "current" (this
+    checkout), "all", or an explicit version string.
+    """
+    sql = (
+        "SELECT m.*, r.engine_version FROM matchups m JOIN runs r ON r.id = m.run_id WHERE 1=1"
+    )
+    args: list = []
+    if engine == "latest":
+        engine = latest_engine(conn)
+    elif engine == "current":
+        engine = engine_version()
+    if engine not in (None, "all"):
+        sql += " AND r.engine_version = ?"
+        args.append(engine)
+    if level is not None:
+        sql += " AND m.level = ?"
+        args.append(level)
+    if tactic is not None:
+        sql += " AND m.tactic = ?"
+        args.append(tactic)
+    for selector, col in ((build, "m.build_hash"), (opponent, "m.opponent_hash")):
+        if selector is not None:
+            clause, extra = selector.sql(col)
+            sql += clause
+            args += extra
+    sql += " ORDER BY m.run_id DESC"
+
+    newest: dict[tuple[str, str], tuple] = {}
+    samples: dict[tuple, sqlite3.Row] = {}
+    for i, row in enumerate(conn.execute(sql, args)):
+        key = (row["build"], row["opponent"])
+        version = (row["build_hash"], row["opponent_hash"], row["engine_version"])
+        # Rows arrive newest first: the first one fixes which build versions count.
+        if newest.setdefault(key, version) != version:
+            continue
+        # A seeded row holds chunks 0..k of its (seed, chunk size): the
+        # longest run of that key contains every shorter one.
+        sample = (*key, row["seed"], row["chunk_size"]) if row["seed"] is not None else (*key, i)
+        if sample not in samples or row["n"] > samples[sample]["n"]:
+            samples[sample] = row
+
+    pooled: dict[tuple[str, str], MatchupRow] = {}
+    for row in samples.values():
+        key = (row["build"], row["opponent"])
+        acc = pooled.setdefault(key, MatchupRow(key[0], key[1], 0, 0, 0, 0, 0, 0))
+        acc.n += row["n"]
+        acc.wins += row["wins"]
+        acc.losses += row["losses"]
+        acc.draws += row["draws"]
+        acc.total_rounds += row["total_rounds"]
+        acc.total_rounds_sq += row["total_rounds_sq"]
+    return sorted(pooled.values(), key=lambda r: (r.build, -r.win_rate))
@@ -1,17 +1,30 @@
 """Pluggable decision engine for combat AI.
 
 The interface is an abstract base class ``TacticsEngine`` with a single
-method ``decide_turn`` that returns an ordered list of actions to take.
-The default implementation is a priority-list engine loaded from YAML.
+method ``decide_turn`` that returns the turn's actions as an ordered tuple.
+The built-in engines are hand-tuned priority lists with per-subclass
+logic; custom tactics are rule files compiled by sim.rules.
 """
 
 from __future__ import annotations
 
 import abc
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+import yaml
 
 from sim.models import Character, CombatState, CombatPhase, Condition, MasteryProperty
+from sim.spellvalue import SpellTable
+
+TACTICS_DIR = Path(__file__).resolve().parent.parent / "tactics" / "priority"
+BUILTIN_TACTICS = ("aggressive", "defensive")
+
+# Each plan's Second Wind threshold when the params leave it unset.
+_SECOND_WIND_HP = {"aggressive": 0.5, "defensive": 0.6}
 
 
 # ---------------------------------------------------------------------------
@@ -22,19 +35,146 @@ class TacticsEngine(abc.ABC):
     """Base class for all decision engines."""
 
     @abc.abstractmethod
-    def decide_turn(self, char: Character, state: CombatState) -> list[TurnAction]:
-        """Return an ordered list of actions for this turn."""
+    def decide_turn(self, char: Character, state: CombatState) -> Plan:
+        """Return the ordered actions for this turn."""
         ...
 
+    def bind(self, char: Character) -> Callable[[CombatState], Plan]:
+        """A decision function specialised to *char* for one fight.
 
-@dataclass
+        run_combat() binds each combatant once at setup and calls the result
+        every turn.  Engines override this to resolve whatever cannot change
+        during the fight (subclass branch, weapon choice) up front.
+        """
+        return lambda state: self.decide_turn(char, state)
+
+    def maneuver_picks(self) -> frozenset[str] | None:
+        """The maneuvers to spend superiority dice on (None: all the build knows).
+
+        run_combat() sets this on each fight copy; attack resolution checks
+        it through Character.uses_maneuver().
+        """
+        return None
+
+
+_NO_EXTRA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
 class TurnAction:
-    """A single decision for the turn."""
+    """A single decision for the turn.
+
+    Actions are immutable and shared: tactics take them from turn_action(),
+    cast_action() and their Loadout, which intern one object per distinct
+    action, so deciding a turn allocates no actions.
+    """
     kind: str          # "move", "attack", "rage", "reckless", "second_wind",
                        # "dodge", "dash", "flurry", "cunning_hide",
                        # "patient_defense", "action_surge", "ranged_attack"
     weapon: str | None = None
-    extra: dict[str, Any] = field(default_factory=dict)
+    extra: Mapping[str, Any] = field(default_factory=lambda: _NO_EXTRA)   # read-only
+
+    def __post_init__(self):
+        if not isinstance(self.extra, MappingProxyType):
+            object.__setattr__(self, "extra", MappingProxyType(dict(self.extra)))
+        # Plans (tuples of actions) key the search caches; hash each action once.
+        object.__setattr__(self, "_hash", hash((self.kind, self.weapon, tuple(self.extra.items()))))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Unpickle to the interned action, in worker processes too.
+        if not self.extra:
+            return turn_action, (self.kind, self.weapon)
+        if self.kind == "cast_spell" and self.extra.keys() == {"spell", "slot_level"}:
+            return cast_action, (self.extra["spell"], self.extra["slot_level"])
+        return TurnAction, (self.kind, self.weapon, dict(self.extra))
+
+
+# A turn plan: the actions to take, in order.
+Plan = tuple[TurnAction, ...]
+
+
+@lru_cache(maxsize=None)
+def turn_action(kind: str, weapon: str | None = None) -> TurnAction:
+    """The shared action *kind* (with *weapon*, for attacks)."""
+    return TurnAction(kind, weapon)
+
+
+@lru_cache(maxsize=None)
+def cast_action(spell: str, slot_level: int) -> TurnAction:
+    """The shared action casting *spell* from a *slot_level* slot (0 for cantrips)."""
+    return TurnAction("cast_spell", extra={"spell": spell, "slot_level": slot_level})
+
+
+@dataclass(frozen=True)
+class Loadout:
+    """What a character's turn plans need that cannot change during a fight."""
+    ranged: str | None        # best ranged or thrown weapon
+    melee: str | None         # preferred melee weapon (Nick-aware)
+    best_melee: str | None    # highest-damage melee weapon
+    blade_pact: bool
+    full_caster: bool         # casts spells rather than Eldritch Blast or weapons
+    spells: SpellTable | None = field(default=None, compare=False)   # full casters only
+    # The build's weapon attacks, built once here.
+    ranged_attack: TurnAction = field(init=False, compare=False)
+    melee_attack: TurnAction = field(init=False, compare=False)
+    best_melee_attack: TurnAction = field(init=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "ranged_attack", turn_action("ranged_attack", self.ranged))
+        object.__setattr__(self, "melee_attack", turn_action("attack", self.melee))
+        object.__setattr__(self, "best_melee_attack", turn_action("attack", self.best_melee))
+
+    @classmethod
+    def of(cls, char: Character) -> "Loadout":
+        ranged = char.best_ranged_weapon()
+        melee = _pick_melee_weapon(char)
+        best_melee = char.best_melee_weapon()
+        blade_pact = "pact_of_the_blade" in char.features
+        full_caster = bool(char.spells_known) and "eldritch_blast" not in char.features \
+            and not blade_pact
+        return cls(
+            ranged=ranged.name if ranged else None,
+            melee=melee.name if melee else None,
+            best_melee=best_melee.name if best_melee else None,
+            blade_pact=blade_pact,
+            full_caster=full_caster,
+            spells=SpellTable(char) if full_caster else None,
+        )
+
+
+@dataclass(frozen=True)
+class TacticParams:
+    """The tunable thresholds of the aggressive plans (see sim.tune).
+
+    The defaults are the hand-tuned values; a tactics file with a ``base``
+    and ``params`` (written by ``dnd-sim tune``) overrides some of them.
+    """
+    second_wind_hp: float | None = None   # Second Wind below this share of max HP (None: the plan's own)
+    heal_hp: float = 0.5              # Healing Word below this share of max HP
+    adrenaline_hp: float = 0.5        # Adrenaline Rush in melee below this share
+    action_surge_round: int = 1       # earliest round to Action Surge
+    maneuvers: tuple[str, ...] | None = None   # spend superiority dice only on these
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "TacticParams":
+        unknown = set(raw) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"unknown tactic params: {', '.join(sorted(unknown))}")
+        if raw.get("maneuvers") is not None:
+            raw = {**raw, "maneuvers": tuple(raw["maneuvers"])}
+        return cls(**raw)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The settings that differ from the defaults."""
+        default = TacticParams()
+        out = {f.name: getattr(self, f.name) for f in fields(self)
+               if getattr(self, f.name) != getattr(default, f.name)}
+        if "maneuvers" in out:
+            out["maneuvers"] = list(out["maneuvers"])
+        return out
 
 
 # ---------------------------------------------------------------------------
@@ -43,74 +183,90 @@ class TurnAction:
 
 @dataclass
 class PriorityTactics(TacticsEngine):
-    """Priority-list tactics loaded from YAML.
+    """The hand-tuned built-in tactics, selected by *name*.
 
-    Rules are evaluated top-down; the first matching rule fires.
+    Each turn's plan lists every applicable action in priority order; the
+    engine executes them in turn, skipping what the action economy no
+    longer allows.
     """
     name: str = "aggressive"
     rules: list[dict[str, Any]] = field(default_factory=list)
-
-    def decide_turn(self, char: Character, state: CombatState) -> list[TurnAction]:
-        opponent = state.opponent_of(char)
-        actions: list[TurnAction] = []
-        distance = state.distance
-        in_melee = distance <= 5 and state.phase == CombatPhase.MELEE
-        has_ranged = char.best_ranged_weapon() is not None
-
-        if self.name == "aggressive":
-            actions = self._aggressive(char, opponent, state, distance, in_melee, has_ranged)
-        elif self.name == "defensive":
-            actions = self._defensive(char, opponent, state, distance, in_melee, has_ranged)
+    params: TacticParams = field(default_factory=TacticParams)
+
+    @classmethod
+    def from_dict(cls, raw: dict, source: str = "<tactics>") -> "PriorityTactics":
+        """A built-in with tuned params: ``{base: aggressive, params: {...}}``."""
+        base = raw.get("base", "aggressive")
+        if base not in BUILTIN_TACTICS:
+            raise ValueError(f"{source}: base must be one of {', '.join(BUILTIN_TACTICS)}")
+        try:
+            return cls(name=base, params=TacticParams.from_dict(raw.get("params") or {}))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{source}: {e}") from None
+
+    def decide_turn(self, char: Character, state: CombatState) -> Plan:
+        return self.bind(char)(state)
+
+    def maneuver_picks(self) -> frozenset[str] | None:
+        return None if self.params.maneuvers is None else frozenset(self.params.maneuvers)
+
+    def second_wind_hp(self) -> float:
+        """The Second Wind threshold: the tuned one, else the plan's default."""
+        if self.params.second_wind_hp is not None:
+            return self.params.second_wind_hp
+        return _SECOND_WIND_HP.get(self.name, 0.5)
+
+    def bind(self, char: Character) -> Callable[[CombatState], Plan]:
+        loadout = Loadout.of(char)
+        if self.name == "defensive":
+            plan = self._defensive
         else:
-            actions = self._aggressive(char, opponent, state, distance, in_melee, has_ranged)
-        return actions
+            plan = self._subclass_plan(char) or self._aggressive
+
+        def decide(state: CombatState) -> Plan:
+            in_melee = state.distance <= 5 and state.phase == CombatPhase.MELEE
+            return tuple(plan(char, state.opponent_of(char), state, in_melee, loadout))
+        return decide
+
+    def plan_name(self, char: Character) -> str:
+        """The plan method that decides *char*'s turns, e.g. '_aggressive'."""
+        if self.name == "defensive":
+            return self._defensive.__name__
+        return (self._subclass_plan(char) or self._aggressive).__name__
+
+    def _subclass_plan(self, char: Character) -> Callable[..., list[TurnAction]] | None:
+        """The dedicated aggressive plan for *char*'s subclass, if it has one."""
+        features = char.features
+        if char.subclass == "bladesinger" or "bladesong" in features:
+            return self._bladesinger_tactics
+        if char.subclass == "eldritch_knight" or "war_magic" in features:
+            return self._eldritch_knight_tactics
+        if char.subclass == "hexblade" or "hexblade_curse" in features:
+            return self._hexblade_tactics
+        if char.subclass == "assassin" or "assassinate" in features:
+            return self._assassin_tactics
+        if char.subclass == "gloom_stalker" or "dread_ambusher" in features:
+            return self._gloom_stalker_tactics
+        if char.subclass == "swords_bard" or ("blade_flourish" in features and char.class_name == "bard"):
+            return self._swords_bard_tactics
+        if char.subclass == "devotion" or "sacred_weapon" in features:
+            return self._devotion_paladin_tactics
+        if char.subclass == "forge" or "blessing_of_the_forge" in features:
+            return self._forge_cleric_tactics
+        return None
 
     def _aggressive(
         self, char: Character, opponent: Character,
-        state: CombatState, distance: int, in_melee: bool, has_ranged: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         prefix_actions: list[TurnAction] = []
         actions: list[TurnAction] = []
-        is_blade_pact = "pact_of_the_blade" in char.features
-
-        # ===== NEW SUBCLASS TACTICS =====
-
-        # --- Bladesinger Wizard ---
-        if char.subclass == "bladesinger" or "bladesong" in char.features:
-            return self._bladesinger_tactics(char, opponent, state, in_melee)
-
-        # --- Eldritch Knight ---
-        if char.subclass == "eldritch_knight" or "war_magic" in char.features:
-            return self._eldritch_knight_tactics(char, opponent, state, in_melee)
-
-        # --- Hexblade Warlock ---
-        if char.subclass == "hexblade" or "hexblade_curse" in char.features:
-            return self._hexblade_tactics(char, opponent, state, in_melee)
-
-        # --- Assassin Rogue ---
-        if char.subclass == "assassin" or "assassinate" in char.features:
-            return self._assassin_tactics(char, opponent, state, in_melee)
-
-        # --- Gloom Stalker Ranger ---
-        if char.subclass == "gloom_stalker" or "dread_ambusher" in char.features:
-            return self._gloom_stalker_tactics(char, opponent, state, in_melee, has_ranged)
-
-        # --- Swords Bard ---
-        if char.subclass == "swords_bard" or ("blade_flourish" in char.features and char.class_name == "bard"):
-            return self._swords_bard_tactics(char, opponent, state, in_melee)
-
-        # --- Devotion Paladin ---
-        if char.subclass == "devotion" or "sacred_weapon" in char.features:
-            return self._devotion_paladin_tactics(char, opponent, state, in_melee)
-
-        # --- Forge Cleric ---
-        if char.subclass == "forge" or "blessing_of_the_forge" in char.features:
-            return self._forge_cleric_tactics(char, opponent, state, in_melee)
+        is_blade_pact = loadout.blade_pact
 
         # --- Full caster logic ---
-        if char.spells_known and "eldritch_blast" not in char.features and not is_blade_pact:
+        if loadout.full_caster:
             if any(e.name == "SpiritualWeapon" for e in char.active_effects):
-                prefix_actions.append(TurnAction(kind="spiritual_weapon_attack"))
+                prefix_actions.append(turn_action("spiritual_weapon_attack"))
             if (
                 char.class_name == "druid"
                 and in_melee
@@ -118,8 +274,9 @@ class PriorityTactics(TacticsEngine):
                 and not any(e.name == "Shillelagh" for e in char.active_effects)
                 and not char.bonus_action_used
             ):
-                prefix_actions.append(TurnAction(kind="cast_spell", extra={"spell": "shillelagh", "slot_level": 0}))
-            spell_action = _pick_spell_action(char, opponent)
+                prefix_actions.append(cast_action("shillelagh", 0))
+            spell_action = _pick_spell_action(char, opponent, loadout.spells,
+                                              heal_hp=self.params.heal_hp)
             if spell_action:
                 prefix_actions.append(spell_action)
                 spell_name = spell_action.extra.get("spell")
@@ -143,11 +300,11 @@ class PriorityTactics(TacticsEngine):
         ):
             res = char.resources.get("rage")
             if res and res.available:
-                actions.append(TurnAction(kind="rage"))
+                actions.append(turn_action("rage"))
 
         # --- Barbarian: Reckless Attack ---
         if "reckless_attack" in char.features and in_melee:
-            actions.append(TurnAction(kind="reckless"))
+            actions.append(turn_action("reckless"))
 
         # --- Goliath: Large Form on first turn if not in melee (level 5+) ---
         if ("large_form" in char.species_traits
@@ -156,7 +313,7 @@ class PriorityTactics(TacticsEngine):
                 and not char.bonus_action_used):
             # Use if not in melee (speed boost helps close) or round 1
             if not in_melee:
-                actions.append(TurnAction(kind="large_form"))
+                actions.append(turn_action("large_form"))
 
         # --- Paladin: Vow of Enmity on first turn (before Hunter's Mark — lasts all combat) ---
         if (
@@ -166,7 +323,7 @@ class PriorityTactics(TacticsEngine):
         ):
             res = char.resources.get("channel_divinity")
             if res and res.available:
-                actions.append(TurnAction(kind="vow_of_enmity"))
+                actions.append(turn_action("vow_of_enmity"))
 
         # --- Ranger/Paladin: Hunter's Mark on first turn ---
         # (prioritized before Adrenaline Rush since it boosts all hits)
@@ -174,48 +331,46 @@ class PriorityTactics(TacticsEngine):
         if "hunters_mark" in char.features and not char.hunters_mark_active and not char.bonus_action_used:
             hm_res = char.resources.get("hunters_mark")
             if hm_res and hm_res.available:
-                actions.append(TurnAction(kind="hunters_mark"))
+                actions.append(turn_action("hunters_mark"))
 
         # --- Dragonborn: Breath Weapon at range (only if in range and not in melee) ---
         if "breath_weapon" in char.species_traits:
             res = char.resources.get("breath_weapon")
             shape = getattr(char, "breath_weapon_shape", "cone")
             bw_range = 15 if shape == "cone" else 30
-            if res and res.available and not in_melee and distance <= bw_range:
-                actions.append(TurnAction(kind="breath_weapon"))
+            if res and res.available and not in_melee and state.distance <= bw_range:
+                actions.append(turn_action("breath_weapon"))
 
         # --- Warlock: Hex as bonus action when not concentrating and have a slot ---
         if "hex" in char.features and not char.is_concentrating():
             if char.highest_available_spell_slot():
-                actions.append(TurnAction(kind="hex"))
+                actions.append(turn_action("hex"))
 
         # --- Orc: Adrenaline Rush when not in melee (close distance) or when hurt ---
         if "adrenaline_rush" in char.species_traits and not char.bonus_action_used:
             res = char.resources.get("adrenaline_rush")
             if res and res.available:
                 hp_pct = char.current_hp / char.max_hp
-                if not in_melee or hp_pct < 0.5:
-                    actions.append(TurnAction(kind="adrenaline_rush"))
+                if not in_melee or hp_pct < self.params.adrenaline_hp:
+                    actions.append(turn_action("adrenaline_rush"))
 
         # --- Warlock: Eldritch Blast as primary action every turn ---
         if "eldritch_blast" in char.features and not is_blade_pact:
-            actions.append(TurnAction(kind="eldritch_blast"))
+            actions.append(turn_action("eldritch_blast"))
 
         # --- Warlock: Armor of Agathys when already in melee and exposed ---
         if "armor_of_agathys" in char.features and in_melee and not is_blade_pact:
             if not any(e.name == "Armor of Agathys" for e in char.active_effects):
                 if char.highest_available_spell_slot():
-                    actions.append(TurnAction(kind="armor_of_agathys"))
+                    actions.append(turn_action("armor_of_agathys"))
 
         # --- Ranged attack if not in melee and have ranged weapon (non-Warlock) ---
-        if not in_melee and has_ranged and "eldritch_blast" not in char.features:
-            rw = char.best_ranged_weapon()
-            if rw:
-                actions.append(TurnAction(kind="ranged_attack", weapon=rw.name))
+        if not in_melee and loadout.ranged and "eldritch_blast" not in char.features:
+            actions.append(loadout.ranged_attack)
 
         # --- Move toward opponent ---
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # --- Heroic Inspiration: use on first melee attack if we don't have advantage ---
         if "heroic_inspiration" in char.species_traits or char.resources.get("heroic_inspiration"):
@@ -224,90 +379,86 @@ class PriorityTactics(TacticsEngine):
                 # Use it when we're about to melee and don't already have advantage
                 has_reckless = any(a.kind == "reckless" for a in actions)
                 if not has_reckless:
-                    actions.append(TurnAction(kind="heroic_inspiration"))
+                    actions.append(turn_action("heroic_inspiration"))
 
         # --- Thief: Fast Hands for advantage (before attack) ---
         if "fast_hands" in char.features and in_melee:
-            actions.append(TurnAction(kind="fast_hands"))
+            actions.append(turn_action("fast_hands"))
 
         # --- Rogue: Steady Aim for advantage (when in melee already) ---
         if "steady_aim" in char.features and in_melee and "fast_hands" not in char.features:
-            actions.append(TurnAction(kind="steady_aim"))
+            actions.append(turn_action("steady_aim"))
 
         # --- Melee attack ---
         # Arcane Trickster: use Booming Blade instead of normal attack
         if "booming_blade" in char.features and in_melee:
-            actions.append(TurnAction(kind="booming_blade"))
+            actions.append(turn_action("booming_blade"))
         else:
-            # Prefer Nick weapon as main attack to trigger extra offhand attack
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))  # unarmed
+            # Nick-aware weapon choice (see _pick_melee_weapon); None is unarmed
+            actions.append(loadout.melee_attack)
 
         # --- Berserker: Frenzy attack as bonus action while raging ---
         if "frenzy" in char.features and char.is_raging and in_melee:
-            actions.append(TurnAction(kind="frenzy_attack"))
+            actions.append(turn_action("frenzy_attack"))
 
         # --- Bonus action: Monk Flurry of Blows ---
         if "open_hand_technique" in char.features and in_melee:
             res = char.resources.get("focus_points")
             if res and res.available:
-                actions.append(TurnAction(kind="open_hand_flurry"))
+                actions.append(turn_action("open_hand_flurry"))
         elif "flurry_of_blows" in char.features and in_melee:
             res = char.resources.get("focus_points")
             if res and res.available:
-                actions.append(TurnAction(kind="flurry"))
+                actions.append(turn_action("flurry"))
 
         # --- Shadow Monk: Shadow Step (L6) for advantage before attacking ---
         if "shadow_step" in char.features and in_melee and not char._shadow_step_used:
-            actions.append(TurnAction(kind="shadow_step"))
+            actions.append(turn_action("shadow_step"))
 
         # --- Open Hand Monk: Wholeness of Body (L6) when below 50% HP ---
         if "wholeness_of_body" in char.features:
             res = char.resources.get("wholeness_of_body")
             if res and res.available and char.current_hp / char.max_hp < 0.5:
-                actions.append(TurnAction(kind="wholeness_of_body"))
+                actions.append(turn_action("wholeness_of_body"))
 
         # --- Shadow Monk: Shadow Arts (cast Darkness for defense) ---
         if "shadow_arts" in char.features and not any(e.name == "Shadow Darkness" for e in char.active_effects):
             res = char.resources.get("focus_points")
             if res and res.current >= 2:
                 # Use shadow arts on first turn for defense
-                actions.append(TurnAction(kind="shadow_arts"))
+                actions.append(turn_action("shadow_arts"))
 
         # --- Bonus action: Monk Martial Arts free unarmed strike ---
         if "martial_arts" in char.features and "flurry_of_blows" not in char.features:
-            actions.append(TurnAction(kind="martial_arts_strike"))
+            actions.append(turn_action("martial_arts_strike"))
         elif "martial_arts" in char.features:
             # Fallback if no focus points
-            actions.append(TurnAction(kind="martial_arts_strike"))
+            actions.append(turn_action("martial_arts_strike"))
 
         # --- Rogue: Cunning Action Hide for Sneak Attack advantage ---
         if "cunning_action" in char.features and in_melee and "fast_hands" not in char.features and "steady_aim" not in char.features:
             # In aggressive mode, prefer hiding for sneak attack advantage
-            actions.append(TurnAction(kind="cunning_hide"))
+            actions.append(turn_action("cunning_hide"))
 
         # --- Action Surge ---
         if "action_surge" in char.features:
             res = char.resources.get("action_surge")
-            if res and res.available:
-                actions.append(TurnAction(kind="action_surge"))
+            if res and res.available and state.round_number >= self.params.action_surge_round:
+                actions.append(turn_action("action_surge"))
 
         # --- Second Wind when hurt ---
         if "second_wind" in char.features:
             res = char.resources.get("second_wind")
             if res and res.available:
                 hp_pct = char.current_hp / char.max_hp
-                if hp_pct < 0.5:
-                    actions.append(TurnAction(kind="second_wind"))
+                if hp_pct < self.second_wind_hp():
+                    actions.append(turn_action("second_wind"))
 
         return actions
 
     def _defensive(
         self, char: Character, opponent: Character,
-        state: CombatState, distance: int, in_melee: bool, has_ranged: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
 
@@ -319,49 +470,43 @@ class PriorityTactics(TacticsEngine):
         ):
             res = char.resources.get("rage")
             if res and res.available:
-                actions.append(TurnAction(kind="rage"))
+                actions.append(turn_action("rage"))
 
         # --- Second Wind when hurt (priority in defensive) ---
         if "second_wind" in char.features:
             res = char.resources.get("second_wind")
             if res and res.available:
                 hp_pct = char.current_hp / char.max_hp
-                if hp_pct < 0.6:
-                    actions.append(TurnAction(kind="second_wind"))
+                if hp_pct < self.second_wind_hp():
+                    actions.append(turn_action("second_wind"))
 
         # --- Monk: Patient Defense when hurt ---
         if "patient_defense" in char.features:
             res = char.resources.get("focus_points")
             hp_pct = char.current_hp / char.max_hp
             if res and res.available and hp_pct < 0.5:
-                actions.append(TurnAction(kind="patient_defense"))
+                actions.append(turn_action("patient_defense"))
 
         # --- Ranged attack if not in melee ---
-        if not in_melee and has_ranged:
-            rw = char.best_ranged_weapon()
-            if rw:
-                actions.append(TurnAction(kind="ranged_attack", weapon=rw.name))
+        if not in_melee and loadout.ranged:
+            actions.append(loadout.ranged_attack)
 
         # --- Move toward opponent ---
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # --- Melee attack ---
-        mw = char.best_melee_weapon()
-        if mw:
-            actions.append(TurnAction(kind="attack", weapon=mw.name))
-        else:
-            actions.append(TurnAction(kind="attack"))
+        actions.append(loadout.best_melee_attack)
 
         # --- Reckless Attack (only in defensive if no other option) ---
         if "reckless_attack" in char.features and in_melee:
-            actions.append(TurnAction(kind="reckless"))
+            actions.append(turn_action("reckless"))
 
         # --- Action Surge ---
         if "action_surge" in char.features:
             res = char.resources.get("action_surge")
-            if res and res.available:
-                actions.append(TurnAction(kind="action_surge"))
+            if res and res.available and state.round_number >= self.params.action_surge_round:
+                actions.append(turn_action("action_surge"))
 
         return actions
 
@@ -370,62 +515,60 @@ class PriorityTactics(TacticsEngine):
 
     def _bladesinger_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
         spells = char.spells_known
 
         # BA: activate Bladesong if not active
         if not any(e.name == "Bladesong" for e in char.active_effects):
-            actions.append(TurnAction(kind="bladesong"))
+            actions.append(turn_action("bladesong"))
 
         # Spiritual Weapon attack if active
         if any(e.name == "SpiritualWeapon" for e in char.active_effects):
-            actions.append(TurnAction(kind="spiritual_weapon_attack"))
+            actions.append(turn_action("spiritual_weapon_attack"))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Spell priority: L7+ high slots first
         if char.level >= 7:
             if char.has_spell_slot(7) and "finger_of_death" in spells:
-                actions.append(TurnAction(kind="cast_spell", extra={"spell": "finger_of_death", "slot_level": 7}))
+                actions.append(cast_action("finger_of_death", 7))
                 return actions
             if char.has_spell_slot(6) and "disintegrate" in spells:
-                actions.append(TurnAction(kind="cast_spell", extra={"spell": "disintegrate", "slot_level": 6}))
+                actions.append(cast_action("disintegrate", 6))
                 return actions
 
         if char.has_spell_slot(5) and "hold_monster" in spells and not char.is_concentrating():
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "hold_monster", "slot_level": 5}))
+            actions.append(cast_action("hold_monster", 5))
             return actions
         if char.has_spell_slot(4) and "polymorph" in spells and not char.is_concentrating():
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "polymorph", "slot_level": 4}))
+            actions.append(cast_action("polymorph", 4))
             return actions
         if char.has_spell_slot(3) and "fireball" in spells:
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "fireball", "slot_level": 3}))
+            actions.append(cast_action("fireball", 3))
             return actions
 
         # Cantrip fallback
         cantrip = _pick_cantrip_action(char)
         if cantrip:
             actions.append(cantrip)
-        elif in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
+        elif in_melee and loadout.melee:
+            actions.append(loadout.melee_attack)
 
         return actions
 
     def _eldritch_knight_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # L7+: cantrip then War Magic bonus attack
         if char.level >= 7 and "war_magic" in char.features:
@@ -434,7 +577,7 @@ class PriorityTactics(TacticsEngine):
             if cantrip:
                 actions.append(cantrip)
                 # War Magic bonus attack will fire via war_magic_attack handler
-                actions.append(TurnAction(kind="war_magic_attack"))
+                actions.append(turn_action("war_magic_attack"))
                 return actions
 
         # Fallback: use available spell slot
@@ -443,104 +586,92 @@ class PriorityTactics(TacticsEngine):
             pass
 
         # Normal melee attack
-        mw = _pick_melee_weapon(char)
-        if in_melee and mw:
-            actions.append(TurnAction(kind="attack", weapon=mw.name))
-        elif in_melee:
-            actions.append(TurnAction(kind="attack"))
+        if in_melee:
+            actions.append(loadout.melee_attack)
 
         # Action Surge
         if "action_surge" in char.features:
             res = char.resources.get("action_surge")
-            if res and res.available:
-                actions.append(TurnAction(kind="action_surge"))
+            if res and res.available and state.round_number >= self.params.action_surge_round:
+                actions.append(turn_action("action_surge"))
 
         return actions
 
     def _hexblade_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
         spells = char.spells_known
 
         # BA: apply hexblade curse if not yet applied
         if char.hexblade_curse_target is None and "hexblade_curse" in char.features:
-            actions.append(TurnAction(kind="hexblade_curse"))
+            actions.append(turn_action("hexblade_curse"))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Power Word Kill if target ≤ 100 HP and have L9 slot
         if char.has_spell_slot(9) and "power_word_kill" in spells and opponent.current_hp <= 100:
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "power_word_kill", "slot_level": 9}))
+            actions.append(cast_action("power_word_kill", 9))
             return actions
 
         # Hold Monster / Finger of Death
         if char.has_spell_slot(5) and "hold_monster" in spells and not char.is_concentrating():
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "hold_monster", "slot_level": 5}))
+            actions.append(cast_action("hold_monster", 5))
             return actions
         if char.has_spell_slot(7) and "finger_of_death" in spells:
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "finger_of_death", "slot_level": 7}))
+            actions.append(cast_action("finger_of_death", 7))
             return actions
 
         # Hex bonus action
         if "hex" in char.features and not char.is_concentrating():
             slot = char.highest_available_spell_slot()
             if slot:
-                actions.append(TurnAction(kind="hex"))
+                actions.append(turn_action("hex"))
 
         # Melee weapon attack (CHA-based via hexblade_armor)
         if in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
+            actions.append(loadout.melee_attack)
         else:
             # Eldritch Blast at range
             if "eldritch_blast" in char.features:
-                actions.append(TurnAction(kind="eldritch_blast"))
+                actions.append(turn_action("eldritch_blast"))
 
         return actions
 
     def _assassin_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
 
         # Round 1: Steady Aim for advantage (assassinate auto-crit is set by engine)
         if state.round_number == 1 and not char.assassin_surprised_this_combat:
             if "steady_aim" in char.features:
-                actions.append(TurnAction(kind="steady_aim"))
+                actions.append(turn_action("steady_aim"))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         if in_melee or state.distance <= 5:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
+            actions.append(loadout.melee_attack)
         else:
             # Ranged sneak attack
-            rw = char.best_ranged_weapon()
-            if rw:
-                actions.append(TurnAction(kind="ranged_attack", weapon=rw.name))
+            if loadout.ranged:
+                actions.append(loadout.ranged_attack)
 
         # Cunning Action Hide for Sneak Attack advantage next turn
         if "cunning_action" in char.features:
-            actions.append(TurnAction(kind="cunning_hide"))
+            actions.append(turn_action("cunning_hide"))
 
         return actions
 
     def _gloom_stalker_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool, has_ranged: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
 
@@ -548,29 +679,23 @@ class PriorityTactics(TacticsEngine):
         if "hunters_mark" in char.features and not char.hunters_mark_active:
             res = char.resources.get("hunters_mark")
             if res and res.available:
-                actions.append(TurnAction(kind="hunters_mark"))
+                actions.append(turn_action("hunters_mark"))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Main attack (Dread Ambusher handled in _do_melee_attack)
         if in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
-        elif has_ranged:
-            rw = char.best_ranged_weapon()
-            if rw:
-                actions.append(TurnAction(kind="ranged_attack", weapon=rw.name))
+            actions.append(loadout.melee_attack)
+        elif loadout.ranged:
+            actions.append(loadout.ranged_attack)
 
         return actions
 
     def _swords_bard_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
         spells = char.spells_known
@@ -582,82 +707,74 @@ class PriorityTactics(TacticsEngine):
             and not char.is_concentrating()
             and Condition.INCAPACITATED not in opponent.conditions
         ):
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "hypnotic_pattern", "slot_level": 3}))
+            actions.append(cast_action("hypnotic_pattern", 3))
             return actions
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Blade Flourish before attacking (defensive)
         if (
             "blade_flourish" in char.features
             and not char._blade_flourish_used_this_turn
         ):
-            actions.append(TurnAction(kind="blade_flourish"))
+            actions.append(turn_action("blade_flourish"))
 
         # Melee attack
         if in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
+            actions.append(loadout.melee_attack)
 
         return actions
 
     def _devotion_paladin_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
 
         # BA round 1: Sacred Weapon
         if "sacred_weapon" in char.features and not any(e.name == "SacredWeapon" for e in char.active_effects):
-            actions.append(TurnAction(kind="sacred_weapon"))
+            actions.append(turn_action("sacred_weapon"))
 
         # Vow of Enmity if available
         if "vow_of_enmity" in char.features and not char.vow_of_enmity_active:
             res = char.resources.get("channel_divinity")
             if res and res.available and not char.bonus_action_used:
-                actions.append(TurnAction(kind="vow_of_enmity"))
+                actions.append(turn_action("vow_of_enmity"))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Melee attack
         if in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
+            actions.append(loadout.melee_attack)
 
         # Action Surge
         if "action_surge" in char.features:
             res = char.resources.get("action_surge")
-            if res and res.available:
-                actions.append(TurnAction(kind="action_surge"))
+            if res and res.available and state.round_number >= self.params.action_surge_round:
+                actions.append(turn_action("action_surge"))
 
         # Second Wind if hurt
         if "second_wind" in char.features:
             res = char.resources.get("second_wind")
-            if res and res.available and char.current_hp / char.max_hp < 0.5:
-                actions.append(TurnAction(kind="second_wind"))
+            if res and res.available and char.current_hp / char.max_hp < self.second_wind_hp():
+                actions.append(turn_action("second_wind"))
 
         return actions
 
     def _forge_cleric_tactics(
         self, char: Character, opponent: Character,
-        state: CombatState, in_melee: bool,
+        state: CombatState, in_melee: bool, loadout: Loadout,
     ) -> list[TurnAction]:
         actions: list[TurnAction] = []
         spells = char.spells_known
 
         # Spiritual Weapon attack if active
         if any(e.name == "SpiritualWeapon" for e in char.active_effects):
-            actions.append(TurnAction(kind="spiritual_weapon_attack"))
+            actions.append(turn_action("spiritual_weapon_attack"))
 
         # Spirit Guardians if available
         if (
@@ -665,7 +782,7 @@ class PriorityTactics(TacticsEngine):
             and "spirit_guardians" in spells
             and not char.is_concentrating("spirit_guardians")
         ):
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "spirit_guardians", "slot_level": 3}))
+            actions.append(cast_action("spirit_guardians", 3))
             return actions
 
         # Spiritual Weapon as bonus action if not active
@@ -674,19 +791,15 @@ class PriorityTactics(TacticsEngine):
             and "spiritual_weapon" in spells
             and not any(e.name == "SpiritualWeapon" for e in char.active_effects)
         ):
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "spiritual_weapon", "slot_level": 2}))
+            actions.append(cast_action("spiritual_weapon", 2))
 
         # Move if needed
         if not in_melee:
-            actions.append(TurnAction(kind="move"))
+            actions.append(turn_action("move"))
 
         # Weapon attack (+1 from Blessing of the Forge)
         if in_melee:
-            mw = _pick_melee_weapon(char)
-            if mw:
-                actions.append(TurnAction(kind="attack", weapon=mw.name))
-            else:
-                actions.append(TurnAction(kind="attack"))
+            actions.append(loadout.melee_attack)
         else:
             cantrip = _pick_cantrip_action(char)
             if cantrip:
@@ -696,134 +809,48 @@ class PriorityTactics(TacticsEngine):
         if (
             char.has_spell_slot(1)
             and "healing_word" in spells
-            and char.current_hp < char.max_hp * 0.5
+            and char.current_hp < char.max_hp * self.params.heal_hp
             and not char.bonus_action_used
         ):
-            actions.append(TurnAction(kind="cast_spell", extra={"spell": "healing_word", "slot_level": 1}))
+            actions.append(cast_action("healing_word", 1))
 
         return actions
 
 
-def _pick_spell_action(char: Character, opponent: Character | None = None) -> TurnAction | None:
-    """Pick the best spell to cast. Returns TurnAction or None if no spells available."""
+def _pick_spell_action(
+    char: Character, opponent: Character | None = None, table: SpellTable | None = None,
+    *, heal_hp: float = 0.5,
+) -> TurnAction | None:
+    """Pick the best spell to cast. Returns TurnAction or None if no spells available.
+
+    Healing, the druid's and the cleric's set-up spells come first; every
+    other levelled spell is chosen from *table*, the caster's expected-value
+    table against *opponent* (see sim.spellvalue), falling back to a cantrip.
+    """
     spells = char.spells_known
 
     if (
         "healing_word" in spells
-        and char.current_hp < char.max_hp * 0.5
+        and char.current_hp < char.max_hp * heal_hp
         and char.has_spell_slot(1)
         and not char.bonus_action_used
     ):
-        return TurnAction(kind="cast_spell", extra={"spell": "healing_word", "slot_level": 1})
+        return cast_action("healing_word", 1)
 
     if char.class_name == "druid":
         return _pick_druid_primary_spell_action(char)
 
     if char.class_name == "cleric":
         if char.has_spell_slot(3) and "spirit_guardians" in spells and not char.is_concentrating("spirit_guardians"):
-            return TurnAction(kind="cast_spell", extra={"spell": "spirit_guardians", "slot_level": 3})
+            return cast_action("spirit_guardians", 3)
 
         spiritual_weapon_active = any(e.name == "SpiritualWeapon" for e in char.active_effects)
         if char.has_spell_slot(2) and "spiritual_weapon" in spells and not spiritual_weapon_active:
-            return TurnAction(kind="cast_spell", extra={"spell": "spiritual_weapon", "slot_level": 2})
-
-        if char.has_spell_slot(2) and "scorching_ray" in spells:
-            return TurnAction(kind="cast_spell", extra={"spell": "scorching_ray", "slot_level": 2})
-
-        if char.has_spell_slot(1):
-            if "guiding_bolt" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "guiding_bolt", "slot_level": 1})
-            if "chromatic_orb" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "chromatic_orb", "slot_level": 1})
-            if "magic_missile" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "magic_missile", "slot_level": 1})
+            return cast_action("spiritual_weapon", 2)
 
-        return _pick_cantrip_action(char)
-
-    if char.class_name == "bard":
-        if (
-            char.has_spell_slot(3)
-            and "hypnotic_pattern" in spells
-            and not char.is_concentrating()
-            and not (opponent and Condition.INCAPACITATED in opponent.conditions)
-        ):
-            return TurnAction(kind="cast_spell", extra={"spell": "hypnotic_pattern", "slot_level": 3})
-
-        if char.has_spell_slot(2):
-            if "scorching_ray" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "scorching_ray", "slot_level": 2})
-            if "dissonant_whispers" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "dissonant_whispers", "slot_level": 2})
-
-        if char.has_spell_slot(1):
-            if "dissonant_whispers" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "dissonant_whispers", "slot_level": 1})
-            if "chromatic_orb" in spells:
-                return TurnAction(kind="cast_spell", extra={"spell": "chromatic_orb", "slot_level": 1})
-
-        return _pick_cantrip_action(char)
-
-    # L9 spells
-    if char.has_spell_slot(9) and "power_word_kill" in spells and opponent and opponent.current_hp <= 100:
-        return TurnAction(kind="cast_spell", extra={"spell": "power_word_kill", "slot_level": 9})
-    if char.has_spell_slot(9) and "time_stop" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "time_stop", "slot_level": 9})
-    if char.has_spell_slot(9) and "wish" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "wish", "slot_level": 9})
-    if char.has_spell_slot(9) and "meteor_swarm" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "meteor_swarm", "slot_level": 9})
-
-    # L8 spells
-    if char.has_spell_slot(8) and "power_word_stun" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "power_word_stun", "slot_level": 8})
-    if char.has_spell_slot(8) and "abi_dalzims_horrid_wilting" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "abi_dalzims_horrid_wilting", "slot_level": 8})
-
-    # L7 spells
-    if char.has_spell_slot(7) and "power_word_pain" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "power_word_pain", "slot_level": 7})
-    if char.has_spell_slot(7) and "finger_of_death" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "finger_of_death", "slot_level": 7})
-
-    # L6 spells
-    if char.has_spell_slot(6) and "disintegrate" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "disintegrate", "slot_level": 6})
-    if char.has_spell_slot(6) and "harm" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "harm", "slot_level": 6})
-    if char.has_spell_slot(6) and "chain_lightning" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "chain_lightning", "slot_level": 6})
-    if char.has_spell_slot(6) and "sunbeam" in spells and not char.is_concentrating():
-        return TurnAction(kind="cast_spell", extra={"spell": "sunbeam", "slot_level": 6})
-
-    # L5 spells
-    if char.has_spell_slot(5) and "hold_monster" in spells and not char.is_concentrating():
-        return TurnAction(kind="cast_spell", extra={"spell": "hold_monster", "slot_level": 5})
-    if char.has_spell_slot(5) and "cone_of_cold" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "cone_of_cold", "slot_level": 5})
-    if char.has_spell_slot(5) and "synaptic_static" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "synaptic_static", "slot_level": 5})
-
-    # L4 spells
-    if char.has_spell_slot(4) and "banishment" in spells and not char.is_concentrating():
-        return TurnAction(kind="cast_spell", extra={"spell": "banishment", "slot_level": 4})
-    if char.has_spell_slot(4) and "greater_invisibility" in spells and Condition.GREATER_INVISIBLE not in char.conditions:
-        return TurnAction(kind="cast_spell", extra={"spell": "greater_invisibility", "slot_level": 4})
-    if char.has_spell_slot(4) and "polymorph" in spells and not char.is_concentrating():
-        return TurnAction(kind="cast_spell", extra={"spell": "polymorph", "slot_level": 4})
-    if char.has_spell_slot(4) and "blight" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "blight", "slot_level": 4})
-
-    if char.has_spell_slot(3) and "fireball" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "fireball", "slot_level": 3})
-
-    if char.has_spell_slot(2) and "scorching_ray" in spells:
-        return TurnAction(kind="cast_spell", extra={"spell": "scorching_ray", "slot_level": 2})
-
-    if char.has_spell_slot(1):
-        if "chromatic_orb" in spells:
-            return TurnAction(kind="cast_spell", extra={"spell": "chromatic_orb", "slot_level": 1})
-        if "magic_missile" in spells:
-            return TurnAction(kind="cast_spell", extra={"spell": "magic_missile", "slot_level": 1})
+    option = (table or SpellTable(char)).best(opponent)
+    if option is not None:
+        return cast_action(option.spell, option.slot)
 
     return _pick_cantrip_action(char)
 
@@ -834,7 +861,7 @@ def _pick_cantrip_action(char: Character) -> TurnAction | None:
         cantrip_order = ["vicious_mockery", "fire_bolt"]
     for cantrip in cantrip_order:
         if cantrip in char.spells_known:
-            return TurnAction(kind="cast_spell", extra={"spell": cantrip, "slot_level": 0})
+            return cast_action(cantrip, 0)
     return None
 
 
@@ -842,16 +869,16 @@ def _pick_druid_primary_spell_action(char: Character) -> TurnAction | None:
     spells = char.spells_known
 
     if char.is_concentrating("call_lightning"):
-        return TurnAction(kind="call_lightning_bolt")
+        return turn_action("call_lightning_bolt")
 
     if char.has_spell_slot(3) and "call_lightning" in spells and not char.is_concentrating():
-        return TurnAction(kind="cast_spell", extra={"spell": "call_lightning", "slot_level": 3})
+        return cast_action("call_lightning", 3)
 
     if "thunderwave" in spells:
         if char.has_spell_slot(2):
-            return TurnAction(kind="cast_spell", extra={"spell": "thunderwave", "slot_level": 2})
+            return cast_action("thunderwave", 2)
         if char.has_spell_slot(1):
-            return TurnAction(kind="cast_spell", extra={"spell": "thunderwave", "slot_level": 1})
+            return cast_action("thunderwave", 1)
 
     return _pick_cantrip_action(char)
 
@@ -873,6 +900,34 @@ def _pick_melee_weapon(char: Character):
     return max(melee, key=lambda w: w.damage_dice, default=None)
 
 
-def load_tactics(name: str) -> TacticsEngine:
-    """Load a tactics engine by name."""
+def load_tactics(name: str | TacticsEngine) -> TacticsEngine:
+    """Load a tactics engine by name, or from a tactics file.
+
+    The built-ins ("aggressive", "defensive") are the hand-tuned engines
+    above; their YAML files in tactics/priority/ summarise only the generic
+    part and can be run as rules by passing the file path.  Any other name
+    is loaded from tactics/priority/<name>.yaml, and a path to a .yaml file
+    directly: a file with a ``base`` is a built-in with tuned params (see
+    TacticParams), any other is compiled as rules (see sim.rules).
+    "mcts" (or "mcts:<budget>") is the search engine in sim.mcts.  An
+    engine instance is returned as it is.
+    """
+    if isinstance(name, TacticsEngine):
+        return name
+    if name == "mcts" or name.startswith("mcts:"):
+        from sim.mcts import MCTSTactics
+        return MCTSTactics.from_name(name)
+    if name.endswith((".yaml", ".yml")):
+        return _load_tactics_file(Path(name))
+    if name not in BUILTIN_TACTICS and (TACTICS_DIR / f"{name}.yaml").exists():
+        return _load_tactics_file(TACTICS_DIR / f"{name}.yaml")
     return PriorityTactics(name=name)
+
+
+def _load_tactics_file(path: Path) -> TacticsEngine:
+    from sim.rules import RuleTactics
+
+    raw = yaml.safe_load(path.read_text()) or {}
+    if "base" in raw:
+        return PriorityTactics.from_dict(raw, str(path))
+    return RuleTactics.from_dict(raw, str(path))
@@ -0,0 +1,185 @@
+"""Successive-halving tuner for the built-in tactics' thresholds.
+
+The built-in plans hard-code a few guesses — Second Wind below half HP
+(defensive: 60%), Action Surge on the first turn it helps, every maneuver
+the build knows — that are now TacticParams.  The defensive plan reads
+only some of them (PLAN_PARAMS), so its space is smaller.  ``dnd-sim tune`` searches them for one build:
+
+1. sample up to *count* settings from the build's parameter space (the
+   hand-tuned defaults are always one of them);
+2. play every candidate against every opponent for *n0* fights — a cheap
+   screen that only has to catch the bad settings;
+3. keep the best 1/*eta*, multiply the fights by *eta* and play again,
+   until one candidate is left or the next rung would exceed *max_n*.
+
+Most of the fights go to the few settings still in contention.  At each
+rung every candidate meets an opponent on the same seeded dice (common
+random numbers), so candidates are compared on identical luck rather than
+through the noise of independent runs.  Matchups are spread over a worker
+pool exactly as ``rank --workers`` spreads chunks.
+
+The winner is written as a tactics file — ``{base, params}`` — that
+``--tactic1`` accepts by path, or by name from tactics/priority/.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import yaml
+
+from sim.ladder import chunk_seed, make_executor
+from sim.runner import run_matchup
+from sim.tactics import PriorityTactics, TacticParams
+
+if TYPE_CHECKING:
+    from sim.models import Character
+
+# Values tried for each parameter the build can use.
+SPACE: dict[str, tuple] = {
+    "second_wind_hp": (0.25, 0.35, 0.5, 0.65, 0.8),
+    "heal_hp": (0.3, 0.4, 0.5, 0.6, 0.7),
+    "adrenaline_hp": (0.3, 0.5, 0.7, 1.01),
+    "action_surge_round": (1, 2, 3),
+}
+
+
+# The params each built-in plan reads (aggressive reads them all).
+PLAN_PARAMS: dict[str, frozenset[str]] = {
+    "defensive": frozenset({"second_wind_hp", "action_surge_round", "maneuvers"}),
+}
+
+
+def parameter_space(char: "Character", base: str = "aggressive") -> dict[str, tuple]:
+    """The parameters that change *char*'s play under *base*, with the values to try."""
+    space: dict[str, tuple] = {}
+    if "second_wind" in char.features:
+        space["second_wind_hp"] = SPACE["second_wind_hp"]
+    if "healing_word" in char.spells_known:
+        space["heal_hp"] = SPACE["heal_hp"]
+    if "adrenaline_rush" in char.species_traits:
+        space["adrenaline_hp"] = SPACE["adrenaline_hp"]
+    if "action_surge" in char.features:
+        space["action_surge_round"] = SPACE["action_surge_round"]
+    if char.maneuvers:
+        space["maneuvers"] = tuple(
+            combo for size in range(1, len(char.maneuvers) + 1)
+            for combo in itertools.combinations(char.maneuvers, size))
+    if base in PLAN_PARAMS:
+        space = {name: values for name, values in space.items() if name in PLAN_PARAMS[base]}
+    return space
+
+
+def parse_param(text: str, base: str = "aggressive") -> tuple[str, tuple]:
+    """'second_wind_hp=0.3,0.5' -> ('second_wind_hp', (0.3, 0.5))."""
+    name, sep, values = text.partition("=")
+    name = name.strip()
+    names = [n for n in SPACE if base not in PLAN_PARAMS or n in PLAN_PARAMS[base]]
+    if not sep or name not in names:
+        raise ValueError(f"bad --param {text!r}: use NAME=V1,V2,... with NAME one of "
+                         f"{', '.join(names)}")
+    cast = int if name == "action_surge_round" else float
+    return name, tuple(cast(v) for v in values.split(","))
+
+
+def sample_candidates(space: dict[str, tuple], count: int, seed: int | None = None) -> list[TacticParams]:
+    """Up to *count* distinct settings from the grid, the defaults first."""
+    default = TacticParams()
+    names = list(space)
+    grid = [TacticParams(**dict(zip(names, values)))
+            for values in itertools.product(*(space[n] for n in names))]
+    others = [p for p in grid if p != default]
+    rng = random.Random(seed)
+    return [default] + rng.sample(others, min(len(others), max(0, count - 1)))
+
+
+@dataclass
+class Rung:
+    """One round of the halving: every surviving candidate at *n* fights per opponent."""
+    n: int
+    scores: list[tuple[TacticParams, float]]    # best first; mean score over opponents
+
+
+def _score(
+    template_a: "Character", template_b: "Character", n: int,
+    tactic: PriorityTactics, opponent_tactic: str, seed: int,
+) -> float:
+    result = run_matchup(template_a, template_b, n, tactic, opponent_tactic, seed=seed)
+    return (result["combatant_a"]["wins"] + 0.5 * result["draws"]) / n
+
+
+def successive_halving(
+    build: str,
+    templates: dict[str, "Character"],
+    opponents: list[str],
+    candidates: list[TacticParams],
+    *,
+    base: str = "aggressive",
+    opponent_tactic: str = "aggressive",
+    n0: int = 20,
+    eta: int = 3,
+    max_n: int = 2000,
+    seed: int | None = None,
+    workers: int = 1,
+    backend: str = "processes",
+    on_rung: Callable[[Rung], None] | None = None,
+) -> list[Rung]:
+    """Tune *build*'s params against *opponents*; the last rung's first entry wins.
+
+    A score is wins (draws count half) per fight against the opponent pool,
+    averaged over opponents.
+    """
+    if not candidates or not opponents:
+        raise ValueError("need at least one candidate and one opponent")
+    if seed is None:
+        seed = random.getrandbits(31)
+    pool = make_executor(workers, backend) if workers > 1 else None
+    rungs: list[Rung] = []
+    survivors, n = list(candidates), n0
+    try:
+        while True:
+            jobs = [(params, opp, (templates[build], templates[opp], n,
+                                   PriorityTactics(base, params=params), opponent_tactic,
+                                   chunk_seed(seed, build, opp, len(rungs))))
+                    for params in survivors for opp in opponents]
+            if pool is None:
+                results = [_score(*args) for _, _, args in jobs]
+            else:
+                results = [f.result() for f in [pool.submit(_score, *args) for _, _, args in jobs]]
+
+            totals = {params: 0.0 for params in survivors}
+            for (params, _, _), score in zip(jobs, results):
+                totals[params] += score / len(opponents)
+            # Stable sort: ties keep the earlier candidate, so the defaults win ties.
+            rung = Rung(n, sorted(totals.items(), key=lambda item: -item[1]))
+            rungs.append(rung)
+            if on_rung is not None:
+                on_rung(rung)
+            if len(survivors) == 1 or n * eta > max_n:
+                return rungs
+            survivors = [params for params, _ in rung.scores[:max(1, len(survivors) // eta)]]
+            n *= eta
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def write_tactics(
+    path: str | Path, build: str, base: str, rungs: list[Rung], opponents: list[str],
+) -> Path:
+    """Write the winning params as a tactics file; returns its path."""
+    path = Path(path)
+    best, score = rungs[-1].scores[0]
+    default_score = next((s for p, s in rungs[0].scores if p == TacticParams()), None)
+    header = [f"# Tuned for {build} by 'dnd-sim tune' against {len(opponents)} opponents.",
+              f"# Score {score:.3f} at n={rungs[-1].n} per opponent"]
+    if default_score is not None:
+        header.append(f"# (defaults scored {default_score:.3f} at n={rungs[0].n}).")
+    body = {"name": path.stem, "base": base, "params": best.to_dict()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(header) + "\n" + yaml.safe_dump(body, sort_keys=False))
+    return path
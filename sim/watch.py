@@ -0,0 +1,142 @@
+"""Watch data/ for edits and work out which builds they affect.
+
+Used by ``rank --watch``: rather than re-running the whole ladder after every
+save, each change is mapped to the builds that actually depend on it —
+
+  * data/builds/<name>.yaml             → that build
+  * weapons / species / armor / backgrounds.yaml
+                                        → builds using an entry whose content
+                                          changed (diffed key by key)
+  * data/classes/<class>.yaml           → every build of that class
+  * data/spells/<spell>.yaml            → every build with the spell known
+  * anything else under data/           → every build (conservative)
+
+and only matchups involving those builds are re-simulated.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from sim import loader
+from sim.spells import reload_spell_registry
+
+# Multi-entry data files → the build field that names an entry in them.
+_KEYED_FILES = {
+    "weapons.yaml": "weapons",
+    "species.yaml": "species",
+    "armor.yaml": "armor",
+    "backgrounds.yaml": "background",
+}
+
+
+def _load_yaml(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def build_dependencies(raw: dict) -> set[tuple[str, str]]:
+    """(kind, key) data entries a raw build YAML dict depends on."""
+    deps = {
+        ("class", raw.get("class", "")),
+        ("species", raw.get("species", "")),
+        ("armor", raw.get("armor", "unarmored")),
+        ("background", raw.get("background", "")),
+    }
+    deps.update(("weapons", w) for w in raw.get("weapons", []))
+    deps.update(("spells", s) for s in raw.get("spells_known", []))
+    return deps
+
+
+@dataclass
+class DataChange:
+    """Everything that changed between two polls of the data directory."""
+    paths: list[Path] = field(default_factory=list)
+    builds: set[str] = field(default_factory=set)           # build files touched
+    keys: set[tuple[str, str]] = field(default_factory=set)  # (kind, key) entries changed
+    data_files: set[str] = field(default_factory=set)        # loader cache entries to drop
+    spells: bool = False
+    everything: bool = False
+
+    def affected(self, raw_builds: dict[str, dict]) -> set[str]:
+        """Names in *raw_builds* whose simulation may differ after this change."""
+        if self.everything:
+            return set(raw_builds)
+        hit = {name for name in self.builds if name in raw_builds}
+        for name, raw in raw_builds.items():
+            if build_dependencies(raw) & self.keys:
+                hit.add(name)
+        return hit
+
+    def apply(self) -> None:
+        """Drop stale loader caches and reload spells so new loads see the edit."""
+        for filename in self.data_files:
+            loader._cache.pop(filename, None)
+        if self.spells:
+            reload_spell_registry()
+
+
+class DataWatcher:
+    """Polls YAML mtimes under a data directory (no inotify dependency)."""
+
+    def __init__(self, data_dir: str | Path = loader._DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self._stamps = self._scan()
+        self._contents = {
+            p: _load_yaml(p) for p in self._stamps if p.name in _KEYED_FILES
+        }
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        stamps = {}
+        for p in self.data_dir.rglob("*.yaml"):
+            rel = p.relative_to(self.data_dir)
+            if "archive" in rel.parts or rel.parts[0] == "reference":
+                continue
+            st = p.stat()
+            stamps[p] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def poll(self) -> DataChange | None:
+        """Return what changed since the last poll, or None.
+
+        Raises yaml.YAMLError for a half-saved keyed file; the previous
+        contents are kept, so the next successful save is diffed correctly.
+        """
+        stamps = self._scan()
+        changed = sorted(
+            p for p in stamps.keys() | self._stamps.keys()
+            if stamps.get(p) != self._stamps.get(p)
+        )
+        self._stamps = stamps
+        if not changed:
+            return None
+
+        change = DataChange(paths=changed)
+        for p in changed:
+            top = p.relative_to(self.data_dir).parts[0]
+            if top == "builds":
+                change.builds.add(p.stem)
+            elif p.name in _KEYED_FILES:
+                kind = _KEYED_FILES[p.name]
+                old = self._contents.get(p, {})
+                new = _load_yaml(p)
+                self._contents[p] = new
+                change.keys.update(
+                    (kind, k) for k in old.keys() | new.keys() if old.get(k) != new.get(k)
+                )
+                change.data_files.add(p.name)
+            elif top == "classes":
+                change.keys.add(("class", p.stem))
+                change.data_files.add(p.name)
+            elif top == "spells":
+                change.keys.add(("spells", p.stem))
+                change.spells = True
+            else:
+                change.everything = True
+                change.data_files.add(p.name)
+        return change
@@ -0,0 +1,67 @@
+"""Tests for the decision audit counters."""
+
+from sim import audit
+from sim.combat import _execute_plan
+from sim.fork import fork
+from sim.ladder import Ladder, MatchupTally, run_ladder
+from sim.loader import load_build_by_name
+from sim.models import CombatPhase, CombatState
+from sim.runner import run_matchup
+from sim.tactics import turn_action
+
+
+def _turn(a: str, b: str, phase: CombatPhase, distance: int):
+    first = load_build_by_name(a).deep_copy()
+    second = load_build_by_name(b).deep_copy()
+    first.audit = audit.new_counters()
+    state = CombatState(first, second, distance=distance, round_number=1, phase=phase,
+                        turn_order=[first, second])
+    first.start_turn()
+    return first, state
+
+
+def test_skipped_actions_are_filed_by_reason():
+    fighter, state = _turn("champion_gwf_orc_5", "lore_bard_human_5", CombatPhase.RANGED, 30)
+    melee = turn_action("attack", "Greatsword")
+    _execute_plan(fighter, state.combatant_b, (melee, turn_action("ranged_attack")), state)
+    rows = audit.rows(fighter.audit)
+    assert rows["attack"][audit.RANGED_PHASE] == 1
+    assert sum(rows["ranged_attack"]) == 1
+
+    fighter, state = _turn("champion_gwf_orc_5", "lore_bard_human_5", CombatPhase.MELEE, 5)
+    _execute_plan(fighter, state.combatant_b, (melee, melee), state)
+    assert audit.rows(fighter.audit)["attack"][audit.ACTION_USED] == 1
+
+
+def test_auditing_does_not_change_the_fights():
+    a = load_build_by_name("champion_gwf_orc_5")
+    b = load_build_by_name("evocation_wizard_human_5")
+    plain = run_matchup(a, b, 30, seed=3)
+    audited = run_matchup(a, b, 30, seed=3, audit=True)
+    assert plain["combatant_a"]["audit"] is None
+    for key in ("draws", "total_rounds", "total_rounds_sq"):
+        assert plain[key] == audited[key]
+    assert plain["combatant_a"]["wins"] == audited["combatant_a"]["wins"]
+    spells = audit.rows(audited["combatant_b"]["audit"])["cast_spell"]
+    assert spells[audit.EXECUTED] > 0
+
+
+def test_audit_totals_merge_across_workers_and_round_trip():
+    names = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "lore_bard_human_5"]
+    templates = {name: load_build_by_name(name) for name in names}
+    serial = run_ladder(Ladder(names, n=60, seed=5, chunk_size=20), templates, audit=True)
+    pooled = run_ladder(Ladder(names, n=60, seed=5, chunk_size=20), templates, audit=True,
+                        workers=2, backend="threads")
+    assert serial.audit_usage() == pooled.audit_usage()
+    assert serial.audit_usage()[names[0]][0] == 120
+
+    tally = serial.tally(names[0], names[1])
+    assert MatchupTally.from_dict(tally.to_dict()) == tally
+    assert tally.flipped().audit_a == tally.audit_b
+    assert run_ladder(Ladder(names, n=20, seed=5), templates).audit_usage() == {}
+
+
+def test_forks_are_not_audited():
+    fighter, state = _turn("champion_gwf_orc_5", "lore_bard_human_5", CombatPhase.MELEE, 5)
+    assert fork(state).combatant_a.audit is None
+    assert fighter.audit is not None
@@ -0,0 +1,65 @@
+"""Tests for batch experiment manifests."""
+
+import json
+
+import pytest
+
+from sim.batch import load_manifest, parse_acs, run_batch
+from sim.session import SimSession
+
+_MANIFEST = """
+defaults: {n: 40, seed: 3}
+output_dir: out
+jobs:
+  - name: rank_three
+    kind: rank
+    builds: [berserker_greatsword_orc_5, champion_gwf_orc_5, lore_bard_human_5]
+  - name: pair
+    kind: compare
+    builds: [lore_bard_human_5, champion_gwf_orc_5]
+  - name: dps
+    kind: dps
+    builds: [champion_gwf_orc_5]
+    ac: "15-17"
+    n: 50
+  - name: duel
+    kind: fight
+    builds: [champion_gwf_orc_5, lore_bard_human_5]
+"""
+
+
+def test_parse_acs():
+    assert parse_acs("14-17") == [14, 15, 16, 17]
+    assert parse_acs("14,18") == [14, 18]
+    assert parse_acs([15]) == [15]
+
+
+def test_manifest_validation(tmp_path):
+    path = tmp_path / "bad.yaml"
+    path.write_text("jobs:\n  - {name: x, kind: tournament, tags: [level5]}\n")
+    with pytest.raises(ValueError, match="kind must be one of"):
+        load_manifest(path)
+
+
+def test_batch_shares_matchups_between_jobs(tmp_path):
+    """The compare pair is already inside the rank job, so it is simulated once."""
+    path = tmp_path / "exp.yaml"
+    path.write_text(_MANIFEST)
+    jobs, out_dir = load_manifest(path)
+    assert out_dir == tmp_path / "out"
+    assert [job.n for job in jobs] == [40, 40, 50, 1]
+
+    with SimSession(workers=1, chunk_size=20) as session:
+        written = run_batch(session, jobs, out_dir)
+        stats = session.stats()
+
+    assert sorted(p.name for p in written) == ["dps.json", "duel.txt", "pair.json", "rank_three.json"]
+    # 3 rank matchups x 2 chunks + 3 DPR units; the compare pair adds nothing.
+    assert stats["simulated"] == 3 * 2 + 3
+
+    rank = json.loads((out_dir / "rank_three.json").read_text())
+    pair = json.loads((out_dir / "pair.json").read_text())["matchups"][0]
+    same = next(m for m in rank["matchups"] if {m["a"], m["b"]} == {pair["a"], pair["b"]})
+    assert pair["wins_a"] == same["wins_b"] and pair["wins_b"] == same["wins_a"]
+    assert list(json.loads((out_dir / "dps.json").read_text())["rows"][0]["dpr"]) == ["15", "16", "17"]
+    assert "Champion GWF Orc L5" in (out_dir / "duel.txt").read_text()
@@ -0,0 +1,80 @@
+"""Tests for time-budgeted ladders."""
+
+from dataclasses import replace
+
+from sim.budget import MatchupEstimate, priorities, run_budgeted, wilson_interval
+from sim.ladder import Ladder
+from sim.loader import load_build_by_name
+
+
+def _estimates(ladder, rows):
+    return {(a, b): MatchupEstimate(a, b, n, wins, n - wins, n / rate)
+            for (a, b), (n, wins, rate) in zip(ladder.matchups, rows)}
+
+
+def test_budget_goes_to_ambiguous_and_cheap_matchups():
+    ladder = Ladder(["a", "b", "c", "d"], n=10_000, seed=0, chunk_size=100)
+    # matchups: ab ac ad bc bd cd — a and b are neck and neck, the rest settled.
+    rows = [(200, 101, 1000), (200, 190, 1000), (200, 195, 1000),
+            (200, 185, 1000), (200, 190, 1000), (200, 120, 1000)]
+    est = _estimates(ladder, rows)
+    prio = priorities(ladder, est, {}, lambda key: est[key].seconds / est[key].n)
+    assert max(prio, key=prio.get) == ("a", "b")
+
+    # The same head-to-head at a fifth of the speed is worth less per second.
+    slow = {**est, ("a", "b"): MatchupEstimate("a", "b", 200, 101, 99, 1.0)}
+    slow_prio = priorities(ladder, slow, {}, lambda key: slow[key].seconds / slow[key].n)
+    assert slow_prio[("a", "b")] < prio[("a", "b")] / 4
+
+
+def test_run_stops_at_deadline_with_seeded_chunks(monkeypatch):
+    import sim.budget
+
+    # Real seeded chunks on a fake clock: 5ms a fight, however loaded the host.
+    now = [0.0]
+    timed_chunk = sim.budget._timed_chunk
+
+    def fake_time(templates, task):
+        now[0] += task.n * 0.005
+        return replace(timed_chunk(templates, task), seconds=task.n * 0.005)
+
+    monkeypatch.setattr(sim.budget, "_timed_chunk", fake_time)
+    names = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "lore_bard_human_5"]
+    templates = {name: load_build_by_name(name) for name in names}
+    ladder = Ladder(names, n=100_000, seed=4, chunk_size=20)
+    result = run_budgeted(ladder, templates, budget=1.0, clock=lambda: now[0])
+
+    assert result.elapsed <= 1.0 and not result.capped
+    assert result.fights > 1.0 / 0.005 - 20
+    assert all(m.n >= 20 for m in result.matchups)
+    assert result.fights == sum(m.n for m in result.matchups)
+    for m in result.matchups:
+        assert ladder.tally(m.a, m.b).wins_a == m.wins_a
+        assert sorted(ladder.chunks[(m.a, m.b)]) == list(range(m.n // 20))
+    lo, hi = wilson_interval(0, 20)
+    assert lo == 0.0 and 10 < hi < 20
+
+
+def test_chunks_that_fit_run_when_the_top_matchup_does_not(monkeypatch):
+    import sim.budget
+    from sim.ladder import ChunkResult, MatchupTally
+
+    # a vs b is a coin flip (top priority) but costs 1s a fight; the rest are
+    # lopsided and nearly free.  Time only passes as chunks report in.
+    now = [0.0]
+
+    def fake_chunk(templates, task):
+        slow = (task.a, task.b) == ("a", "b")
+        wins = task.n // 2 if slow else task.n
+        seconds = task.n * (1.0 if slow else 0.001)
+        now[0] += seconds
+        return ChunkResult(task, MatchupTally(task.n, wins, task.n - wins), 0, seconds)
+
+    monkeypatch.setattr(sim.budget, "_timed_chunk", fake_chunk)
+    ladder = Ladder(["a", "b", "c"], n=1_000, seed=0, chunk_size=10)
+    result = run_budgeted(ladder, {}, budget=25.0, clock=lambda: now[0])
+
+    by_key = {(m.a, m.b): m.n for m in result.matchups}
+    assert by_key[("a", "b")] == 20                  # a third chunk would overrun
+    assert by_key[("a", "c")] == by_key[("b", "c")] == 1_000
+    assert result.elapsed <= 25.0
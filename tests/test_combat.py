@@ -4,6 +4,7 @@ import random
 from sim.models import (
     AbilityScores,
     Character,
+    CombatPhase,
     CombatState,
     DamageType,
     MasteryProperty,
@@ -201,6 +202,24 @@ def test_warlock_aggressive_tactics_prioritize_hex_and_eldritch_blast():
     assert action_kinds.index("hex") < action_kinds.index("adrenaline_rush")
 
 
+def test_bound_tactics_resolve_weapons_once(monkeypatch):
+    ranger = load_build_by_name("gloom_stalker_ranger_human_5").deep_copy()
+    target = _make_combatant("Dummy", ac=15, hp=55)
+    state = CombatState(combatant_a=ranger, combatant_b=target)
+    decide = PriorityTactics(name="aggressive").bind(ranger)
+
+    def resolved_at_bind(*args):
+        raise AssertionError("weapon choice re-derived during a turn")
+
+    monkeypatch.setattr(Character, "best_ranged_weapon", resolved_at_bind)
+    monkeypatch.setattr(Character, "best_melee_weapon", resolved_at_bind)
+    ranged_turn = [a.kind for a in decide(state)]
+    state.distance, state.phase = 5, CombatPhase.MELEE
+    melee_turn = [a for a in decide(state) if a.kind == "attack"]
+    assert "ranged_attack" in ranged_turn or "move" in ranged_turn
+    assert melee_turn and melee_turn[0].weapon is not None
+
+
 def test_hex_uses_highest_available_pact_slot():
     warlock = Character(
         name="Warlock",
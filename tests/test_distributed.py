@@ -0,0 +1,46 @@
+"""Tests for the TCP coordinator and pull-based workers."""
+
+import pytest
+
+from sim.distributed import Coordinator, spawn_local_workers
+from sim.ladder import Ladder, MatchupTally, run_ladder
+from sim.loader import load_build_by_name
+
+_NAMES = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "lore_bard_human_5"]
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return {name: load_build_by_name(name) for name in _NAMES}
+
+
+def test_local_broker_matches_single_node(templates):
+    single = run_ladder(Ladder(_NAMES, n=60, seed=11, chunk_size=20), templates)
+
+    ladder = Ladder(_NAMES, n=60, seed=11, chunk_size=20)
+    with Coordinator(ladder, port=0) as coordinator:
+        procs = spawn_local_workers(coordinator.address, 2)
+        assert coordinator.wait(timeout=60)
+        for p in procs:
+            p.join(timeout=10)
+    assert ladder.to_dict() == single.to_dict()
+
+
+def test_expired_lease_is_reissued_and_duplicates_ignored():
+    ladder = Ladder(_NAMES[:2], n=20, seed=1, chunk_size=10)
+    coordinator = Coordinator(ladder, port=0, lease=0.0)
+    try:
+        first = coordinator.handle({"op": "get"})["task"]
+        again = coordinator.handle({"op": "get"})["task"]     # first lease already expired
+        assert again == first
+        tally = MatchupTally(n=10, wins_a=6, wins_b=4).to_dict()
+        for _ in range(2):
+            coordinator.handle({"op": "put", "task": first, "tally": tally})
+        assert ladder.done_chunks == 1
+        assert ladder.tally(*ladder.matchups[0]).wins_a == 6
+        second = coordinator.handle({"op": "get"})["task"]
+        assert second["index"] == 1
+        coordinator.handle({"op": "put", "task": second, "tally": tally})
+        assert coordinator.handle({"op": "get"}) == {"done": True}
+    finally:
+        coordinator.close()
@@ -0,0 +1,90 @@
+"""Tests for the static-AC DPR sweep."""
+
+import pytest
+
+from sim.dice import DiceContext, using
+from sim import dps
+from sim.dps import _Attacker, _Pool, dpr_curve, dpr_curves, simulate_dpr, simulate_dpr_sweep
+from sim.loader import load_build_by_name
+
+
+@pytest.mark.parametrize("name", ["champion_gwf_orc_5", "battlemaster_dueling_orc_5"])
+def test_one_lane_sweep_is_the_single_ac_run(name):
+    char = load_build_by_name(name)
+    with using(DiceContext(4)):
+        single = simulate_dpr(char, 16, n=300, use_surge=True)
+    with using(DiceContext(4)):
+        assert simulate_dpr_sweep(char, [16], n=300, use_surge=True) == [single]
+
+
+def test_sweep_lanes_match_separate_runs():
+    char = load_build_by_name("champion_gwf_orc_5")
+    acs = list(range(10, 26))
+    with using(DiceContext(9)):
+        sweep = simulate_dpr_sweep(char, acs, n=4000)
+    assert sweep[0] > sweep[-1] > 0
+    for ac in (12, 18, 24):
+        with using(DiceContext(ac)):
+            separate = simulate_dpr(char, ac, n=4000)
+        assert sweep[acs.index(ac)] == pytest.approx(separate, rel=0.06)
+
+
+def test_curve_runs_resources_down_over_the_fight():
+    char = load_build_by_name("battlemaster_gwf_fire_goliath_5")
+    with using(DiceContext(2)):
+        curve = dpr_curve(char, [16], rounds=5, n=1500)
+    per_round = [curve.round_dpr(0, r)[0] for r in range(5)]
+    assert per_round[0] > 2 * per_round[1]          # Action Surge only once
+    assert per_round[1] > per_round[4]              # Fire Giant uses running out
+    total, ci = curve.cumulative(0, 4)
+    assert total == pytest.approx(sum(per_round)) and ci > 0
+
+
+def test_curve_spends_rage_and_smite_slots():
+    with using(DiceContext(2)):
+        paladin = dpr_curve(load_build_by_name("vengeance_paladin_orc_5"), [16], rounds=8, n=1000)
+    per_round = [paladin.round_dpr(0, r)[0] for r in range(8)]
+    assert per_round[0] > 1.5 * per_round[7]        # six slots, then plain attacks
+
+    berserker = load_build_by_name("berserker_greatsword_orc_5")
+    with using(DiceContext(2)):
+        raging = dpr_curve(berserker, [16], rounds=3, n=1000)
+    with using(DiceContext(2)):
+        sampled = simulate_dpr(berserker, 16, n=3000)
+    assert not berserker.is_raging
+    assert raging.round_dpr(0, 2)[0] > sampled + 2   # +2 per hit from round 1
+
+
+def test_trip_dice_last_across_rounds_as_in_combat(monkeypatch):
+    """One die per turn while every save fails (no Trip on a prone target); one per hit otherwise."""
+    char = load_build_by_name("battlemaster_sb_fire_goliath_3")
+    attacker = _Attacker.of(char)
+
+    def dice_left(rounds: int) -> list[int]:
+        pool = _Pool.of(char, 1, fight=True)
+        left = []
+        for r in range(rounds):
+            attacker.round([2], 2 if r == 0 else 1, pool)       # Action Surge in round 1
+            left.append(pool.superiority[0])
+        return left
+
+    monkeypatch.setattr(dps, "TARGET_SAVE", -100)
+    with using(DiceContext(4)):
+        runs = [dice_left(4) for _ in range(200)]
+    assert all(left[0] >= 3 for left in runs)
+    assert sum(left[3] == 0 for left in runs) > 150         # four turns, four trips
+
+    monkeypatch.setattr(dps, "TARGET_SAVE", 100)
+    with using(DiceContext(4)):
+        runs = [dice_left(2) for _ in range(200)]
+    assert sum(left == [2, 1] for left in runs) > 150       # every hit tries again
+
+
+def test_curves_are_reproducible_across_workers():
+    names = ["champion_gwf_orc_5", "arcane_trickster_halfling_5"]
+    templates = {name: load_build_by_name(name) for name in names}
+    serial = dpr_curves(templates, [14, 18], rounds=3, n=200, seed=6)
+    pooled = dpr_curves(templates, [14, 18], rounds=3, n=200, seed=6,
+                        workers=2, backend="threads")
+    assert serial == pooled
+    assert serial[names[0]].round_dpr(0, 1)[0] > serial[names[0]].round_dpr(1, 1)[0]
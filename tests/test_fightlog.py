@@ -0,0 +1,72 @@
+"""Tests for the columnar per-fight store."""
+
+import pytest
+
+from sim.fightlog import FightColumns, FightLog, FightLogWriter
+from sim.ladder import Ladder, run_ladder
+from sim.loader import load_build_by_name
+
+_NAMES = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "lore_bard_human_5"]
+
+
+def test_fight_log_matches_ladder_tallies(tmp_path):
+    templates = {name: load_build_by_name(name) for name in _NAMES}
+    ladder = Ladder(_NAMES, n=60, seed=2, chunk_size=30)
+    run_ladder(ladder, templates, fight_log=FightLogWriter(tmp_path))
+
+    with FightLog(tmp_path) as log:
+        assert log.rows == 3 * 60
+        assert sum(log.column("rounds")) == sum(ladder.tally(*m).total_rounds for m in ladder.matchups)
+        by_matchup = log.win_rates("matchup")
+        for m, g in by_matchup.items():
+            t = ladder.tally(*log.matchups[m])
+            assert (g["wins_a"], g["wins_b"], g["draws"]) == (t.wins_a, t.wins_b, t.draws)
+
+        by_build = log.win_rates("build")
+        ranking = dict(ladder.ranking())
+        for name, g in by_build.items():
+            assert g["win_rate_a"] == pytest.approx(ranking[name])
+
+        by_first = log.win_rates(["matchup", "first"])
+        assert sum(g["n"] for g in by_first.values()) == log.rows
+
+
+def test_rewritten_chunk_is_skipped_and_torn_tail_dropped(tmp_path):
+    fights = FightColumns()
+    fights.cols["winner"].extend([0, 1, 2])
+    for name in ("rounds", "first", "hp_a", "hp_b", "dmg_a", "dmg_b"):
+        fights.cols[name].extend([1, 1, 1])
+    for name in fights.cols:
+        if name.startswith("trig_"):
+            fights.cols[name].extend([0, 0, 0])
+
+    writer = FightLogWriter(tmp_path)
+    writer.append("a", "b", 0, fights)
+    writer.append("a", "b", 0, fights)          # resumed run replays the chunk
+    with open(tmp_path / "winner.bin", "ab") as f:
+        f.write(b"\x01\x01")                    # crash mid-append of a later chunk
+
+    writer = FightLogWriter(tmp_path)
+    assert writer.has_chunk("a", "b", 0)
+    assert (tmp_path / "winner.bin").stat().st_size == 3
+    with FightLog(tmp_path) as log:
+        assert list(log.column("winner")) == [0, 1, 2]
+        assert log.win_rates("winner")[2]["draws"] == 1
+
+
+def test_log_refuses_chunks_of_another_run(tmp_path):
+    templates = {name: load_build_by_name(name) for name in _NAMES[:2]}
+    run = {"seed": 2, "n": 20, "chunk_size": 10}
+    run_ladder(Ladder(_NAMES[:2], n=20, seed=2, chunk_size=10), templates,
+               fight_log=FightLogWriter(tmp_path, run))
+
+    assert FightLogWriter(tmp_path, dict(run)).has_chunk(*sorted(_NAMES[:2]), 1)
+    for other in ({**run, "seed": 3}, {**run, "chunk_size": 5}, {**run, "n": 40}):
+        with pytest.raises(ValueError, match="written by another run"):
+            FightLogWriter(tmp_path, other)
+
+    unseeded = {**run, "seed": None}
+    run_ladder(Ladder(_NAMES[:2], n=20, chunk_size=10), templates,
+               fight_log=FightLogWriter(tmp_path / "unseeded", unseeded))
+    with pytest.raises(ValueError, match="unseeded run cannot extend"):
+        FightLogWriter(tmp_path / "unseeded", unseeded)
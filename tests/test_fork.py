@@ -0,0 +1,81 @@
+"""Tests for fight snapshots, forks and win-probability estimates."""
+
+import copy
+
+import pytest
+
+from sim.combat import _play_rounds
+from sim.dice import DiceContext, using
+from sim.fork import estimate_win_prob, snapshot
+from sim.loader import load_build_by_name
+from sim.models import CombatPhase, CombatState
+from sim.tactics import PriorityTactics, turn_action
+
+
+def _fight(a: str, b: str, rounds: int, seed: int):
+    first = load_build_by_name(a).deep_copy()
+    second = load_build_by_name(b).deep_copy()
+    state = CombatState(first, second, distance=20, starting_distance=20,
+                        turn_order=[first, second], phase=CombatPhase.RANGED)
+    tactics = PriorityTactics()
+    with using(DiceContext(seed)):
+        _play_rounds(state, tactics.bind(first), tactics.bind(second), max_rounds=rounds)
+    return state
+
+
+def _finish(state: CombatState, seed: int) -> CombatState:
+    tactics = PriorityTactics()
+    with using(DiceContext(seed)):
+        _play_rounds(state, tactics.bind(state.combatant_a), tactics.bind(state.combatant_b),
+                     max_rounds=100)
+    return state
+
+
+@pytest.mark.parametrize("a, b", [
+    ("evocation_wizard_human_5", "champion_gwf_orc_5"),
+    ("war_cleric_human_5", "battlemaster_dueling_orc_5"),
+])
+def test_forks_continue_exactly_like_deep_copies(a, b):
+    for seed in range(8):
+        state = _fight(a, b, 2, seed)
+        if not (state.combatant_a.is_alive and state.combatant_b.is_alive):
+            continue
+        snap = snapshot(state)
+        expected = _finish(copy.deepcopy(state), seed + 100)
+        forked = _finish(snap.fork(), seed + 100)
+        assert (forked.combatant_a, forked.combatant_b, forked.round_number) == \
+            (expected.combatant_a, expected.combatant_b, expected.round_number)
+
+        # The snapshot is untouched by its forks: restoring rewinds the live fight.
+        _finish(state, seed + 200)
+        snap.restore(state)
+        _finish(state, seed + 100)
+        assert (state.combatant_a, state.combatant_b) == (expected.combatant_a, expected.combatant_b)
+
+
+def test_seeded_estimates_ignore_the_worker_count():
+    state = _fight("lore_bard_human_5", "berserker_greatsword_orc_5", 1, seed=3)
+    serial = estimate_win_prob(state, 250, seed=9)
+    threaded = estimate_win_prob(snapshot(state), 250, seed=9, workers=2, backend="threads")
+    assert serial == threaded
+    assert serial.wins_a + serial.wins_b + serial.draws == 250
+    low, high = serial.interval
+    assert low <= serial.p <= high
+
+
+def test_estimates_compare_decisions_inside_a_turn():
+    fighter = load_build_by_name("champion_gwf_orc_5").deep_copy()
+    barbarian = load_build_by_name("berserker_greatsword_orc_5").deep_copy()
+    state = CombatState(fighter, barbarian, distance=5, round_number=1, phase=CombatPhase.MELEE,
+                        turn_order=[fighter, barbarian])
+    fighter.start_turn()
+    plan = PriorityTactics().bind(fighter)(state)
+    held = tuple(a for a in plan if a.kind != "action_surge")
+    assert held != plan
+
+    surge = estimate_win_prob(state, 200, actor=fighter, plan=plan, seed=1)
+    hold = estimate_win_prob(state, 200, actor=fighter, plan=held, seed=1)
+    assert surge != hold
+    assert fighter.current_hp == fighter.max_hp and fighter.resources["action_surge"].available
+    with pytest.raises(ValueError, match="actor and plan"):
+        estimate_win_prob(state, 10, plan=(turn_action("dodge"),))
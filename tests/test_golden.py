@@ -0,0 +1,31 @@
+"""Golden determinism corpus: the engine must reproduce every pinned fight.
+
+If this fails after an intended rules change, review and accept it with
+``./dnd-sim golden --accept`` (prints the win-rate impact).
+"""
+
+import copy
+
+from sim import golden
+
+
+def test_engine_matches_golden_corpus():
+    corpus = golden.load()
+    d = golden.diff(corpus, golden.rerun(corpus))
+    changed = [(p.a, p.b, p.first_changed) for p in d.pairings]
+    assert d.identical, f"engine no longer reproduces the golden fights: {changed[:5]}"
+
+
+def test_diff_separates_draw_and_outcome_changes():
+    corpus = golden.load()
+    edited = copy.deepcopy(corpus)
+    fights = edited["pairings"][3]["fights"]
+    crc, n, rounds, hp_a, hp_b = fights[2].split()
+    fights[2] = f"00000000 {n} {rounds} {hp_a} {hp_b}"              # same fight, other dice
+    crc, n, rounds, hp_a, hp_b = fights[5].split()
+    fights[5] = f"{crc} {n} {int(rounds) + 1} {hp_a} {hp_b}"         # different ending
+
+    d = golden.diff(corpus, edited)
+    (p,) = d.pairings
+    assert (p.draws_changed, p.outcomes_changed, p.first_changed) == (2, 1, 2)
+    assert d.fights == sum(len(p["fights"]) for p in corpus["pairings"])
@@ -0,0 +1,99 @@
+"""Tests for chunked round-robin ladders and checkpoint/resume."""
+
+import json
+
+import pytest
+
+from sim.ladder import CHECKPOINT_FILE, Ladder, load_checkpoint, run_chunk, run_ladder, save_checkpoint
+from sim.loader import load_build_by_name
+from sim.progress import Progress
+
+_NAMES = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "evocation_wizard_human_5"]
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return {name: load_build_by_name(name) for name in _NAMES}
+
+
+def test_chunks_cover_every_fight():
+    ladder = Ladder(_NAMES, n=250, seed=1, chunk_size=100)
+    tasks = ladder.tasks_for(*ladder.matchups[0])
+    assert [t.n for t in tasks] == [100, 100, 50]
+    assert len({t.seed for t in tasks}) == 3
+    assert ladder.total_chunks == 3 * 3
+
+
+def test_resumed_run_matches_uninterrupted(templates, tmp_path):
+    """Stopping part-way, reloading the checkpoint and finishing gives identical tallies."""
+    full = run_ladder(Ladder(_NAMES, n=120, seed=42, chunk_size=50), templates)
+
+    partial = Ladder(_NAMES, n=120, seed=42, chunk_size=50)
+    for task in partial.pending()[:4]:   # dies mid-way through the second matchup
+        partial.record(task, run_chunk(templates[task.a], templates[task.b], task))
+    save_checkpoint(partial, tmp_path)
+
+    resumed = load_checkpoint(tmp_path)
+    assert resumed.done_chunks == 4
+    run_ladder(resumed, templates, run_dir=tmp_path)
+
+    assert resumed.is_complete
+    for a, b in full.matchups:
+        assert resumed.tally(a, b) == full.tally(a, b)
+    assert resumed.ranking() == full.ranking()
+
+
+def test_interrupt_writes_final_checkpoint(templates, tmp_path):
+    """Ctrl-C mid-run still leaves a valid checkpoint of every finished chunk."""
+    ladder = Ladder(_NAMES, n=40, seed=3, chunk_size=20)
+
+    def interrupt_after_three(task, tally):
+        if ladder.done_chunks == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_ladder(ladder, templates, run_dir=tmp_path, checkpoint_every=3600,
+                   on_chunk=interrupt_after_three)
+
+    data = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert len(data["chunks"]) == 3
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_worker_pool_matches_single_process(templates):
+    """Chunks are seeded independently, so a process pool gives identical tallies."""
+    single = run_ladder(Ladder(_NAMES, n=60, seed=9, chunk_size=20), templates)
+    pooled = run_ladder(Ladder(_NAMES, n=60, seed=9, chunk_size=20), templates, workers=2)
+    assert pooled.to_dict() == single.to_dict()
+
+
+def test_progress_counts_chunks_and_leaders(templates):
+    ladder = Ladder(_NAMES, n=40, seed=5, chunk_size=20)
+    progress = Progress(ladder)
+    run_ladder(ladder, templates, progress=progress)
+
+    snap = progress.snapshot()
+    assert snap["matchups_done"] == snap["matchups_total"] == 3
+    assert snap["chunks_done"] == 6
+    assert snap["fights"] == 120
+    assert snap["eta"] == 0
+    assert [name for name, _ in snap["leaders"]] == [name for name, _ in ladder.ranking()]
+    assert "3/3 matchups" in progress.format()
+
+
+def test_feature_usage_is_counted_per_side():
+    from sim import metrics
+
+    paladin = load_build_by_name("vengeance_paladin_orc_5")
+    cleric = load_build_by_name("war_cleric_human_5")
+    ladder = Ladder(["war_cleric_human_5", "vengeance_paladin_orc_5"], n=40, seed=5, chunk_size=20)
+    run_ladder(ladder, {"war_cleric_human_5": cleric, "vengeance_paladin_orc_5": paladin})
+
+    usage = ladder.feature_usage()
+    fights, cleric_counts = usage["war_cleric_human_5"]
+    _, paladin_counts = usage["vengeance_paladin_orc_5"]
+    assert fights == 40
+    assert paladin_counts[metrics.SMITES] > 0 and cleric_counts[metrics.SMITES] == 0
+    assert cleric_counts[metrics.CONCENTRATION_KEPT] + cleric_counts[metrics.CONCENTRATION_LOST] > 0
+    tally = ladder.tally("vengeance_paladin_orc_5", "war_cleric_human_5")
+    assert tally.metrics_a == paladin_counts
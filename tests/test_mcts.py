@@ -0,0 +1,66 @@
+"""Tests for the Monte Carlo tree search tactics."""
+
+import pytest
+
+from sim.loader import load_build_by_name
+from sim.mcts import MCTSTactics, position_key
+from sim.models import CombatPhase, CombatState
+from sim.runner import run_matchup
+from sim.tactics import Loadout, PriorityTactics, load_tactics
+
+
+def _opening(a: str, b: str):
+    first = load_build_by_name(a).deep_copy()
+    second = load_build_by_name(b).deep_copy()
+    state = CombatState(first, second, distance=20, round_number=1, phase=CombatPhase.RANGED,
+                        turn_order=[first, second])
+    first.start_turn()
+    return first, state
+
+
+def test_budgets_parse_from_the_name():
+    assert isinstance(load_tactics("mcts"), MCTSTactics)
+    assert load_tactics("mcts:16").rollouts == 16
+    timed = load_tactics("mcts:0.05s")
+    assert timed.seconds == 0.05
+    with pytest.raises(ValueError, match="bad MCTS budget"):
+        load_tactics("mcts:lots")
+
+
+def test_candidates_swap_spells_and_hold_resources():
+    engine = MCTSTactics()
+    wizard, state = _opening("evocation_wizard_human_5", "champion_gwf_orc_5")
+    base = PriorityTactics().bind(wizard)(state)
+    defensive = PriorityTactics("defensive").bind(wizard)(state)
+    plans = engine._candidates(wizard, state, base, defensive, Loadout.of(wizard))
+    spells = {a.extra["spell"] for plan in plans for a in plan if a.kind == "cast_spell"}
+    assert {"fireball", "magic_missile", "scorching_ray", "fire_bolt"} <= spells
+
+    fighter, state = _opening("champion_gwf_orc_5", "evocation_wizard_human_5")
+    state.phase = CombatPhase.MELEE
+    base = PriorityTactics().bind(fighter)(state)
+    plans = engine._candidates(fighter, state, base, base, Loadout.of(fighter))
+    assert any("action_surge" in [a.kind for a in p] for p in plans)
+    assert any("action_surge" not in [a.kind for a in p] for p in plans)
+
+
+def test_searched_positions_are_answered_from_the_cache(monkeypatch):
+    engine = MCTSTactics(rollouts=12)
+    wizard, state = _opening("evocation_wizard_human_5", "champion_gwf_orc_5")
+    key = position_key(wizard, state)
+    plan = engine.bind(wizard)(state)
+    assert engine._cache[key].total_visits == 12
+
+    calls = []
+    monkeypatch.setattr(engine, "_rollout", lambda *args: calls.append(args) or 0.0)
+    again = engine.bind(wizard)(state)
+    assert calls == [] and again == plan
+
+
+def test_seeded_mcts_runs_are_reproducible():
+    a = load_build_by_name("lore_bard_human_5")
+    b = load_build_by_name("champion_gwf_orc_5")
+    first = run_matchup(a, b, 3, tactic1="mcts:8", seed=11)
+    again = run_matchup(a, b, 3, tactic1="mcts:8", seed=11)
+    assert first["combatant_a"]["wins"] == again["combatant_a"]["wins"]
+    assert first["total_rounds"] == again["total_rounds"] > 0
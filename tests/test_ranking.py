@@ -0,0 +1,98 @@
+"""Tests for Bradley–Terry sparse ranking."""
+
+import random
+
+from sim.loader import load_build_by_name
+from sim.ranking import PairTally, _logistic, fit_bradley_terry, rank_bradley_terry
+from sim.runner import run_matchup
+
+
+def _oracle(strengths):
+    """play() that samples fights from known Bradley–Terry strengths."""
+    def play(a, b, n, seed):
+        rng = random.Random(seed)
+        p = _logistic(strengths[a] - strengths[b])
+        wins = sum(rng.random() < p for _ in range(n))
+        return wins, n - wins, 0
+    return play
+
+
+def _round_robin_order(names, play, n, seed):
+    """Full round-robin ordered by average win rate, as cmd_rank does it."""
+    rates = {name: [] for name in names}
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            wa, wb, _ = play(a, b, n, seed + i)
+            rates[a].append(wa / n)
+            rates[b].append(wb / n)
+    return sorted(names, key=lambda nm: sum(rates[nm]) / len(rates[nm]), reverse=True)
+
+
+def _kendall_tau(order_a, order_b):
+    pos = {name: i for i, name in enumerate(order_b)}
+    concordant = discordant = 0
+    for i, x in enumerate(order_a):
+        for y in order_a[i + 1:]:
+            if pos[x] < pos[y]:
+                concordant += 1
+            else:
+                discordant += 1
+    return (concordant - discordant) / (concordant + discordant)
+
+
+def test_fit_recovers_strength_order():
+    """MM fit orders builds by their true strength given plenty of fights."""
+    true = {"a": 1.0, "b": 0.0, "c": -1.0}
+    play = _oracle(true)
+    tallies = {}
+    for x, y in [("a", "b"), ("a", "c"), ("b", "c")]:
+        wa, wb, dr = play(x, y, 2000, 1)
+        tallies[(x, y)] = PairTally(wa, wb, dr)
+    strengths, ses = fit_bradley_terry(["a", "b", "c"], tallies)
+    assert strengths["a"] > strengths["b"] > strengths["c"]
+    assert abs(strengths["a"] - strengths["c"] - 2.0) < 0.3
+    assert all(se < 0.1 for se in ses.values())
+
+
+def test_undefeated_build_stays_finite():
+    tallies = {("a", "b"): PairTally(wins_a=50, wins_b=0)}
+    strengths, ses = fit_bradley_terry(["a", "b"], tallies)
+    assert strengths["a"] > strengths["b"]
+    assert all(abs(s) < 20 for s in strengths.values())
+
+
+def test_bt_matches_round_robin_with_fewer_fights():
+    """Sparse ranking agrees with the full round-robin at a fraction of the cost."""
+    rng = random.Random(5)
+    names = [f"build_{i:02d}" for i in range(20)]
+    true = {name: rng.gauss(0.0, 1.5) for name in names}
+    play = _oracle(true)
+
+    full = _round_robin_order(names, play, n=300, seed=11)
+    result = rank_bradley_terry(names, play, batch=100, confidence=0.9, seed=3)
+
+    round_robin_cost = 300 * len(names) * (len(names) - 1) // 2
+    assert result.converged
+    assert result.fights < round_robin_cost / 2
+    assert result.ordering[0] == full[0]
+    assert _kendall_tau(result.ordering, full) > 0.9
+
+
+def test_bt_on_real_builds_agrees_with_round_robin():
+    """Seeded BT ranking of real builds puts the round-robin winner on top."""
+    names = [
+        "berserker_greatsword_orc_5",
+        "champion_gwf_orc_5",
+        "evocation_wizard_human_5",
+        "lore_bard_human_5",
+    ]
+    templates = {name: load_build_by_name(name) for name in names}
+
+    def play(a, b, n, seed):
+        stats = run_matchup(templates[a], templates[b], n=n, seed=seed)
+        return stats["combatant_a"]["wins"], stats["combatant_b"]["wins"], stats["draws"]
+
+    full = _round_robin_order(names, play, n=200, seed=7)
+    result = rank_bradley_terry(names, play, batch=50, confidence=0.9, max_fights=1200, seed=7)
+    assert result.ordering[0] == full[0]
+    assert result.ordering[-1] == full[-1]
@@ -0,0 +1,39 @@
+"""Tests for dice tapes and fight replay."""
+
+import pytest
+
+from sim.dice import TapeError
+from sim.fightlog import FightColumns
+from sim.loader import load_build_by_name
+from sim.replay import FightTape, record_fight, replay
+from sim.runner import run_matchup
+
+_A = "battlemaster_gwf_orc_5"
+_B = "lore_bard_human_5"
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return load_build_by_name(_A), load_build_by_name(_B)
+
+
+def test_replay_reproduces_a_fight_from_a_silent_run(templates, tmp_path):
+    fights = FightColumns()
+    run_matchup(*templates, n=12, seed=21, fights=fights)
+
+    tape = record_fight(*templates, _A, _B, seed=21, fight=9)
+    assert (tape.rounds, tape.hp_a, tape.hp_b) == (
+        fights.cols["rounds"][9], fights.cols["hp_a"][9], fights.cols["hp_b"][9])
+
+    tape.save(tmp_path / "f.tape")
+    loaded = FightTape.load(tmp_path / "f.tape")
+    assert loaded == tape
+    state = replay(loaded, *templates)          # verbose, same draws
+    assert state.combat_log and state.round_number == tape.rounds
+
+
+def test_tampered_tape_is_rejected(templates):
+    tape = record_fight(*templates, _A, _B, seed=4, fight=0)
+    tape.draws.append(1)
+    with pytest.raises(TapeError):
+        replay(tape, *templates)
@@ -0,0 +1,92 @@
+"""Tests for rule-file tactics compiled from tactics/priority/*.yaml."""
+
+import pickle
+
+import pytest
+
+from sim.loader import load_build_by_name
+from sim.models import CombatPhase, CombatState
+from sim.rules import RuleTactics, compile_condition
+from sim.runner import run_matchup
+from sim.tactics import TACTICS_DIR, PriorityTactics, cast_action, load_tactics, turn_action
+
+
+@pytest.fixture()
+def melee():
+    barbarian = load_build_by_name("berserker_greatsword_orc_5").deep_copy()
+    fighter = load_build_by_name("champion_gwf_orc_5").deep_copy()
+    state = CombatState(barbarian, fighter, distance=5, round_number=1, phase=CombatPhase.MELEE)
+    return barbarian, fighter, state
+
+
+def test_conditions_compile_to_predicates(melee):
+    barbarian, fighter, state = melee
+    assert compile_condition("in melee and has reckless attack")(barbarian, state)
+    assert not compile_condition("in melee and has reckless attack")(fighter, state)
+    assert compile_condition("not raging and has rage uses")(barbarian, state)
+    assert compile_condition("has flurry of blows and focus points or round <= 1")(fighter, state)
+    assert not compile_condition("not in melee")(barbarian, state)
+
+    hurt = compile_condition("hp < 50% and has second wind")
+    assert not hurt(fighter, state)
+    fighter.current_hp = fighter.max_hp // 2 - 1
+    assert hurt(fighter, state)
+    assert compile_condition("enemy hp < 50%")(barbarian, state)
+    fighter.resources["second_wind"].current = 0
+    assert not hurt(fighter, state)
+
+
+def test_bad_rules_name_file_and_rule():
+    with pytest.raises(ValueError, match="cannot parse"):
+        compile_condition("hp < half")
+    with pytest.raises(ValueError, match=r"custom\.yaml: rule 2"):
+        RuleTactics.from_dict({"priority": [{"action": "move_toward_enemy"},
+                                            {"condition": "in melee"}]}, "custom.yaml")
+    with pytest.raises(ValueError, match=r"custom\.yaml: rule 1: unknown action 'secnd_wind'"):
+        RuleTactics.from_dict({"priority": [{"action": "secnd_wind"}]}, "custom.yaml")
+    with pytest.raises(ValueError, match=r"custom\.yaml: rule 1: unknown feature, trait or resource "
+                                         r"'reckles attack'"):
+        RuleTactics.from_dict({"priority": [{"condition": "has reckles attack",
+                                             "action": "reckless_attack"}]}, "custom.yaml")
+    with pytest.raises(ValueError, match="unknown resource 'rage points'"):
+        compile_condition("has rage points uses")
+
+
+def test_rules_fire_in_file_order(melee):
+    barbarian, _, state = melee
+    tactics = RuleTactics.from_file(TACTICS_DIR / "aggressive.yaml")
+    kinds = [a.kind for a in tactics.decide_turn(barbarian, state)]
+    assert kinds == ["rage", "reckless", "attack"]
+
+
+def test_plans_are_tuples_of_shared_actions(melee):
+    barbarian, _, state = melee
+    rules = RuleTactics.from_file(TACTICS_DIR / "aggressive.yaml")
+    builtin = PriorityTactics().bind(barbarian)
+    for plan in (rules.decide_turn(barbarian, state), builtin(state), builtin(state)):
+        assert isinstance(plan, tuple)
+        assert plan[0] is turn_action("rage")
+        assert plan[-1] is turn_action("attack", "Greatsword")
+
+    fireball = cast_action("fireball", 3)
+    assert pickle.loads(pickle.dumps(fireball)) is fireball
+    with pytest.raises(TypeError):
+        fireball.extra["slot_level"] = 5
+
+
+def test_load_tactics_compiles_custom_files(tmp_path):
+    path = tmp_path / "turtle.yaml"
+    path.write_text("name: turtle\npriority:\n"
+                    "- {condition: not in melee, action: move_toward_enemy}\n"
+                    "- {condition: always, action: melee_attack}\n"
+                    "- {condition: hp < 60% and has second wind, action: second_wind}\n")
+    tactics = load_tactics(str(path))
+    assert isinstance(tactics, RuleTactics) and tactics.name == "turtle"
+    assert isinstance(load_tactics("aggressive"), PriorityTactics)
+
+    a = load_build_by_name("champion_gwf_orc_5")
+    b = load_build_by_name("berserker_greatsword_orc_5")
+    first = run_matchup(a, b, 20, tactic1=str(path), seed=4)
+    again = run_matchup(a, b, 20, tactic1=str(path), seed=4)
+    assert first["combatant_a"]["wins"] == again["combatant_a"]["wins"]
+    assert first["total_rounds"] == again["total_rounds"] > 0
@@ -0,0 +1,116 @@
+"""Tests for the warm session and the serve JSON API."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sim.ladder import Ladder, run_ladder
+from sim.loader import load_build_by_name
+from sim.server import make_server
+from sim.session import SimSession
+
+_A, _B = "berserker_greatsword_orc_5", "champion_gwf_orc_5"
+
+
+@pytest.fixture(scope="module")
+def session():
+    with SimSession(workers=2, chunk_size=50) as s:
+        yield s
+
+
+@pytest.fixture(scope="module")
+def base_url(session):
+    server = make_server(session, port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, body):
+    req = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as resp:
+        return json.loads(resp.read())
+
+
+def test_session_matches_ladder_and_caches(session):
+    """Session results equal a plain seeded ladder; a repeat is served from cache."""
+    templates = {name: load_build_by_name(name) for name in (_A, _B)}
+    direct = run_ladder(Ladder([_A, _B], n=100, seed=4, chunk_size=50), templates)
+
+    first = session.matchup(_A, _B, n=100, seed=4)
+    assert first["wins_a"] == direct.tally(_A, _B).wins_a
+    simulated = session.stats()["simulated"]
+    assert session.matchup(_A, _B, n=100, seed=4) == first
+    assert session.stats()["simulated"] == simulated
+
+
+def test_identical_inflight_requests_are_coalesced(session):
+    before = session.stats()
+    futures = [session.submit_dps(_A, 15, 200, False, 11) for _ in range(3)]
+    assert futures[0] is futures[1] is futures[2]
+    assert len({f.result() for f in futures}) == 1
+    after = session.stats()
+    assert after["simulated"] - before["simulated"] == 1
+    assert after["coalesced"] - before["coalesced"] == 2
+
+
+def test_http_endpoints(base_url):
+    result = _post(f"{base_url}/rank", {"builds": [_A, _B], "n": 50, "seed": 1})
+    assert [row["build"] for row in result["ranking"]][0] in (_A, _B)
+    assert result["matchups"][0]["n"] == 50
+
+    dps = _post(f"{base_url}/dps", {"builds": [_A], "ac": [14, 18], "n": 100})
+    assert dps["rows"][0]["dpr"]["14"] > dps["rows"][0]["dpr"]["18"]
+
+    with urllib.request.urlopen(f"{base_url}/health") as resp:
+        assert json.loads(resp.read())["ok"]
+
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(f"{base_url}/matchup", {"a": _A, "b": "no_such_build"})
+    assert err.value.code == 404
+
+
+def test_reload_replaces_workers_and_drops_stale_work():
+    with SimSession(workers=1, chunk_size=50) as s:
+        held = s.submit_dps(_A, 15, 2000, False, 3)
+        pool = s._executor
+        s.reload()
+        assert s._executor is not pool and s.stats()["inflight"] == 0
+        fresh = s.submit_dps(_A, 15, 2000, False, 3)
+        assert fresh is not held
+        assert held.result() == fresh.result()
+        assert all(key[0] == s._generation for key in s._cache)   # stale result not kept
+
+
+def test_templates_for_submitted_work_load_under_the_generation_lock(monkeypatch):
+    from sim import loader
+
+    with SimSession(workers=1, chunk_size=50, executor=ThreadPoolExecutor(1)) as s:
+        real = loader.load_build
+        held = []
+
+        def load_build(path):
+            held.append(s._lock.locked())
+            return real(path)
+        monkeypatch.setattr(loader, "load_build", load_build)
+        s.submit_dps(_A, 15, 20, False, 3).result()
+        assert held == [True]
+
+
+def test_unexpected_errors_get_a_500(base_url, monkeypatch):
+    import sim.server
+
+    def broken(*args):
+        raise RuntimeError("worker died")
+    monkeypatch.setattr(sim.server, "handle_query", broken)
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(f"{base_url}/rank", {})
+    assert err.value.code == 500
+    assert "worker died" in json.loads(err.value.read())["error"]
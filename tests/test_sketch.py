@@ -0,0 +1,58 @@
+"""Tests for the mergeable fight-statistic histograms."""
+
+import json
+
+from sim.fightlog import WIN_A, WIN_B, FightColumns
+from sim.ladder import ChunkTask, MatchupTally, run_chunk
+from sim.loader import load_build_by_name
+from sim.sketch import Histogram, fight_sketches
+
+
+def test_quantiles_are_exact_nearest_rank():
+    h = Histogram(max_value=50)
+    for value in range(1, 31):
+        h.add(value)
+    h.add(500)                              # overflow bin
+    assert h.percentiles() == {"p10": 4, "p50": 16, "p90": 28}
+    assert h.quantile(1.0) == 51
+    assert Histogram.from_dict(json.loads(json.dumps(h.to_dict()))) == h
+
+
+def test_chunk_merge_matches_per_fight_columns():
+    a = load_build_by_name("berserker_greatsword_orc_5")
+    b = load_build_by_name("lore_bard_human_5")
+    merged = MatchupTally()
+    columns = []
+    for index in range(3):
+        fights = FightColumns()
+        merged.merge(run_chunk(a, b, ChunkTask("a", "b", index, 40, seed=100 + index), fights))
+        columns.append(fights.cols)
+
+    # The same fights, binned one by one from their per-fight rows.
+    single = fight_sketches()
+    for cols in columns:
+        for i, winner in enumerate(cols["winner"]):
+            single["rounds"].add(cols["rounds"][i])
+            single["damage_a"].add(cols["dmg_a"][i])
+            single["damage_b"].add(cols["dmg_b"][i])
+            if winner == WIN_A:
+                single["hp_left_a"].add(cols["hp_a"][i])
+            elif winner == WIN_B:
+                single["hp_left_b"].add(cols["hp_b"][i])
+
+    assert merged.sketches == single
+    assert merged.sketches["rounds"].n == 120
+    assert sum(v * c for v, c in enumerate(merged.sketches["rounds"].counts)) == merged.total_rounds
+    assert MatchupTally.from_dict(json.loads(json.dumps(merged.to_dict()))) == merged
+
+
+def test_flipped_tally_does_not_share_sketches():
+    a = load_build_by_name("berserker_greatsword_orc_5")
+    b = load_build_by_name("lore_bard_human_5")
+    tally = run_chunk(a, b, ChunkTask("a", "b", 0, 30, seed=5))
+    before = MatchupTally.from_dict(tally.to_dict())
+    flipped = tally.flipped()
+    assert flipped.sketches["damage_a"] == tally.sketches["damage_b"]
+
+    flipped.merge(flipped)
+    assert tally == before
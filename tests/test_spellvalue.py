@@ -0,0 +1,64 @@
+"""Tests for the expected-value spell tables behind caster spell choice."""
+
+from sim.loader import load_build_by_name
+from sim.models import ActiveEffect, Condition
+from sim.spellvalue import SpellTable, average, build_table
+from sim.tactics import _pick_spell_action
+
+
+def _ranking(table) -> list[tuple[str, int]]:
+    return [(o.spell, o.slot) for o in table]
+
+
+def test_values_follow_hit_and_save_odds():
+    assert average("8d6") == 28 and average("7d8+30") == 61.5
+    wizard = load_build_by_name("evocation_wizard_human_5")
+    fighter = load_build_by_name("champion_gwf_orc_5")
+    options = {(o.spell, o.slot): o.value for o in build_table(wizard, fighter)}
+
+    # Magic Missile never misses: three darts, plus one per slot level above 1st.
+    assert options[("magic_missile", 1)] == 3 * 3.5
+    assert options[("magic_missile", 3)] == 5 * 3.5
+    # Chromatic Orb has no upcast dice, so it is only offered from a 1st-level slot.
+    assert ("chromatic_orb", 2) not in options
+    hit = (21 - (fighter.effective_ac - wizard.spell_attack_bonus)) / 20
+    assert options[("scorching_ray", 2)] == 3 * 7 * hit
+
+
+def test_table_is_target_aware():
+    wizard = load_build_by_name("evocation_wizard_human_5")
+    fighter = load_build_by_name("champion_gwf_orc_5").deep_copy()
+    assert _ranking(build_table(wizard, fighter))[0] == ("fireball", 3)
+
+    fighter.features.append("evasion")           # now a made DEX save means no damage
+    ranking = _ranking(build_table(wizard, fighter))
+    assert ranking.index(("fireball", 3)) > ranking.index(("magic_missile", 3))
+
+
+def test_best_skips_spent_slots_and_pointless_control():
+    bard = load_build_by_name("lore_bard_human_5").deep_copy()
+    barbarian = load_build_by_name("berserker_greatsword_orc_5").deep_copy()
+    table = SpellTable(bard)
+    assert table.best(barbarian).spell == "scorching_ray"
+    assert any(o.spell == "hypnotic_pattern" for o in table.options(barbarian))
+
+    barbarian.conditions.add(Condition.INCAPACITATED)
+    while (option := table.best(barbarian)) is not None:
+        assert option.spell != "hypnotic_pattern"
+        bard.spend_spell_slot(option.slot)
+    assert bard.highest_available_spell_slot() is None
+
+    action = _pick_spell_action(bard, barbarian, table)
+    assert action.extra == {"spell": "vicious_mockery", "slot_level": 0}
+
+
+def test_table_follows_the_targets_ac_mid_fight():
+    wizard = load_build_by_name("evocation_wizard_human_5")
+    fighter = load_build_by_name("champion_gwf_orc_5").deep_copy()
+    table = SpellTable(wizard)
+    before = {(o.spell, o.slot): o.value for o in table.options(fighter)}
+
+    fighter.active_effects.append(ActiveEffect(name="Shield Spell", source="shield", ac_bonus=5))
+    after = {(o.spell, o.slot): o.value for o in table.options(fighter)}
+    assert after[("scorching_ray", 2)] < before[("scorching_ray", 2)]
+    assert after[("magic_missile", 1)] == before[("magic_missile", 1)]
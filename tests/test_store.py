@@ -0,0 +1,88 @@
+"""Tests for the SQLite results warehouse."""
+
+import pytest
+
+from sim.ladder import MatchupTally
+from sim.store import Selector, connect, query, record_run
+
+_FIRE = "berserker_greatsword_fire_goliath_5"
+_ORC = "berserker_greatsword_orc_5"
+_WIZARD = "evocation_wizard_human_5"
+_BARD = "lore_bard_human_5"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(tmp_path / "results.db")
+    yield conn
+    conn.close()
+
+
+def test_query_by_tags_and_role(conn):
+    """'Fire Goliath builds vs casters at L5' reads straight from stored runs."""
+    record_run(conn, "rank", {"n": 100}, [
+        (_FIRE, _WIZARD, MatchupTally(n=100, wins_a=90, wins_b=10, total_rounds=300,
+                                      total_rounds_sq=1000)),
+        (_BARD, _FIRE, MatchupTally(n=100, wins_a=5, wins_b=95, total_rounds=250)),
+        (_FIRE, _ORC, MatchupTally(n=100, wins_a=40, wins_b=60, total_rounds=500)),
+    ])
+
+    rows = query(conn, build=Selector(tags=["fire", "goliath"]),
+                 opponent=Selector(role="caster"), level=5)
+    assert {(r.build, r.opponent, r.wins) for r in rows} == {
+        (_FIRE, _WIZARD, 90),
+        (_FIRE, _BARD, 95),          # stored from the bard's side, read from the goliath's
+    }
+
+    orc_side = query(conn, build=Selector(names=[_ORC]))
+    assert [(r.opponent, r.wins, r.losses) for r in orc_side] == [(_FIRE, 60, 40)]
+
+
+def test_runs_pool_within_an_engine(conn):
+    for wins in (30, 50):
+        record_run(conn, "rank", {}, [(_ORC, _BARD, MatchupTally(n=100, wins_a=wins,
+                                                                  wins_b=100 - wins))])
+    (row,) = query(conn, build=Selector(names=[_ORC]))
+    assert row.n == 200
+    assert row.win_rate == pytest.approx(40.0)
+
+
+def test_latest_engine_filters_older_runs(conn):
+    record_run(conn, "rank", {}, [(_ORC, _BARD, MatchupTally(n=10, wins_a=1, wins_b=9))])
+    conn.execute("UPDATE runs SET engine_version = 'old'")
+    record_run(conn, "rank", {}, [(_ORC, _BARD, MatchupTally(n=10, wins_a=9, wins_b=1))])
+
+    (latest,) = query(conn, build=Selector(names=[_ORC]))
+    assert latest.wins == 9
+    (old,) = query(conn, build=Selector(names=[_ORC]), engine="old")
+    assert old.wins == 1
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM matchups WHERE build = ? AND opponent = ? AND level = ?",
+        (_ORC, _BARD, 5),
+    ).fetchall()
+    assert any("ix_matchups_lookup" in row[-1] for row in plan)
+
+
+def test_seeded_runs_are_not_counted_twice(conn):
+    def record(n, wins, seed, chunk_size=20):
+        tally = MatchupTally(n=n, wins_a=wins, wins_b=n - wins)
+        record_run(conn, "rank", {}, [(_ORC, _BARD, tally)], seed=seed, chunk_size=chunk_size)
+
+    record(100, 40, seed=7)
+    record(100, 40, seed=7)          # the same run stored again
+    record(60, 25, seed=7)           # a shorter run: its chunks are a prefix of the first
+    (row,) = query(conn, build=Selector(names=[_ORC]))
+    assert (row.n, row.wins) == (100, 40)
+
+    record(100, 50, seed=8)
+    record(100, 45, seed=7, chunk_size=50)
+    record(100, 55, seed=None)
+    (row,) = query(conn, build=Selector(names=[_ORC]))
+    assert (row.n, row.wins) == (400, 190)
+
+
+def test_rows_record_the_tactic_that_ran(conn):
+    record_run(conn, "rank", {}, [(_ORC, _BARD, MatchupTally(n=10, wins_a=5, wins_b=5))],
+               tactic="defensive")
+    rows = conn.execute("SELECT tactic, opponent_tactic FROM matchups").fetchall()
+    assert [tuple(r) for r in rows] == [("defensive", "defensive")] * 2
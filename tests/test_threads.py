@@ -0,0 +1,83 @@
+"""Concurrency stress tests: thread-backed runs must match serial ones exactly."""
+
+import threading
+
+import pytest
+
+from sim.dice import DiceContext, current, d20, recording, using
+from sim.ladder import Ladder, run_ladder
+from sim.loader import load_build_by_name
+from sim.runner import run_matchup, run_matchup_parallel
+
+_NAMES = ["berserker_greatsword_orc_5", "champion_gwf_orc_5", "lore_bard_human_5",
+          "moon_druid_human_5"]
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return {name: load_build_by_name(name) for name in _NAMES}
+
+
+def _stats(result: dict) -> tuple:
+    return (result["combatant_a"]["wins"], result["combatant_b"]["wins"], result["draws"],
+            result["total_rounds"], result["total_rounds_sq"],
+            result["combatant_a"]["total_damage_dealt"],
+            list(result["combatant_a"]["metrics"]), list(result["combatant_b"]["metrics"]))
+
+
+def test_threaded_ladder_matches_serial(templates):
+    serial = run_ladder(Ladder(_NAMES, n=40, seed=5, chunk_size=10), templates)
+    threaded = run_ladder(Ladder(_NAMES, n=40, seed=5, chunk_size=10), templates,
+                          workers=4, backend="threads")
+    assert threaded.to_dict() == serial.to_dict()
+
+
+def test_concurrent_seeded_matchups_match_serial(templates):
+    jobs = [(a, b, seed) for seed in range(3) for a, b in [(_NAMES[0], _NAMES[2]),
+                                                           (_NAMES[1], _NAMES[3])]]
+    serial = {job: _stats(run_matchup(templates[job[0]], templates[job[1]], 15, seed=job[2]))
+              for job in jobs}
+
+    threaded: dict = {}
+    start = threading.Barrier(len(jobs))
+
+    def run(job):
+        start.wait()
+        a, b, seed = job
+        threaded[job] = _stats(run_matchup(templates[a], templates[b], 15, seed=seed))
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in jobs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert threaded == serial
+
+
+def test_parallel_matchup_is_independent_of_backend_and_workers(templates):
+    a, b = templates[_NAMES[0]], templates[_NAMES[2]]
+    runs = [run_matchup_parallel(a, b, 50, seed=9, workers=w, backend=backend, chunk_size=10)
+            for w, backend in [(2, "threads"), (4, "threads"), (2, "processes")]]
+    assert _stats(runs[1]) == _stats(runs[0]) == _stats(runs[2])
+    assert runs[0]["n"] == 50
+
+
+def test_dice_contexts_are_per_thread():
+    with using(DiceContext(3)):
+        expected = [d20() for _ in range(20)]
+    seen: list[int] = []
+
+    def other_thread():
+        with recording() as tape:     # records this thread's draws only
+            for _ in range(50):
+                d20()
+        seen.extend(tape)
+
+    with using(DiceContext(3)):
+        t = threading.Thread(target=other_thread)
+        t.start()
+        got = [d20() for _ in range(20)]
+        t.join()
+    assert got == expected
+    assert len(seen) == 50
+    assert current().rng is None      # back on the default context
@@ -0,0 +1,78 @@
+"""Tests for tunable tactic params and the successive-halving tuner."""
+
+import pytest
+
+from sim.loader import load_build_by_name
+from sim.runner import run_matchup
+from sim.tactics import PriorityTactics, TacticParams, load_tactics
+from sim.tune import (
+    parameter_space, parse_param, sample_candidates, successive_halving, write_tactics,
+)
+
+
+def test_params_round_trip_through_a_tactics_file(tmp_path):
+    params = TacticParams(second_wind_hp=0.35, maneuvers=("riposte",))
+    assert params.to_dict() == {"second_wind_hp": 0.35, "maneuvers": ["riposte"]}
+    assert TacticParams.from_dict(params.to_dict()) == params
+    with pytest.raises(ValueError, match="unknown tactic params: bravery"):
+        TacticParams.from_dict({"bravery": 1})
+
+    path = tmp_path / "tuned.yaml"
+    path.write_text("base: defensive\nparams:\n  second_wind_hp: 0.35\n  maneuvers: [riposte]\n")
+    engine = load_tactics(str(path))
+    assert engine.name == "defensive" and engine.params == params
+
+    fighter = load_build_by_name("battlemaster_dueling_orc_5").deep_copy()
+    known = list(fighter.maneuvers)
+    fighter.maneuver_picks = engine.maneuver_picks()
+    engine.bind(fighter)
+    assert fighter.maneuvers == known
+    assert fighter.uses_maneuver("riposte") and not fighter.uses_maneuver("precision")
+
+
+def test_defensive_reads_its_params():
+    a = load_build_by_name("battlemaster_dueling_orc_5")
+    b = load_build_by_name("champion_gwf_orc_5")
+    plain = run_matchup(a, b, 40, "defensive", seed=3)
+    assert run_matchup(a, b, 40, PriorityTactics("defensive"), seed=3) == plain
+    tuned = PriorityTactics("defensive", params=TacticParams(second_wind_hp=0.25, action_surge_round=3))
+    assert run_matchup(a, b, 40, tuned, seed=3) != plain
+
+    space = parameter_space(a, "defensive")
+    assert space.keys() == {"second_wind_hp", "action_surge_round", "maneuvers"}
+    with pytest.raises(ValueError, match="bad --param"):
+        parse_param("heal_hp=0.3", "defensive")
+
+
+def test_default_params_play_like_the_builtin():
+    a = load_build_by_name("champion_gwf_orc_5")
+    b = load_build_by_name("berserker_greatsword_orc_5")
+    plain = run_matchup(a, b, 20, "aggressive", seed=5)
+    tuned = run_matchup(a, b, 20, PriorityTactics(params=TacticParams()), seed=5)
+    assert plain == tuned
+
+
+def test_space_and_candidates_follow_the_build():
+    space = parameter_space(load_build_by_name("battlemaster_dueling_orc_5"))
+    assert {"second_wind_hp", "action_surge_round", "maneuvers"} <= space.keys()
+    assert "heal_hp" not in space
+    candidates = sample_candidates(space, 10, seed=1)
+    assert candidates[0] == TacticParams() and len(set(candidates)) == 10
+    assert sample_candidates(space, 10, seed=1) == candidates
+
+
+def test_halving_narrows_the_field_and_writes_the_winner(tmp_path):
+    names = ["champion_gwf_orc_5", "berserker_greatsword_orc_5", "lore_bard_human_5"]
+    templates = {name: load_build_by_name(name) for name in names}
+    candidates = sample_candidates(parameter_space(templates[names[0]]), 9, seed=2)
+    rungs = successive_halving(names[0], templates, names[1:], candidates,
+                               n0=4, eta=3, max_n=100, seed=7)
+    assert [(r.n, len(r.scores)) for r in rungs] == [(4, 9), (12, 3), (36, 1)]
+    assert {p for p, _ in rungs[1].scores} == {p for p, _ in rungs[0].scores[:3]}
+
+    again = successive_halving(names[0], templates, names[1:], candidates,
+                               n0=4, eta=3, max_n=100, seed=7)
+    assert again == rungs
+
+    path = write_tactics(tmp_path / "tuned_champion.yaml", names[0], "aggressive", rungs, names[1:])
+    assert load_tactics(str(path)).params == rungs[-1].scores[0][0]
@@ -0,0 +1,81 @@
+"""Tests for data-change detection behind rank --watch."""
+
+import os
+
+import yaml
+
+from sim.ladder import Ladder, MatchupTally
+from sim.watch import DataWatcher
+
+_BUILDS = {
+    "gs_fighter": {"class": "fighter", "species": "orc", "armor": "splint",
+                   "weapons": ["greatsword"]},
+    "ls_fighter": {"class": "fighter", "species": "human", "armor": "chain_mail",
+                   "weapons": ["longsword"]},
+    "gs_barb": {"class": "barbarian", "species": "orc", "armor": "unarmored",
+                "weapons": ["greatsword", "javelin"]},
+    "wizard": {"class": "wizard", "species": "human", "armor": "unarmored",
+               "weapons": ["quarterstaff"], "spells_known": ["fire_bolt"]},
+}
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data))
+    # Bump mtime explicitly: coarse filesystem clocks can hide a quick rewrite.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _data_dir(tmp_path):
+    _write(tmp_path / "weapons" / "weapons.yaml", {
+        "greatsword": {"damage": "2d6"}, "longsword": {"damage": "1d8"},
+        "javelin": {"damage": "1d6"}, "quarterstaff": {"damage": "1d6"},
+    })
+    _write(tmp_path / "classes" / "fighter.yaml", {"hit_die": 10})
+    _write(tmp_path / "spells" / "fire_bolt.yaml", {"name": "fire_bolt"})
+    for name, raw in _BUILDS.items():
+        _write(tmp_path / "builds" / f"{name}.yaml", raw)
+    return tmp_path
+
+
+def test_weapon_edit_affects_only_wielders(tmp_path):
+    data = _data_dir(tmp_path)
+    watcher = DataWatcher(data)
+    assert watcher.poll() is None
+
+    weapons = yaml.safe_load((data / "weapons" / "weapons.yaml").read_text())
+    weapons["greatsword"]["damage"] = "2d8"
+    _write(data / "weapons" / "weapons.yaml", weapons)
+
+    change = watcher.poll()
+    assert change.keys == {("weapons", "greatsword")}
+    assert change.affected(_BUILDS) == {"gs_fighter", "gs_barb"}
+
+
+def test_class_spell_and_build_edits(tmp_path):
+    data = _data_dir(tmp_path)
+    watcher = DataWatcher(data)
+
+    _write(data / "classes" / "fighter.yaml", {"hit_die": 12})
+    assert watcher.poll().affected(_BUILDS) == {"gs_fighter", "ls_fighter"}
+
+    _write(data / "spells" / "fire_bolt.yaml", {"name": "fire_bolt", "damage_dice": "1d12"})
+    change = watcher.poll()
+    assert change.spells
+    assert change.affected(_BUILDS) == {"wizard"}
+
+    _write(data / "builds" / "gs_barb.yaml", {**_BUILDS["gs_barb"], "level": 5})
+    assert watcher.poll().affected(_BUILDS) == {"gs_barb"}
+
+
+def test_invalidate_keeps_unaffected_matchups():
+    ladder = Ladder(["a", "b", "c"], n=10, seed=1, chunk_size=10)
+    for task in ladder.pending():
+        ladder.record(task, MatchupTally(n=10, wins_a=5, wins_b=5))
+    assert ladder.invalidate({"c"}) == 2
+    assert [(t.a, t.b) for t in ladder.pending()] == [("a", "c"), ("b", "c")]
+
+    grown = ladder.with_builds(["a", "b", "c", "d"])
+    assert grown.done_chunks == 1
+    assert len(grown.pending()) == 5